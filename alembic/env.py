@@ -21,6 +21,11 @@ from app.db.models.perfil import Perfil
 from app.db.models.menu import Menu
 from app.db.models.empleados import Empleado
 from app.db.models.usuarios import Usuario
+from app.db.models.outbox import OutboxEvento
+from app.db.models.cache_version import CacheVersion
+from app.db.models.login_auditoria import LoginAuditoria
+from app.db.models.sesion import Sesion
+from app.db.models.evento_tiempo_real import EventoTiempoReal
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,48 @@
+"""menu_jerarquia
+
+Revision ID: dcf84fb32dab
+Revises: 8d43f5f5d349
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dcf84fb32dab'
+down_revision: Union[str, None] = '8d43f5f5d349'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('menu_jerarquia',
+    sa.Column('ancestro_id', sa.Integer(), nullable=False),
+    sa.Column('descendiente_id', sa.Integer(), nullable=False),
+    sa.Column('profundidad', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestro_id'], ['menu.menu_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendiente_id'], ['menu.menu_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestro_id', 'descendiente_id')
+    )
+    op.create_index('ix_menu_jerarquia_descendiente_id', 'menu_jerarquia', ['descendiente_id'], unique=False)
+
+    # Poblar la clausura con los menús existentes
+    op.execute("""
+        WITH RECURSIVE cadena(ancestro_id, descendiente_id, profundidad) AS (
+            SELECT menu_id, menu_id, 0 FROM menu
+            UNION ALL
+            SELECT m.parent_id, c.descendiente_id, c.profundidad + 1
+            FROM cadena c JOIN menu m ON m.menu_id = c.ancestro_id
+            WHERE m.parent_id IS NOT NULL AND c.profundidad < 100
+        )
+        INSERT INTO menu_jerarquia (ancestro_id, descendiente_id, profundidad)
+        SELECT ancestro_id, descendiente_id, profundidad FROM cadena
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_menu_jerarquia_descendiente_id', table_name='menu_jerarquia')
+    op.drop_table('menu_jerarquia')
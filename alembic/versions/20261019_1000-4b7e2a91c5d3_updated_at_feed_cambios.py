@@ -0,0 +1,41 @@
+"""updated_at para feed de cambios
+
+Revision ID: 4b7e2a91c5d3
+Revises: dcf84fb32dab
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2a91c5d3'
+down_revision: Union[str, None] = 'dcf84fb32dab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tabla -> clave primaria
+TABLAS = {
+    'empleados': 'empleado_id',
+    'usuarios': 'usuario_id',
+    'perfil': 'perfil_id',
+    'menu': 'menu_id',
+}
+
+
+def upgrade() -> None:
+    for tabla, pk in TABLAS.items():
+        op.add_column(tabla, sa.Column('updated_at', sa.TIMESTAMP(), nullable=True))
+        # Los registros existentes entran al feed con su fecha de creación
+        op.execute(f"UPDATE {tabla} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+        op.create_index(f'ix_{tabla}_updated_at', tabla, ['updated_at', pk], unique=False)
+
+
+def downgrade() -> None:
+    for tabla in TABLAS:
+        op.drop_index(f'ix_{tabla}_updated_at', table_name=tabla)
+        with op.batch_alter_table(tabla) as batch_op:
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,42 @@
+"""outbox_eventos
+
+Revision ID: ce6c2c062604
+Revises: 4b7e2a91c5d3
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ce6c2c062604'
+down_revision: Union[str, None] = '4b7e2a91c5d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_eventos',
+    sa.Column('evento_id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(length=100), nullable=False),
+    sa.Column('recurso', sa.String(length=50), nullable=False),
+    sa.Column('registro_id', sa.Integer(), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('intentos', sa.Integer(), nullable=False),
+    sa.Column('proximo_intento', sa.TIMESTAMP(), nullable=True),
+    sa.Column('ultimo_error', sa.String(length=500), nullable=True),
+    sa.Column('enviado_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('evento_id')
+    )
+    op.create_index(op.f('ix_outbox_eventos_evento_id'), 'outbox_eventos', ['evento_id'], unique=False)
+    op.create_index('ix_outbox_eventos_pendientes', 'outbox_eventos', ['enviado_at', 'evento_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_eventos_pendientes', table_name='outbox_eventos')
+    op.drop_index(op.f('ix_outbox_eventos_evento_id'), table_name='outbox_eventos')
+    op.drop_table('outbox_eventos')
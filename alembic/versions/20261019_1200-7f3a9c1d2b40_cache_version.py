@@ -0,0 +1,35 @@
+"""cache_version
+
+Revision ID: 7f3a9c1d2b40
+Revises: ce6c2c062604
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3a9c1d2b40'
+down_revision: Union[str, None] = 'ce6c2c062604'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tabla = op.create_table('cache_version',
+    sa.Column('nombre', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+    sa.PrimaryKeyConstraint('nombre')
+    )
+    op.bulk_insert(tabla, [
+        {'nombre': 'menu', 'version': 0},
+        {'nombre': 'estados', 'version': 0},
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('cache_version')
@@ -0,0 +1,41 @@
+"""login_auditoria
+
+Revision ID: a3e81f6c90d2
+Revises: 7f3a9c1d2b40
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e81f6c90d2'
+down_revision: Union[str, None] = '7f3a9c1d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('login_auditoria',
+    sa.Column('auditoria_id', sa.Integer(), nullable=False),
+    sa.Column('usuario', sa.String(length=100), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=True),
+    sa.Column('ip', sa.String(length=45), nullable=True),
+    sa.Column('resultado', sa.String(length=30), nullable=False),
+    sa.Column('latencia_ms', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=False),
+    sa.PrimaryKeyConstraint('auditoria_id')
+    )
+    op.create_index('ix_login_auditoria_usuario', 'login_auditoria', ['usuario', 'created_at'], unique=False)
+    op.create_index('ix_login_auditoria_ip', 'login_auditoria', ['ip', 'created_at'], unique=False)
+    op.create_index('ix_login_auditoria_created_at', 'login_auditoria', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_login_auditoria_created_at', table_name='login_auditoria')
+    op.drop_index('ix_login_auditoria_ip', table_name='login_auditoria')
+    op.drop_index('ix_login_auditoria_usuario', table_name='login_auditoria')
+    op.drop_table('login_auditoria')
@@ -0,0 +1,31 @@
+"""ultimo_acceso_usuarios
+
+Revision ID: 5c2d8e47a1b9
+Revises: a3e81f6c90d2
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2d8e47a1b9'
+down_revision: Union[str, None] = 'a3e81f6c90d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('usuarios', sa.Column('ultimo_login', sa.TIMESTAMP(), nullable=True))
+    op.add_column('usuarios', sa.Column('ultimo_acceso', sa.TIMESTAMP(), nullable=True))
+    op.create_index('ix_usuarios_ultimo_acceso', 'usuarios', ['ultimo_acceso'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_usuarios_ultimo_acceso', table_name='usuarios')
+    with op.batch_alter_table('usuarios') as batch_op:
+        batch_op.drop_column('ultimo_acceso')
+        batch_op.drop_column('ultimo_login')
@@ -0,0 +1,46 @@
+"""sesiones
+
+Revision ID: e91b4f0a6d27
+Revises: 5c2d8e47a1b9
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b4f0a6d27'
+down_revision: Union[str, None] = '5c2d8e47a1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sesiones',
+    sa.Column('sesion_id', sa.Integer(), nullable=False),
+    sa.Column('jti', sa.String(length=32), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('ip', sa.String(length=45), nullable=True),
+    sa.Column('user_agent', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('expires_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('revocada_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('revocada_por', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.usuario_id'], ),
+    sa.PrimaryKeyConstraint('sesion_id'),
+    sa.UniqueConstraint('jti')
+    )
+    op.create_index('ix_sesiones_usuario', 'sesiones', ['usuario_id', 'created_at'], unique=False)
+    op.create_index('ix_sesiones_revocada_at', 'sesiones', ['revocada_at'], unique=False)
+    # Canal del bus de invalidación para las revocaciones
+    op.execute("INSERT INTO cache_version (nombre, version) VALUES ('sesiones', 0)")
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM cache_version WHERE nombre = 'sesiones'")
+    op.drop_index('ix_sesiones_revocada_at', table_name='sesiones')
+    op.drop_index('ix_sesiones_usuario', table_name='sesiones')
+    op.drop_table('sesiones')
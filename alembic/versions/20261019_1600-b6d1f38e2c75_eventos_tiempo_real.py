@@ -0,0 +1,40 @@
+"""eventos_tiempo_real
+
+Revision ID: b6d1f38e2c75
+Revises: e91b4f0a6d27
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1f38e2c75'
+down_revision: Union[str, None] = 'e91b4f0a6d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('eventos_tiempo_real',
+    sa.Column('evento_id', sa.Integer(), nullable=False),
+    sa.Column('origen', sa.String(length=100), nullable=False),
+    sa.Column('destino', sa.String(length=20), nullable=False),
+    sa.Column('ids', sa.Text(), nullable=True),
+    sa.Column('evento', sa.String(length=50), nullable=False),
+    sa.Column('datos', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=False),
+    sa.PrimaryKeyConstraint('evento_id')
+    )
+    op.create_index('ix_eventos_tiempo_real_created_at', 'eventos_tiempo_real', ['created_at'], unique=False)
+    # Canal del bus de invalidación para repartir los eventos entre workers
+    op.execute("INSERT INTO cache_version (nombre, version) VALUES ('eventos', 0)")
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM cache_version WHERE nombre = 'eventos'")
+    op.drop_index('ix_eventos_tiempo_real_created_at', table_name='eventos_tiempo_real')
+    op.drop_table('eventos_tiempo_real')
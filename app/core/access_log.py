@@ -0,0 +1,154 @@
+"""
+Log de acceso y auditoría en JSON, escrito desde un hilo en segundo plano
+"""
+import json
+import logging
+import queue
+import sys
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import CounterFunc, Gauge, registry
+from app.core.request_context import RequestStats, request_stats, route_template
+
+access_logger = logging.getLogger("app.access")
+audit_logger = logging.getLogger("app.audit")
+
+_METODOS_AUDITADOS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea registros cuyo mensaje es un dict como una línea JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = record.msg if isinstance(record.msg, dict) else {"mensaje": record.getMessage()}
+        return json.dumps(
+            {"ts": datetime.utcfromtimestamp(record.created).isoformat() + "Z", "log": record.name, **datos},
+            default=str,
+            ensure_ascii=False
+        )
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler que nunca bloquea al llamador
+
+    Con la cola llena el registro se descarta y se cuenta en `dropped`;
+    el formateo queda para el hilo del listener.
+    """
+
+    def __init__(self, cola: queue.Queue):
+        super().__init__(cola)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue: queue.Queue = queue.Queue(maxsize=settings.ACCESS_LOG_QUEUE_SIZE)
+_queue_handler = DroppingQueueHandler(_queue)
+_listener: Optional[QueueListener] = None
+
+registry.register(CounterFunc(
+    "access_log_dropped_total", "Registros de acceso descartados por cola llena",
+    collect=lambda: [((), _queue_handler.dropped)]
+))
+registry.register(Gauge(
+    "access_log_queue_size", "Registros de acceso pendientes de escribir",
+    collect=lambda: [((), _queue.qsize())]
+))
+
+
+def start_access_log():
+    """Conectar los loggers a la cola e iniciar el hilo que escribe"""
+    global _listener
+    if _listener is not None or not settings.ACCESS_LOG_ENABLED:
+        return
+
+    if settings.ACCESS_LOG_FILE:
+        destino = logging.FileHandler(settings.ACCESS_LOG_FILE, encoding="utf-8")
+    else:
+        destino = logging.StreamHandler(sys.stdout)
+    destino.setFormatter(JsonFormatter())
+
+    for logger in (access_logger, audit_logger):
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(_queue_handler)
+
+    _listener = QueueListener(_queue, destino, respect_handler_level=False)
+    _listener.start()
+
+
+def stop_access_log():
+    """Escribir lo pendiente y detener el hilo"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    for logger in (access_logger, audit_logger):
+        logger.removeHandler(_queue_handler)
+    _listener = None
+
+
+class AccessLogMiddleware:
+    """
+    Middleware ASGI que registra una línea JSON por petición
+
+    Campos: método, ruta, estado, latencia, usuario autenticado y cantidad
+    de consultas SQL. Las peticiones que modifican datos se registran
+    además en el log de auditoría.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _listener is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        estado = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                estado["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_stats.reset(token)
+            cliente = scope.get("client")
+            registro = {
+                "method": scope.get("method"),
+                "route": route_template(scope),
+                "path": scope.get("path"),
+                "status": estado["status"],
+                "latency_ms": round((time.perf_counter() - inicio) * 1000, 2),
+                "usuario_id": stats.usuario_id,
+                "queries": stats.queries,
+                "ip": cliente[0] if cliente else None,
+            }
+            access_logger.info(registro)
+            if scope.get("method") in _METODOS_AUDITADOS and stats.usuario_id is not None:
+                audit_logger.info({
+                    "usuario_id": stats.usuario_id,
+                    "accion": f"{registro['method']} {registro['route']}",
+                    "path_params": scope.get("path_params"),
+                    "status": registro["status"],
+                })
@@ -0,0 +1,154 @@
+"""
+Control de admisión: límites de concurrencia por clase de ruta con descarte de carga
+"""
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.metrics import CounterFunc, Gauge, registry
+
+# Rutas que nunca esperan turno: sondas, flujos de larga duración y endpoints de operación
+_EXENTAS = ("/health", "/metrics", "/api/events/stream", "/api/admin/")
+
+# Rutas caras: bcrypt en login y cambio de contraseña
+_RUTAS_AUTH = {"/api/auth/login", "/api/auth/login-form", "/api/auth/change-password"}
+
+
+def route_class(path: str) -> Optional[str]:
+    """Clase de admisión de una ruta (auth, masiva o general); None si está exenta"""
+    if path.startswith(_EXENTAS):
+        return None
+    if path in _RUTAS_AUTH:
+        return "auth"
+    if path == "/api/empleados/cedulas/lookup" or path.rstrip("/").endswith("/changes"):
+        return "masiva"
+    return "general"
+
+
+class Limitador:
+    """
+    Semáforo con cola de espera acotada y plazo máximo de espera
+
+    Las peticiones que encuentran la cola llena o no obtienen turno antes
+    del plazo se descartan (se cuentan en `descartadas`). Al liberar, el
+    turno pasa directamente a la primera petición en espera, en orden.
+    """
+
+    def __init__(self, nombre: str, concurrencia: int, cola: int):
+        self.nombre = nombre
+        self.concurrencia = concurrencia
+        self.max_cola = cola
+        self.en_curso = 0
+        self.descartadas: Dict[str, int] = {"cola_llena": 0, "timeout": 0}
+        self._espera: Deque[asyncio.Future] = deque()
+
+    @property
+    def en_cola(self) -> int:
+        return len(self._espera)
+
+    async def acquire(self, timeout: float) -> bool:
+        """Obtener un turno; False si la petición se descarta"""
+        if self.en_curso < self.concurrencia and not self._espera:
+            self.en_curso += 1
+            return True
+        if len(self._espera) >= self.max_cola:
+            self.descartadas["cola_llena"] += 1
+            return False
+
+        turno = asyncio.get_running_loop().create_future()
+        self._espera.append(turno)
+        try:
+            await asyncio.wait_for(asyncio.shield(turno), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if turno.done():
+                # El turno llegó justo al vencer el plazo
+                return True
+            self._espera.remove(turno)
+            self.descartadas["timeout"] += 1
+            return False
+        except asyncio.CancelledError:
+            # El cliente se desconectó mientras esperaba
+            if turno.done() and not turno.cancelled():
+                self.release()
+            else:
+                turno.cancel()
+                if turno in self._espera:
+                    self._espera.remove(turno)
+            raise
+
+    def release(self):
+        """Liberar un turno, cediéndolo a la siguiente petición en espera"""
+        while self._espera:
+            turno = self._espera.popleft()
+            if not turno.done():
+                turno.set_result(None)
+                return
+        self.en_curso -= 1
+
+
+limitadores: Dict[str, Limitador] = {
+    "auth": Limitador("auth", settings.ADMISSION_AUTH_CONCURRENCY, settings.ADMISSION_AUTH_QUEUE),
+    "masiva": Limitador("masiva", settings.ADMISSION_BULK_CONCURRENCY, settings.ADMISSION_BULK_QUEUE),
+    "general": Limitador("general", settings.ADMISSION_DEFAULT_CONCURRENCY, settings.ADMISSION_DEFAULT_QUEUE),
+}
+
+registry.register(Gauge(
+    "admission_inflight", "Peticiones en curso por clase de admisión", ("clase",),
+    collect=lambda: [((nombre,), limitador.en_curso) for nombre, limitador in limitadores.items()]
+))
+registry.register(Gauge(
+    "admission_queued", "Peticiones esperando turno por clase de admisión", ("clase",),
+    collect=lambda: [((nombre,), limitador.en_cola) for nombre, limitador in limitadores.items()]
+))
+registry.register(CounterFunc(
+    "admission_shed_total", "Peticiones descartadas con 503 por clase y motivo (cola_llena, timeout)",
+    ("clase", "motivo"),
+    collect=lambda: [
+        ((nombre, motivo), cantidad)
+        for nombre, limitador in limitadores.items()
+        for motivo, cantidad in limitador.descartadas.items()
+    ]
+))
+
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI que limita la concurrencia por clase de ruta
+
+    Si la petición no obtiene turno dentro de ADMISSION_QUEUE_TIMEOUT_MS (o
+    la cola de su clase está llena) responde 503 con Retry-After sin llegar
+    a la aplicación, para que el servidor descarte carga en lugar de
+    acumular peticiones que terminarían por timeout.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        clase = route_class(scope["path"])
+        if clase is None:
+            await self.app(scope, receive, send)
+            return
+
+        limitador = limitadores[clase]
+        if not await limitador.acquire(settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000):
+            respuesta = JSONResponse(
+                {"detail": "Servidor saturado, intente nuevamente en unos segundos"},
+                status_code=503,
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)}
+            )
+            await respuesta(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limitador.release()
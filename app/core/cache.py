@@ -0,0 +1,77 @@
+"""
+Cachés en memoria por proceso con invalidación explícita
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LocalCache:
+    """
+    Caché clave/valor en memoria, segura entre hilos
+
+    Cada invalidación incrementa una generación; un valor construido antes
+    de una invalidación no se guarda, así nunca se sirve un dato obsoleto.
+    """
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.hits = 0
+        self.misses = 0
+        self._data: Dict[Hashable, Any] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Obtener un valor o None si no está en caché"""
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_or_set(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """
+        Obtener un valor, construyéndolo con `builder` si no está en caché
+
+        Args:
+            key: Clave del valor
+            builder: Función sin argumentos que construye el valor
+
+        Returns:
+            Valor en caché o recién construido
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        generation = self._generation
+        value = builder()
+        with self._lock:
+            if generation == self._generation:
+                self._data[key] = value
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Invalidar una clave, o toda la caché si no se indica clave"""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Registro de cachés del proceso (por nombre)
+caches: Dict[str, LocalCache] = {}
+
+
+def get_cache(nombre: str) -> LocalCache:
+    """Obtener (o crear) la caché registrada con ese nombre"""
+    cache = caches.get(nombre)
+    if cache is None:
+        cache = caches.setdefault(nombre, LocalCache(nombre))
+    return cache
@@ -0,0 +1,291 @@
+"""
+Bus de invalidación de cachés entre workers y servidores
+"""
+import hashlib
+import logging
+import mmap
+import os
+import select as io_select
+import struct
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.metrics import CounterFunc, Gauge, registry
+from app.db.models.cache_version import CacheVersion
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Canales conocidos; el orden define la posición en la memoria compartida
+CANALES = ("menu", "estados", "sesiones", "eventos")
+
+# Canal de LISTEN/NOTIFY en PostgreSQL (payload "canal:version")
+NOTIFY_CHANNEL = "cache_invalidation"
+
+
+class SharedVersions:
+    """
+    Versiones por canal en un archivo mapeado en memoria
+
+    Lo comparten los workers del mismo host (mismo archivo): un worker que
+    publica escribe la nueva versión y los demás la ven en su siguiente
+    lectura, sin pasar por la base de datos. No hace falta lock: dos
+    escrituras simultáneas escriben versiones de la misma tabla y cualquier
+    cambio de valor ya provoca la invalidación.
+    """
+
+    _SLOT = struct.Struct("<Q")
+
+    def __init__(self, ruta: str, canales=CANALES):
+        self.canales = canales
+        tamaño = self._SLOT.size * len(canales)
+        fd = os.open(ruta, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < tamaño:
+                os.ftruncate(fd, tamaño)
+            self._mmap = mmap.mmap(fd, tamaño)
+        finally:
+            os.close(fd)
+
+    def read(self, canal: str) -> int:
+        return self._SLOT.unpack_from(self._mmap, self.canales.index(canal) * self._SLOT.size)[0]
+
+    def write(self, canal: str, version: int):
+        self._SLOT.pack_into(self._mmap, self.canales.index(canal) * self._SLOT.size, version)
+
+    def close(self):
+        self._mmap.close()
+
+
+def default_shm_path() -> str:
+    """Archivo compartido por base de datos (en /dev/shm si existe)"""
+    directorio = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    clave = hashlib.sha1(settings.DATABASE_URL.encode()).hexdigest()[:12]
+    return os.path.join(directorio, f"business_security_cache_{clave}.bin")
+
+
+class CacheBus:
+    """
+    Propaga invalidaciones de caché en memoria entre procesos
+
+    Cada canal tiene una versión en la tabla `cache_version`. Quien modifica
+    datos invalida su propia caché y llama a `publish(canal)`, que incrementa
+    la versión. Los demás procesos la detectan por:
+
+    - memoria compartida: workers del mismo host, cada CACHE_BUS_SHM_POLL_MS
+    - LISTEN/NOTIFY: en PostgreSQL, al confirmar la transacción
+    - consulta a `cache_version`: cada CACHE_BUS_LISTEN_POLL_SECONDS como
+      respaldo de la memoria compartida o de NOTIFY, o cada
+      CACHE_BUS_POLL_INTERVAL_MS si no hay ninguno de los dos
+
+    Al ver una versión mayor que la conocida se llaman los manejadores del
+    canal (desde el hilo del bus), que invalidan la caché completa.
+    """
+
+    def __init__(self):
+        self.recibidas: Dict[str, int] = {canal: 0 for canal in CANALES}
+        self._handlers: Dict[str, List[Callable[[int], None]]] = {}
+        self._versiones: Dict[str, int] = {canal: 0 for canal in CANALES}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._shared: Optional[SharedVersions] = None
+        self._escuchando = False
+
+    def subscribe(self, canal: str, handler: Callable[[int], None]):
+        """Registrar un manejador que invalida la caché local del canal"""
+        self._handlers.setdefault(canal, []).append(handler)
+
+    def version(self, canal: str) -> int:
+        """Última versión conocida del canal"""
+        return self._versiones[canal]
+
+    def start(self):
+        """Sincronizar versiones e iniciar los hilos de escucha"""
+        if self._threads or not settings.CACHE_BUS_ENABLED:
+            return
+        self._stop.clear()
+
+        try:
+            self._shared = SharedVersions(settings.CACHE_BUS_SHM_PATH or default_shm_path())
+        except (OSError, ValueError):
+            logger.warning("Bus de cachés sin memoria compartida", exc_info=True)
+            self._shared = None
+
+        versiones_db = self._read_db()
+        for canal in CANALES:
+            version = versiones_db.get(canal, 0) if versiones_db is not None else self._versiones[canal]
+            if self._shared is not None and versiones_db is not None and self._shared.read(canal) > version:
+                # Archivo de una base de datos anterior (p. ej. recreada)
+                self._shared.write(canal, version)
+            with self._lock:
+                self._versiones[canal] = max(self._versiones[canal], version)
+
+        self._threads.append(threading.Thread(target=self._poll_loop, name="cache-bus-poll", daemon=True))
+        if engine.dialect.name == "postgresql":
+            self._threads.append(threading.Thread(target=self._listen_loop, name="cache-bus-listen", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Detener los hilos de escucha"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def publish(self, canal: str) -> int:
+        """
+        Incrementar la versión del canal para que los demás procesos invaliden
+
+        Debe llamarse después del commit de los datos modificados; la caché
+        local la invalida quien publica.
+
+        Returns:
+            Nueva versión del canal
+        """
+        version = self._increment_db(canal) if settings.CACHE_BUS_ENABLED else None
+        with self._lock:
+            if version is None:
+                # Sin tabla/base de datos: solo memoria compartida y versión local
+                version = self._versiones[canal] + 1
+            self._versiones[canal] = max(self._versiones[canal], version)
+        if self._shared is not None:
+            self._shared.write(canal, version)
+        return version
+
+    def _apply(self, canal: str, version: int):
+        """Invalidar si la versión es nueva para este proceso"""
+        if canal not in self._versiones:
+            return
+        with self._lock:
+            if version <= self._versiones[canal]:
+                return
+            self._versiones[canal] = version
+        self.recibidas[canal] += 1
+        if self._shared is not None and self._shared.read(canal) < version:
+            self._shared.write(canal, version)
+        for handler in self._handlers.get(canal, ()):
+            try:
+                handler(version)
+            except Exception:
+                logger.exception("Error invalidando la caché del canal %s", canal)
+
+    def _increment_db(self, canal: str) -> Optional[int]:
+        try:
+            with engine.begin() as conn:
+                version = conn.execute(
+                    update(CacheVersion)
+                    .where(CacheVersion.nombre == canal)
+                    .values(version=CacheVersion.version + 1, updated_at=datetime.utcnow())
+                    .returning(CacheVersion.version)
+                ).scalar()
+                if version is None:
+                    version = 1
+                    conn.execute(insert(CacheVersion).values(nombre=canal, version=version, updated_at=datetime.utcnow()))
+                if engine.dialect.name == "postgresql":
+                    conn.execute(
+                        text("SELECT pg_notify(:canal, :payload)"),
+                        {"canal": NOTIFY_CHANNEL, "payload": f"{canal}:{version}"}
+                    )
+            return version
+        except SQLAlchemyError:
+            logger.warning("No se pudo publicar la invalidación de %s en cache_version", canal, exc_info=True)
+            return None
+
+    def _read_db(self) -> Optional[Dict[str, int]]:
+        try:
+            with engine.connect() as conn:
+                return dict(conn.execute(select(CacheVersion.nombre, CacheVersion.version)).all())
+        except SQLAlchemyError:
+            return None
+
+    def _poll_loop(self):
+        proximo_db = 0.0
+        while True:
+            # Con memoria compartida o NOTIFY la consulta solo es un respaldo
+            intervalo_db = (
+                settings.CACHE_BUS_LISTEN_POLL_SECONDS if self._escuchando or self._shared is not None
+                else settings.CACHE_BUS_POLL_INTERVAL_MS / 1000
+            )
+            espera = settings.CACHE_BUS_SHM_POLL_MS / 1000 if self._shared is not None else intervalo_db
+            if self._stop.wait(espera):
+                return
+
+            if self._shared is not None:
+                for canal in CANALES:
+                    self._apply(canal, self._shared.read(canal))
+
+            if time.monotonic() >= proximo_db:
+                for canal, version in (self._read_db() or {}).items():
+                    self._apply(canal, version)
+                proximo_db = time.monotonic() + intervalo_db
+
+    def _listen_loop(self):
+        while not self._stop.is_set():
+            raw = None
+            try:
+                # Conexión propia, fuera del pool, en autocommit
+                raw = engine.raw_connection()
+                raw.detach()
+                conn = raw.driver_connection
+                conn.autocommit = True
+                pendientes: List[str] = []
+
+                if hasattr(conn, "add_notify_handler"):  # psycopg 3
+                    conn.add_notify_handler(lambda notify: pendientes.append(notify.payload))
+
+                    def consumir():
+                        conn.execute("SELECT 1")
+                else:  # psycopg2
+                    def consumir():
+                        conn.poll()
+                        while conn.notifies:
+                            pendientes.append(conn.notifies.pop(0).payload)
+
+                conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self._escuchando = True
+                # Lo publicado mientras no se escuchaba
+                for canal, version in (self._read_db() or {}).items():
+                    self._apply(canal, version)
+
+                while not self._stop.is_set():
+                    if not io_select.select([conn], [], [], 1.0)[0]:
+                        continue
+                    consumir()
+                    while pendientes:
+                        canal, _, version = pendientes.pop(0).partition(":")
+                        if version.isdigit():
+                            self._apply(canal, int(version))
+            except Exception:
+                logger.warning("LISTEN de invalidaciones interrumpido; reintentando", exc_info=True)
+                self._stop.wait(5)
+            finally:
+                self._escuchando = False
+                if raw is not None:
+                    try:
+                        raw.close()
+                    except Exception:
+                        pass
+
+
+cache_bus = CacheBus()
+
+registry.register(Gauge(
+    "cache_bus_version", "Versión conocida por canal del bus de invalidación", ("canal",),
+    collect=lambda: [((canal,), cache_bus.version(canal)) for canal in CANALES]
+))
+registry.register(CounterFunc(
+    "cache_bus_invalidations_total", "Invalidaciones recibidas de otros procesos por canal", ("canal",),
+    collect=lambda: [((canal,), cantidad) for canal, cantidad in cache_bus.recibidas.items()]
+))
@@ -17,6 +17,12 @@ class Settings(BaseSettings):
     POSTGRES_PORT: Optional[int] = None
     POSTGRES_DB: Optional[str] = None
     
+    # Pool de conexiones (solo PostgreSQL); conexiones por worker = tamaño + desborde
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Límite de conexiones del servidor de BD a repartir entre los workers
+    DB_MAX_CONNECTIONS: int = 100
+    
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
@@ -32,12 +38,120 @@ class Settings(BaseSettings):
     
     # Login Security
     MAX_LOGIN_ATTEMPTS: int = 3
+    ADMIN_PERFIL_ID: int = 1
+    
+    # Menú
+    MAX_MENU_DEPTH: int = 10
+    
+    # Feed de cambios (/changes)
+    CHANGE_FEED_MAX_LIMIT: int = 5000
+    # La última página vuelve a entregar los cambios de esta ventana (0 = desactivado)
+    CHANGE_FEED_SAFETY_WINDOW_SECONDS: int = 60
+    
+    # Empleados - búsqueda masiva por cédula
+    MAX_CEDULAS_LOOKUP: int = 10000
+    CEDULAS_LOOKUP_CHUNK_SIZE: int = 500
+    
+    # Webhooks (outbox) - URLs separadas por comas
+    WEBHOOK_URLS: str = ""
+    WEBHOOK_SECRET: Optional[str] = None
+    WEBHOOK_TIMEOUT_SECONDS: float = 5.0
+    OUTBOX_POLL_INTERVAL_MS: int = 1000
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_RETENTION_HOURS: int = 72
+    
+    # Servidor de producción (python -m app.server); SERVER_WORKERS=0 = automático
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    
+    # Control de admisión: concurrencia y cola por clase de ruta (503 + Retry-After al saturarse)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_QUEUE_TIMEOUT_MS: int = 2000
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
+    ADMISSION_AUTH_CONCURRENCY: int = 8
+    ADMISSION_AUTH_QUEUE: int = 64
+    ADMISSION_BULK_CONCURRENCY: int = 4
+    ADMISSION_BULK_QUEUE: int = 16
+    ADMISSION_DEFAULT_CONCURRENCY: int = 100
+    ADMISSION_DEFAULT_QUEUE: int = 500
+    
+    # Calentamiento al arrancar (conexiones, consultas, menús, validadores, bcrypt)
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5
+    WARMUP_MAX_PERFILES: int = 50
+    WARMUP_TIMEOUT_SECONDS: int = 30
+    
+    # Readiness (/health/ready): verificaciones en segundo plano, las sondas leen el último resultado
+    READINESS_INTERVAL_SECONDS: int = 10
+    READINESS_POOL_SATURATION: float = 0.9
+    READINESS_CHECK_MIGRATIONS: bool = True
+    
+    # Bus de invalidación de cachés entre workers (memoria compartida + cache_version + NOTIFY)
+    CACHE_BUS_ENABLED: bool = True
+    CACHE_BUS_SHM_POLL_MS: int = 20
+    CACHE_BUS_POLL_INTERVAL_MS: int = 500
+    CACHE_BUS_LISTEN_POLL_SECONDS: int = 30
+    CACHE_BUS_SHM_PATH: Optional[str] = None
+    
+    # Eventos en tiempo real (SSE)
+    SSE_KEEPALIVE_SECONDS: int = 15
+    SSE_QUEUE_SIZE: int = 100
+    
+    # Esquema OpenAPI precalculado (python export_openapi.py); None = generarlo en el primer /docs
+    OPENAPI_SCHEMA_FILE: Optional[str] = None
+    
+    # Auditoría de login (tabla login_auditoria, escrita por lotes en segundo plano)
+    LOGIN_AUDIT_ENABLED: bool = True
+    LOGIN_AUDIT_FLUSH_INTERVAL_MS: int = 1000
+    LOGIN_AUDIT_BATCH_SIZE: int = 500
+    LOGIN_AUDIT_MAX_BUFFER: int = 50000
+    
+    # Último acceso/login por usuario (acumulado en memoria, escrito por lotes)
+    LAST_SEEN_ENABLED: bool = True
+    LAST_SEEN_FLUSH_INTERVAL_SECONDS: int = 60
+    
+    # Listados grandes (empleados, usuarios, menús) serializados directo a JSON,
+    # sin validar cada fila con el response_model
+    FAST_SERIALIZATION_ENABLED: bool = False
+    
+    # Log de acceso/auditoría en JSON (stdout si no se indica archivo)
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_FILE: Optional[str] = None
+    ACCESS_LOG_QUEUE_SIZE: int = 10000
+    
+    # Consultas lentas (EXPLAIN automático en la primera aparición)
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: int = 100
+    SLOW_QUERY_MAX_STATEMENTS: int = 200
+    
+    # Perfilado de peticiones (cabecera X-Profile de admin o muestreo aleatorio)
+    PROFILER_ENABLED: bool = True
+    PROFILER_SAMPLE_RATE: float = 0.0
+    PROFILER_PATHS: str = ""
+    PROFILER_DIR: str = "profiles"
+    PROFILER_MAX_FILES: int = 50
     
     @property
     def allowed_origins_list(self) -> List[str]:
         """Convierte ALLOWED_ORIGINS de string a lista"""
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
     
+    @property
+    def webhook_urls_list(self) -> List[str]:
+        """Convierte WEBHOOK_URLS de string a lista"""
+        return [url.strip() for url in self.WEBHOOK_URLS.split(",") if url.strip()]
+    
+    @property
+    def profiler_paths_list(self) -> List[str]:
+        """Convierte PROFILER_PATHS (prefijos de ruta a muestrear) de string a lista"""
+        return [path.strip() for path in self.PROFILER_PATHS.split(",") if path.strip()]
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
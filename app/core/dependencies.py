@@ -6,8 +6,13 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
+from app.core.config import settings
+from app.core.request_context import request_stats
 from app.core.security import decode_access_token
 from app.db.models.usuarios import Usuario
+from app.services.last_seen_tracker import last_seen_tracker
+from app.services.menu_service import MenuService
+from app.services.sesion_service import SesionService
 
 # OAuth2 con Bearer token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -24,12 +29,9 @@ def get_db() -> Generator:
         db.close()
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> Usuario:
+def get_user_from_token(token: Optional[str], db: Session) -> Usuario:
     """
-    Obtener el usuario actual desde el token JWT
+    Obtener el usuario activo de un token JWT
     
     Raises:
         HTTPException: Si el token es inválido o el usuario no existe/no está activo
@@ -43,13 +45,24 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    if not token:
+        raise credentials_exception
+    
     # Decodificar token
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
     
-    usuario_id: Optional[int] = payload.get("sub")
-    if usuario_id is None:
+    # Sesión revocada: conjunto en memoria, sin consulta por petición
+    # (los tokens anteriores al registro de sesiones no traen jti)
+    jti = payload.get("jti")
+    if jti is not None and SesionService.is_revocada(jti, db):
+        raise credentials_exception
+    
+    # "sub" es un string según RFC 7519 (python-jose rechaza otros tipos)
+    try:
+        usuario_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
         raise credentials_exception
     
     # Buscar usuario en DB
@@ -64,9 +77,32 @@ async def get_current_user(
             detail="Usuario inactivo o bloqueado"
         )
     
+    stats = request_stats.get()
+    if stats is not None:
+        stats.usuario_id = usuario.usuario_id
+    
+    # Solo en memoria: se escribe por lotes (LAST_SEEN_FLUSH_INTERVAL_SECONDS)
+    last_seen_tracker.touch(usuario.usuario_id)
+    
     return usuario
 
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Usuario:
+    """
+    Obtener el usuario actual desde el token JWT
+    
+    Raises:
+        HTTPException: Si el token es inválido o el usuario no existe/no está activo
+    
+    Returns:
+        Usuario autenticado
+    """
+    return get_user_from_token(token, db)
+
+
 async def get_current_active_user(
     current_user: Usuario = Depends(get_current_user)
 ) -> Usuario:
@@ -75,3 +111,44 @@ async def get_current_active_user(
     """
     # Aquí puedes agregar más validaciones si es necesario
     return current_user
+
+
+async def require_admin(
+    current_user: Usuario = Depends(get_current_active_user)
+) -> Usuario:
+    """
+    Verificar que el usuario actual tenga el perfil administrador
+    """
+    if current_user.perfil_id != settings.ADMIN_PERFIL_ID:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Solo disponible para administradores"
+        )
+    return current_user
+
+
+def require_menu_url(url: str):
+    """
+    Crear una dependencia que exige acceso a una URL de menú
+    
+    Uso:
+        @router.get("/", dependencies=[Depends(require_menu_url("/seguridad/usuarios"))])
+    
+    Args:
+        url: URL de menú que debe tener asignada el perfil del usuario
+    
+    Returns:
+        Dependencia que devuelve el usuario actual o lanza 403
+    """
+    async def verify_menu_url(
+        current_user: Usuario = Depends(get_current_active_user),
+        db: Session = Depends(get_db)
+    ) -> Usuario:
+        if not MenuService.is_url_allowed(db=db, perfil_id=current_user.perfil_id, url=url):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No tiene permiso para acceder a este recurso"
+            )
+        return current_user
+    
+    return verify_menu_url
@@ -0,0 +1,105 @@
+"""
+Hub en memoria de eventos en tiempo real (Server-Sent Events)
+"""
+import asyncio
+import threading
+from typing import Dict, Iterable, Optional, Set
+from app.core.config import settings
+
+
+class Suscripcion:
+    """Conexión SSE abierta de un usuario"""
+
+    def __init__(self, usuario_id: int, perfil_id: Optional[int], loop: asyncio.AbstractEventLoop, max_size: int,
+                 jti: Optional[str] = None):
+        self.usuario_id = usuario_id
+        self.perfil_id = perfil_id
+        self.jti = jti
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+
+
+class EventHub:
+    """
+    Reparte eventos a las conexiones SSE abiertas de este proceso
+
+    Las rutas de modificación publican después del commit; cada conexión
+    tiene su propia cola acotada. Se puede publicar desde cualquier hilo.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self.descartados = 0
+        self._por_usuario: Dict[int, Set[Suscripcion]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, usuario_id: int, perfil_id: Optional[int], jti: Optional[str] = None) -> Suscripcion:
+        """Registrar una conexión (debe llamarse desde el event loop)"""
+        sub = Suscripcion(usuario_id, perfil_id, asyncio.get_running_loop(), self.max_queue_size, jti)
+        with self._lock:
+            self._por_usuario.setdefault(usuario_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Suscripcion):
+        """Quitar una conexión"""
+        with self._lock:
+            subs = self._por_usuario.get(sub.usuario_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._por_usuario[sub.usuario_id]
+
+    def publish_to_users(self, usuario_ids: Iterable[int], evento: str, datos: Optional[dict] = None):
+        """Enviar un evento a todas las conexiones de los usuarios indicados"""
+        with self._lock:
+            subs = [sub for uid in usuario_ids for sub in self._por_usuario.get(uid, ())]
+        self._send(subs, evento, datos)
+
+    def publish_to_sesiones(self, jtis: Iterable[str], evento: str, datos: Optional[dict] = None):
+        """Enviar un evento a las conexiones abiertas con los tokens indicados (por jti)"""
+        jtis = set(jtis)
+        with self._lock:
+            subs = [sub for grupo in self._por_usuario.values() for sub in grupo if sub.jti in jtis]
+        self._send(subs, evento, datos)
+
+    def publish_to_perfiles(self, perfil_ids: Optional[Iterable[int]], evento: str, datos: Optional[dict] = None):
+        """Enviar un evento a las conexiones de usuarios con esos perfiles (None = todos)"""
+        with self._lock:
+            subs = [sub for grupo in self._por_usuario.values() for sub in grupo]
+        if perfil_ids is not None:
+            perfiles = set(perfil_ids)
+            subs = [sub for sub in subs if sub.perfil_id in perfiles]
+        self._send(subs, evento, datos)
+
+    def set_perfil(self, usuario_id: int, perfil_id: Optional[int]):
+        """Actualizar el perfil de las conexiones abiertas de un usuario"""
+        with self._lock:
+            for sub in self._por_usuario.get(usuario_id, ()):
+                sub.perfil_id = perfil_id
+
+    @property
+    def conexiones(self) -> int:
+        """Cantidad de conexiones abiertas"""
+        return sum(len(subs) for subs in self._por_usuario.values())
+
+    def _send(self, subs, evento: str, datos: Optional[dict]):
+        mensaje = {"evento": evento, "datos": datos or {}}
+        for sub in subs:
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is sub.loop:
+                self._put(sub, mensaje)
+            else:
+                sub.loop.call_soon_threadsafe(self._put, sub, mensaje)
+
+    def _put(self, sub: Suscripcion, mensaje: dict):
+        try:
+            sub.queue.put_nowait(mensaje)
+        except asyncio.QueueFull:
+            # Cliente demasiado lento: se descarta el evento
+            self.descartados += 1
+
+
+event_hub = EventHub(settings.SSE_QUEUE_SIZE)
@@ -0,0 +1,290 @@
+"""
+Métricas en proceso con exposición en formato de texto de Prometheus
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.cache import caches
+from app.core.request_context import route_template
+
+# Buckets por defecto (segundos), iguales a los del cliente oficial de Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(nombres: Iterable[str], valores: Iterable[str], extra: str = "") -> str:
+    pares = [f'{nombre}="{_escape(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _escape(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class _Metric:
+    tipo = ""
+
+    def __init__(self, nombre: str, descripcion: str, labels: Iterable[str] = ()):
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.nombre} {self.descripcion}", f"# TYPE {self.nombre} {self.tipo}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contador monótono con etiquetas"""
+
+    tipo = "counter"
+
+    def __init__(self, nombre: str, descripcion: str, labels: Iterable[str] = ()):
+        super().__init__(nombre, descripcion, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *valores: str, amount: float = 1):
+        with self._lock:
+            self._values[valores] = self._values.get(valores, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.nombre}{_format_labels(self.labels, valores)} {_format_value(valor)}"
+            for valores, valor in items
+        ]
+
+
+class Histogram(_Metric):
+    """Histograma acumulativo con buckets fijos"""
+
+    tipo = "histogram"
+
+    def __init__(
+        self,
+        nombre: str,
+        descripcion: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(nombre, descripcion, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # valores de etiquetas -> [conteos por bucket (no acumulados), suma]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, valor: float, *valores: str):
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._values.get(valores)
+            if serie is None:
+                serie = self._values[valores] = [[0] * len(self.buckets), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def time(self, *valores: str) -> "_Timer":
+        """Medir la duración de un bloque `with`"""
+        return _Timer(self, valores)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((valores, (list(conteos), suma)) for valores, (conteos, suma) in self._values.items())
+        lineas = self.header()
+        for valores, (conteos, suma) in items:
+            acumulado = 0
+            for limite, conteo in zip(self.buckets, conteos):
+                acumulado += conteo
+                le = 'le="' + _format_value(limite) + '"'
+                lineas.append(f"{self.nombre}_bucket{_format_labels(self.labels, valores, le)} {acumulado}")
+            etiquetas = _format_labels(self.labels, valores)
+            lineas.append(f"{self.nombre}_sum{etiquetas} {_format_value(suma)}")
+            lineas.append(f"{self.nombre}_count{etiquetas} {acumulado}")
+        return lineas
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, valores: LabelValues):
+        self.histogram = histogram
+        self.valores = valores
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.inicio, *self.valores)
+
+
+class Gauge(_Metric):
+    """Valor instantáneo calculado al momento de exponer las métricas"""
+
+    tipo = "gauge"
+
+    def __init__(
+        self,
+        nombre: str,
+        descripcion: str,
+        labels: Iterable[str] = (),
+        collect: Optional[Callable[[], Iterable[Tuple[LabelValues, float]]]] = None
+    ):
+        super().__init__(nombre, descripcion, labels)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.nombre}{_format_labels(self.labels, valores)} {_format_value(valor)}"
+            for valores, valor in (self.collect() if self.collect else ())
+        ]
+
+
+class CounterFunc(Gauge):
+    """Contador cuyo valor se lee de otro objeto al exponer las métricas"""
+
+    tipo = "counter"
+
+
+class MetricsRegistry:
+    """Registro de métricas del proceso"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.nombre] = metric
+        return metric
+
+    def render(self) -> str:
+        lineas: List[str] = []
+        for metric in self._metrics.values():
+            lineas.extend(metric.render())
+        return "\n".join(lineas) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "Peticiones HTTP atendidas", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "Latencia de peticiones HTTP", ("method", "route")
+))
+
+# Autenticación
+password_hash_duration_seconds = registry.register(Histogram(
+    "password_hash_duration_seconds", "Duración de bcrypt (hash y verificación)", ("operacion",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0)
+))
+login_total = registry.register(Counter(
+    "login_total", "Intentos de login por resultado (exito, fallo, bloqueo)", ("resultado",)
+))
+
+# Pool de conexiones
+db_pool_checkout_seconds = registry.register(Histogram(
+    "db_pool_checkout_seconds", "Tiempo de espera para obtener una conexión del pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 10.0, 30.0)
+))
+
+
+def _cache_series(atributo: str):
+    def collect():
+        return [((nombre,), getattr(cache, atributo)) for nombre, cache in sorted(caches.items())]
+    return collect
+
+
+def _cache_entries():
+    return [((nombre,), len(cache)) for nombre, cache in sorted(caches.items())]
+
+
+def _cache_hit_ratio():
+    series = []
+    for nombre, cache in sorted(caches.items()):
+        total = cache.hits + cache.misses
+        series.append(((nombre,), cache.hits / total if total else 0.0))
+    return series
+
+
+registry.register(CounterFunc("cache_hits_total", "Aciertos de caché", ("cache",), _cache_series("hits")))
+registry.register(CounterFunc("cache_misses_total", "Fallos de caché", ("cache",), _cache_series("misses")))
+registry.register(Gauge("cache_hit_ratio", "Proporción de aciertos de caché", ("cache",), _cache_hit_ratio))
+registry.register(Gauge("cache_entries", "Entradas en caché", ("cache",), _cache_entries))
+
+
+def instrument_pool(engine):
+    """
+    Registrar métricas del pool de conexiones de un engine
+
+    Expone tamaño, conexiones prestadas y desborde y mide el tiempo de cada
+    checkout del pool. Todo se resuelve a través del engine y no del pool:
+    `engine.dispose()` (p. ej. en cada worker de gunicorn tras el fork)
+    reemplaza `engine.pool` por uno nuevo y las métricas siguen al actual.
+    """
+
+    def pool_stat(metodo: str):
+        def collect():
+            funcion = getattr(engine.pool, metodo, None)
+            return [((), funcion())] if callable(funcion) else []
+        return collect
+
+    registry.register(Gauge("db_pool_size", "Tamaño configurado del pool", collect=pool_stat("size")))
+    registry.register(Gauge("db_pool_checked_out", "Conexiones prestadas", collect=pool_stat("checkedout")))
+    registry.register(Gauge("db_pool_overflow", "Conexiones por encima del tamaño del pool", collect=pool_stat("overflow")))
+
+    # Connection obtiene su conexión con engine.raw_connection() -> engine.pool.connect()
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        inicio = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - inicio)
+
+    engine.raw_connection = timed_raw_connection
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que registra latencia y código de estado por ruta
+
+    Usa la plantilla de la ruta (`/api/empleados/{empleado_id}`) como
+    etiqueta para no crear una serie por cada ID.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        estado = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                estado["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            path = route_template(scope)
+            method = scope.get("method", "")
+            http_request_duration_seconds.observe(time.perf_counter() - inicio, method, path)
+            http_requests_total.inc(method, path, str(estado["status"]))
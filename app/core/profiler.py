@@ -0,0 +1,239 @@
+"""
+Perfilado bajo demanda de peticiones en vivo
+"""
+import asyncio
+import cProfile
+import os
+import pstats
+import random
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.dependencies import get_user_from_token
+from app.db.session import SessionLocal
+
+try:
+    from pyinstrument import Profiler as _SamplingProfiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pragma: no cover - dependencia opcional
+    _SamplingProfiler = None
+    SpeedscopeRenderer = None
+
+PROFILE_HEADER = "x-profile"
+
+# Solo un perfilado a la vez (cProfile no admite perfiles simultáneos)
+_profiling_lock = threading.Lock()
+
+_NOMBRE_VALIDO = re.compile(r"^[\w.-]+\.(speedscope\.json|collapsed\.txt)$")
+
+
+def list_profiles() -> List[Dict]:
+    """Perfiles guardados, del más reciente al más antiguo"""
+    directorio = settings.PROFILER_DIR
+    if not os.path.isdir(directorio):
+        return []
+    perfiles = []
+    for nombre in os.listdir(directorio):
+        if not _NOMBRE_VALIDO.match(nombre):
+            continue
+        stat = os.stat(os.path.join(directorio, nombre))
+        perfiles.append({
+            "nombre": nombre,
+            "bytes": stat.st_size,
+            "created_at": datetime.utcfromtimestamp(stat.st_mtime)
+        })
+    perfiles.sort(key=lambda perfil: perfil["nombre"], reverse=True)
+    return perfiles
+
+
+def get_profile_path(nombre: str) -> Optional[str]:
+    """Ruta de un perfil guardado, o None si el nombre no es válido o no existe"""
+    if not _NOMBRE_VALIDO.match(nombre):
+        return None
+    ruta = os.path.join(settings.PROFILER_DIR, nombre)
+    return ruta if os.path.isfile(ruta) else None
+
+
+def _profile_name(method: str, path: str, extension: str) -> str:
+    ruta_segura = re.sub(r"[^\w-]+", "_", path).strip("_") or "root"
+    return f"{datetime.utcnow():%Y%m%dT%H%M%S%f}_{method}_{ruta_segura[:60]}.{extension}"
+
+
+def _save_profile(nombre: str, contenido: str):
+    """Guardar un perfil y descartar los más antiguos (anillo de PROFILER_MAX_FILES)"""
+    os.makedirs(settings.PROFILER_DIR, exist_ok=True)
+    with open(os.path.join(settings.PROFILER_DIR, nombre), "w", encoding="utf-8") as archivo:
+        archivo.write(contenido)
+
+    for perfil in list_profiles()[settings.PROFILER_MAX_FILES:]:
+        try:
+            os.remove(os.path.join(settings.PROFILER_DIR, perfil["nombre"]))
+        except OSError:
+            pass
+
+
+def _collapsed_from_cprofile(profile: cProfile.Profile) -> str:
+    """
+    Convertir un cProfile a pilas colapsadas (formato de flamegraph.pl)
+
+    cProfile solo registra pares llamador/llamado, así que las pilas se
+    reconstruyen repartiendo el tiempo de cada función entre sus llamados
+    en proporción al tiempo acumulado de cada arista.
+    """
+    stats = pstats.Stats(profile).stats
+    hijos = defaultdict(list)
+    for funcion, (_, _, _, _, llamadores) in stats.items():
+        for llamador, (_, _, _, ct) in llamadores.items():
+            hijos[llamador].append((funcion, ct))
+
+    def etiqueta(funcion) -> str:
+        archivo, linea, nombre = funcion
+        return f"{nombre} ({os.path.basename(archivo)}:{linea})" if linea else nombre
+
+    pilas: Dict[str, float] = defaultdict(float)
+
+    def recorrer(funcion, tiempo: float, pila: List[str], visitados: set):
+        _, _, tt, ct, _ = stats[funcion]
+        # Se descartan ramas de menos de 10 µs para acotar la explosión de caminos
+        if ct <= 0 or tiempo < 1e-5 or len(pila) > 200 or len(pilas) >= 50000:
+            return
+        pila = pila + [etiqueta(funcion)]
+        visitados = visitados | {funcion}
+        factor = tiempo / ct
+        pilas[";".join(pila)] += tt * factor
+        for hijo, ct_arista in hijos.get(funcion, ()):
+            if hijo not in visitados:
+                recorrer(hijo, ct_arista * factor, pila, visitados)
+
+    for funcion, (_, _, _, ct, llamadores) in stats.items():
+        if not llamadores:
+            recorrer(funcion, ct, [], set())
+
+    return "".join(
+        f"{pila} {int(segundos * 1_000_000)}\n"
+        for pila, segundos in sorted(pilas.items())
+        if segundos >= 1e-6
+    )
+
+
+def _render_and_save(profiler, nombre: str):
+    """Convertir el perfil ya detenido y guardarlo (fuera del event loop)"""
+    if _SamplingProfiler is not None:
+        contenido = profiler.output(renderer=SpeedscopeRenderer())
+    else:
+        contenido = _collapsed_from_cprofile(profiler)
+    _save_profile(nombre, contenido)
+
+
+def _es_admin_activo(token: str) -> bool:
+    """El token es de una sesión vigente de un administrador activo (consulta la base de datos)"""
+    db = SessionLocal()
+    try:
+        usuario = get_user_from_token(token, db)
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+    return usuario.perfil_id == settings.ADMIN_PERFIL_ID
+
+
+class ProfilerMiddleware:
+    """
+    Middleware ASGI que perfila peticiones seleccionadas
+
+    Una petición se perfila si trae la cabecera `X-Profile: 1` con un token
+    vigente (no revocado) de un administrador activo, o al azar según
+    PROFILER_SAMPLE_RATE. Se usa pyinstrument (muestreo estadístico,
+    salida speedscope) si está instalado y cProfile en caso contrario
+    (pilas colapsadas). El nombre del perfil guardado se devuelve en la
+    cabecera `X-Profile-Id`.
+
+    cProfile mide todo el hilo del event loop, no solo la petición: incluye
+    las demás peticiones que se atienden a la vez. En ese caso la respuesta
+    trae `X-Profile-Concurrent` con la cantidad de peticiones que se
+    solaparon con el perfil. La conversión y la escritura del perfil se
+    hacen en un hilo, después de enviar la respuesta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        # Peticiones HTTP en curso e iniciadas en este proceso (solo desde el event loop)
+        self.en_curso = 0
+        self.iniciadas = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.en_curso += 1
+        self.iniciadas += 1
+        try:
+            if await self._should_profile(scope) and _profiling_lock.acquire(blocking=False):
+                try:
+                    await self._profile(scope, receive, send)
+                finally:
+                    _profiling_lock.release()
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            self.en_curso -= 1
+
+    async def _profile(self, scope, receive, send):
+        if _SamplingProfiler is not None:
+            profiler = _SamplingProfiler(interval=0.001, async_mode="enabled")
+            extension = "speedscope.json"
+        else:
+            profiler = cProfile.Profile()
+            extension = "collapsed.txt"
+        nombre = _profile_name(scope.get("method", ""), scope["path"], extension)
+        # Otras peticiones en curso y contador de iniciadas al empezar
+        otras = self.en_curso - 1
+        iniciadas = self.iniciadas
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", [])) + [(b"x-profile-id", nombre.encode())]
+                if _SamplingProfiler is None:
+                    concurrentes = otras + self.iniciadas - iniciadas
+                    headers.append((b"x-profile-concurrent", str(concurrentes).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        if _SamplingProfiler is not None:
+            profiler.start()
+        else:
+            profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if _SamplingProfiler is not None:
+                profiler.stop()
+            else:
+                profiler.disable()
+            await asyncio.to_thread(_render_and_save, profiler, nombre)
+
+    @staticmethod
+    async def _should_profile(scope) -> bool:
+        if not settings.PROFILER_ENABLED:
+            return False
+
+        headers = dict(scope.get("headers") or [])
+        if headers.get(PROFILE_HEADER.encode()) == b"1":
+            # Misma validación que las rutas: sesión no revocada y administrador activo
+            authorization = headers.get(b"authorization", b"").decode("latin-1")
+            if authorization.lower().startswith("bearer "):
+                if await asyncio.to_thread(_es_admin_activo, authorization[7:]):
+                    return True
+
+        if settings.PROFILER_SAMPLE_RATE > 0 and random.random() < settings.PROFILER_SAMPLE_RATE:
+            prefijos = settings.profiler_paths_list
+            return not prefijos or any(scope["path"].startswith(prefijo) for prefijo in prefijos)
+
+        return False
@@ -0,0 +1,88 @@
+"""
+Contexto de la petición HTTP en curso (accesible fuera de los routers)
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+# Scope ASGI de la petición en curso; None fuera de una petición
+current_request: ContextVar[Optional[dict]] = ContextVar("current_request", default=None)
+
+
+class RequestStats:
+    """Datos acumulados durante una petición (usuario autenticado, consultas SQL)"""
+
+    __slots__ = ("usuario_id", "queries")
+
+    def __init__(self):
+        self.usuario_id: Optional[int] = None
+        self.queries = 0
+
+
+# Estadísticas de la petición en curso; el objeto es compartido con los hilos
+# del threadpool porque se copia la referencia, no el contenido
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def route_template(scope: dict) -> str:
+    """
+    Plantilla de la ruta que atendió la petición, o "<sin_ruta>" si no hubo match
+
+    Se usa la plantilla de la ruta (`scope["route"].path_format`), no el
+    path con los valores reemplazados: un valor puede coincidir con un
+    segmento literal (p. ej. /api/perfiles/1/menus/1). Si la plantilla es
+    relativa a un prefijo (Mount o router incluido), el prefijo literal se
+    toma de los primeros segmentos del path.
+    """
+    ruta = scope.get("route")
+    plantilla = getattr(ruta, "path_format", None) or getattr(ruta, "path", None)
+    if scope.get("endpoint") is None or plantilla is None:
+        return "<sin_ruta>"
+    segmentos = scope["path"].split("/")
+    sobrantes = len(segmentos) - (len(plantilla.split("/")) - 1)
+    if sobrantes <= 1:
+        return plantilla
+    return "/".join(segmentos[:sobrantes]) + plantilla
+
+
+def current_route() -> Optional[str]:
+    """Ruta (plantilla) de la petición en curso, si la hay"""
+    scope = current_request.get()
+    if scope is None:
+        return None
+    return f"{scope.get('method', '')} {route_template(scope)}"
+
+
+def current_client_ip() -> Optional[str]:
+    """IP del cliente de la petición en curso, si la hay"""
+    scope = current_request.get()
+    cliente = scope.get("client") if scope is not None else None
+    return cliente[0] if cliente else None
+
+
+def current_user_agent() -> Optional[str]:
+    """Cabecera User-Agent de la petición en curso, si la hay"""
+    scope = current_request.get()
+    if scope is None:
+        return None
+    for nombre, valor in scope.get("headers", ()):
+        if nombre == b"user-agent":
+            return valor.decode("latin-1")
+    return None
+
+
+class RequestContextMiddleware:
+    """Middleware ASGI que publica el scope de la petición en `current_request`"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_request.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
@@ -2,23 +2,32 @@
 Funciones de seguridad: hashing de contraseñas y manejo de JWT
 """
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import password_hash_duration_seconds
 
-# Contexto para hashear contraseñas con bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib/bcrypt y python-jose (con cryptography) se importan en el primer uso
+# para no pagarlos en el arranque de cada worker
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """Contexto para hashear contraseñas con bcrypt"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verificar si la contraseña coincide con el hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    with password_hash_duration_seconds.time("verify"):
+        return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hashear una contraseña"""
-    return pwd_context.hash(password)
+    with password_hash_duration_seconds.time("hash"):
+        return get_pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -32,6 +41,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Token JWT codificado
     """
+    from jose import jwt
+    
     to_encode = data.copy()
     
     if expires_delta:
@@ -55,6 +66,8 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Diccionario con los datos del token o None si es inválido
     """
+    from jose import JWTError, jwt
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
@@ -0,0 +1,46 @@
+"""
+Serialización directa a JSON de listados grandes (FAST_SERIALIZATION_ENABLED)
+"""
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Iterable, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+@lru_cache(maxsize=None)
+def _lector(modelo: Type[BaseModel]) -> Tuple[Tuple[str, ...], Callable[[object], tuple]]:
+    """Campos del modelo de respuesta y una función que los lee de una fila como tupla"""
+    campos = tuple(modelo.model_fields)
+    if len(campos) == 1:
+        return campos, lambda fila: (getattr(fila, campos[0]),)
+    return campos, attrgetter(*campos)
+
+
+def dump_rows_json(modelo: Type[BaseModel], filas: Iterable[object]) -> bytes:
+    """
+    Serializar filas ORM a un arreglo JSON con los campos de `modelo`
+
+    No construye ni valida un modelo por fila: lee los atributos con los
+    nombres de los campos y los codifica con el serializador de
+    pydantic-core. El resultado es el mismo JSON que genera FastAPI con
+    `response_model=List[modelo]`, siempre que los datos cumplan el esquema
+    (vienen de columnas con esos tipos). Solo sirve para modelos planos, cuyos
+    campos son atributos de la fila sin alias, validadores ni modelos anidados.
+
+    Args:
+        modelo: Schema de respuesta (p. ej. EmpleadoResponse)
+        filas: Objetos ORM o filas con esos atributos
+
+    Returns:
+        JSON (bytes)
+    """
+    campos, leer = _lector(modelo)
+    return to_json([dict(zip(campos, leer(fila))) for fila in filas])
+
+
+def json_list_response(modelo: Type[BaseModel], filas: Iterable[object]) -> Response:
+    """Respuesta JSON de un listado, sin la validación y codificación de FastAPI"""
+    return Response(content=dump_rows_json(modelo, filas), media_type="application/json")
@@ -0,0 +1,13 @@
+"""
+Modelo CacheVersion (versión por canal del bus de invalidación de cachés)
+"""
+from sqlalchemy import BigInteger, Column, String, TIMESTAMP
+from app.db.base import Base
+
+
+class CacheVersion(Base):
+    __tablename__ = "cache_version"
+    
+    nombre = Column(String(50), primary_key=True)  # canal: "menu", "estados", "sesiones", "eventos"
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP, nullable=True)
@@ -1,7 +1,8 @@
 """
 Modelo Empleados
 """
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -9,6 +10,10 @@ from app.db.base import Base
 
 class Empleado(Base):
     __tablename__ = "empleados"
+    __table_args__ = (
+        # Feed de cambios: recorrido por (updated_at, empleado_id)
+        Index("ix_empleados_updated_at", "updated_at", "empleado_id"),
+    )
     
     empleado_id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(255), nullable=False)
@@ -19,6 +24,7 @@ class Empleado(Base):
     nacionalidad = Column(String(100))
     estado_id = Column(Integer, ForeignKey("estado.estado_id"))
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relaciones
     estado = relationship("Estado")
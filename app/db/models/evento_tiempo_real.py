@@ -0,0 +1,21 @@
+"""
+Modelo EventoTiempoReal (eventos SSE para repartir en los demás workers)
+"""
+from sqlalchemy import Column, Index, Integer, String, Text, TIMESTAMP
+from app.db.base import Base
+
+
+class EventoTiempoReal(Base):
+    __tablename__ = "eventos_tiempo_real"
+    __table_args__ = (
+        # Relectura de la ventana reciente y purga de los antiguos
+        Index("ix_eventos_tiempo_real_created_at", "created_at"),
+    )
+    
+    evento_id = Column(Integer, primary_key=True)
+    origen = Column(String(100), nullable=False)  # "host:pid" del worker que lo publicó
+    destino = Column(String(20), nullable=False)  # "usuarios" o "perfiles"
+    ids = Column(Text, nullable=True)  # JSON con los usuario_id/perfil_id; NULL = todos
+    evento = Column(String(50), nullable=False)  # p. ej. "permisos_cambiados"
+    datos = Column(Text, nullable=False)  # JSON
+    created_at = Column(TIMESTAMP, nullable=False)
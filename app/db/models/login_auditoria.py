@@ -0,0 +1,23 @@
+"""
+Modelo LoginAuditoria (registro de intentos de login)
+"""
+from sqlalchemy import Column, Float, Index, Integer, String, TIMESTAMP
+from app.db.base import Base
+
+
+class LoginAuditoria(Base):
+    __tablename__ = "login_auditoria"
+    __table_args__ = (
+        # Consultas de revisión: por usuario, por IP o por rango de fechas
+        Index("ix_login_auditoria_usuario", "usuario", "created_at"),
+        Index("ix_login_auditoria_ip", "ip", "created_at"),
+        Index("ix_login_auditoria_created_at", "created_at"),
+    )
+    
+    auditoria_id = Column(Integer, primary_key=True)
+    usuario = Column(String(100), nullable=False)  # nombre enviado (puede no existir)
+    usuario_id = Column(Integer, nullable=True)
+    ip = Column(String(45), nullable=True)
+    resultado = Column(String(30), nullable=False)  # exito, contrasenia_incorrecta, bloqueado, ...
+    latencia_ms = Column(Float, nullable=False)
+    created_at = Column(TIMESTAMP, nullable=False)  # momento del intento (no del guardado)
@@ -1,15 +1,32 @@
 """
 Modelo Menu (recursivo)
 """
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Table, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from app.db.models.perfil import perfil_menu
 
+# Tabla de clausura de la jerarquía: un registro por cada par (ancestro, descendiente),
+# incluido el propio menú con profundidad 0. Permite obtener subárboles y mover ramas
+# con consultas por índice, sin recorrer parent_id nivel por nivel.
+menu_jerarquia = Table(
+    'menu_jerarquia',
+    Base.metadata,
+    Column('ancestro_id', Integer, ForeignKey('menu.menu_id', ondelete='CASCADE'), primary_key=True),
+    Column('descendiente_id', Integer, ForeignKey('menu.menu_id', ondelete='CASCADE'), primary_key=True),
+    Column('profundidad', Integer, nullable=False),
+    Index('ix_menu_jerarquia_descendiente_id', 'descendiente_id')
+)
+
 
 class Menu(Base):
     __tablename__ = "menu"
+    __table_args__ = (
+        # Feed de cambios: recorrido por (updated_at, menu_id)
+        Index("ix_menu_updated_at", "updated_at", "menu_id"),
+    )
     
     menu_id = Column(Integer, primary_key=True, index=True)
     descripcion = Column(String(255), nullable=False)
@@ -19,6 +36,7 @@ class Menu(Base):
     orden = Column(Integer, nullable=False, default=0)
     estado_id = Column(Integer, ForeignKey("estado.estado_id"))
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relaciones
     estado = relationship("Estado")
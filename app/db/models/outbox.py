@@ -0,0 +1,25 @@
+"""
+Modelo OutboxEvento (eventos pendientes de notificar por webhook)
+"""
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class OutboxEvento(Base):
+    __tablename__ = "outbox_eventos"
+    __table_args__ = (
+        # El despachador busca pendientes por (enviado_at IS NULL, evento_id)
+        Index("ix_outbox_eventos_pendientes", "enviado_at", "evento_id"),
+    )
+    
+    evento_id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String(100), nullable=False)  # p. ej. "usuario.desactivado"
+    recurso = Column(String(50), nullable=False)
+    registro_id = Column(Integer)
+    payload = Column(Text, nullable=False)  # JSON
+    intentos = Column(Integer, nullable=False, default=0)
+    proximo_intento = Column(TIMESTAMP, nullable=True)
+    ultimo_error = Column(String(500), nullable=True)
+    enviado_at = Column(TIMESTAMP, nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
@@ -1,7 +1,8 @@
 """
 Modelo Perfil
 """
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Table
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Table, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -17,11 +18,16 @@ perfil_menu = Table(
 
 class Perfil(Base):
     __tablename__ = "perfil"
+    __table_args__ = (
+        # Feed de cambios: recorrido por (updated_at, perfil_id)
+        Index("ix_perfil_updated_at", "updated_at", "perfil_id"),
+    )
     
     perfil_id = Column(Integer, primary_key=True, index=True)
     descripcion = Column(String(255), nullable=False)
     estado_id = Column(Integer, ForeignKey("estado.estado_id"))
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relaciones
     estado = relationship("Estado")
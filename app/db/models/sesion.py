@@ -0,0 +1,25 @@
+"""
+Modelo Sesion (tokens de acceso emitidos, identificados por su jti)
+"""
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, TIMESTAMP
+from app.db.base import Base
+
+
+class Sesion(Base):
+    __tablename__ = "sesiones"
+    __table_args__ = (
+        # Sesiones de un usuario, de la más reciente a la más antigua
+        Index("ix_sesiones_usuario", "usuario_id", "created_at"),
+        # Carga de revocadas vigentes al arrancar y al recibir una invalidación
+        Index("ix_sesiones_revocada_at", "revocada_at"),
+    )
+    
+    sesion_id = Column(Integer, primary_key=True)
+    jti = Column(String(32), unique=True, nullable=False)
+    usuario_id = Column(Integer, ForeignKey("usuarios.usuario_id"), nullable=False)
+    ip = Column(String(45), nullable=True)
+    user_agent = Column(String(255), nullable=True)
+    created_at = Column(TIMESTAMP, nullable=False)
+    expires_at = Column(TIMESTAMP, nullable=False)  # mismo "exp" que el token
+    revocada_at = Column(TIMESTAMP, nullable=True)
+    revocada_por = Column(Integer, nullable=True)  # usuario_id de quien la revocó
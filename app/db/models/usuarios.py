@@ -1,7 +1,8 @@
 """
 Modelo Usuario
 """
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -9,6 +10,12 @@ from app.db.base import Base
 
 class Usuario(Base):
     __tablename__ = "usuarios"
+    __table_args__ = (
+        # Feed de cambios: recorrido por (updated_at, usuario_id)
+        Index("ix_usuarios_updated_at", "updated_at", "usuario_id"),
+        # Cuentas sin actividad en los últimos N días
+        Index("ix_usuarios_ultimo_acceso", "ultimo_acceso"),
+    )
     
     usuario_id = Column(Integer, primary_key=True, index=True)
     usuario = Column(String(255), unique=True, nullable=False, index=True)
@@ -18,6 +25,10 @@ class Usuario(Base):
     empleado_id = Column(Integer, ForeignKey("empleados.empleado_id"))
     intentos = Column(Integer, default=0)
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Escritos por lotes desde LastSeenTracker (no modifican updated_at)
+    ultimo_login = Column(TIMESTAMP, nullable=True)
+    ultimo_acceso = Column(TIMESTAMP, nullable=True)
     
     # Relaciones
     perfil = relationship("Perfil", back_populates="usuarios")
@@ -1,12 +1,15 @@
 """
 Configuración de la sesión de base de datos con SQLAlchemy
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.request_context import request_stats
+from app.db.slow_queries import register_slow_query_log
 
 # Configurar connect_args según el tipo de base de datos
 connect_args = {}
+pool_args = {}
 if "sqlite" in settings.DATABASE_URL:
     connect_args = {"check_same_thread": False}
 elif "postgresql" in settings.DATABASE_URL:
@@ -14,14 +17,31 @@ elif "postgresql" in settings.DATABASE_URL:
         "client_encoding": "utf8",
         "connect_timeout": 10
     }
+    pool_args = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW
+    }
 
 # Crear engine de SQLAlchemy
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args=connect_args,
+    **pool_args,
     pool_pre_ping=True,  # Verificar conexión antes de usar
     echo=False  # Cambiar a True para debug SQL
 )
 
+# Registrar consultas lentas (con su plan) para /api/admin/slow-queries
+register_slow_query_log(engine)
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def count_request_queries(conn, cursor, statement, parameters, context, executemany):
+    """Contar las consultas de la petición en curso (para el log de acceso)"""
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+
+
 # Crear SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
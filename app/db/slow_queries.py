@@ -0,0 +1,180 @@
+"""
+Registro de consultas lentas con captura automática del plan (EXPLAIN)
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.request_context import current_route
+
+logger = logging.getLogger(__name__)
+
+# Solo se explican sentencias de consulta/modificación
+_EXPLICABLES = ("select", "with", "update", "delete", "insert")
+
+# Máximo de rutas distintas guardadas por sentencia
+_MAX_RUTAS = 20
+
+
+def _params_shape(parameters: Any, executemany: bool) -> str:
+    """Forma de los parámetros (tipos, no valores) para no guardar datos sensibles"""
+    if executemany:
+        filas = list(parameters or ())
+        return f"executemany[{len(filas)}]" + (f" {_params_shape(filas[0], False)}" if filas else "")
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{clave}: {type(valor).__name__}" for clave, valor in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(valor).__name__ for valor in parameters) + ")"
+    return type(parameters).__name__
+
+
+class SlowQueryStore:
+    """
+    Estadísticas acotadas de sentencias lentas, agrupadas por texto SQL
+
+    Se guardan como máximo SLOW_QUERY_MAX_STATEMENTS sentencias; al llenarse
+    se descarta la de menor tiempo total.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duracion: float, params_shape: str, ruta: Optional[str]) -> bool:
+        """
+        Registrar una ejecución lenta
+
+        Returns:
+            True si es la primera vez que se ve la sentencia (hay que explicarla)
+        """
+        with self._lock:
+            entry = self._entries.get(statement)
+            nueva = entry is None
+            if nueva:
+                if len(self._entries) >= settings.SLOW_QUERY_MAX_STATEMENTS:
+                    menor = min(self._entries, key=lambda sql: self._entries[sql]["total_seconds"])
+                    del self._entries[menor]
+                entry = self._entries[statement] = {
+                    "sql": statement,
+                    "count": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "params_shape": params_shape,
+                    "rutas": Counter(),
+                    "plan": None,
+                    "first_seen": datetime.utcnow(),
+                    "last_seen": None,
+                }
+            entry["count"] += 1
+            entry["total_seconds"] += duracion
+            entry["max_seconds"] = max(entry["max_seconds"], duracion)
+            entry["params_shape"] = params_shape
+            entry["last_seen"] = datetime.utcnow()
+            if ruta and (ruta in entry["rutas"] or len(entry["rutas"]) < _MAX_RUTAS):
+                entry["rutas"][ruta] += 1
+            return nueva
+
+    def set_plan(self, statement: str, plan: List[str]):
+        with self._lock:
+            entry = self._entries.get(statement)
+            if entry is not None:
+                entry["plan"] = plan
+
+    def ranking(self, limit: int = 50) -> List[dict]:
+        """Sentencias ordenadas por tiempo total, de mayor a menor"""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda entry: entry["total_seconds"], reverse=True)
+            return [
+                {
+                    **entry,
+                    "avg_seconds": entry["total_seconds"] / entry["count"],
+                    "rutas": dict(entry["rutas"].most_common()),
+                }
+                for entry in entries[:limit]
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_store = SlowQueryStore()
+
+
+def _explain(conn, cursor, statement: str, parameters: Any) -> Optional[List[str]]:
+    """Obtener el plan de una sentencia usando la misma conexión DBAPI"""
+    dialecto = conn.dialect.name
+    if dialecto == "sqlite":
+        prefijo = "EXPLAIN QUERY PLAN "
+    elif dialecto == "postgresql":
+        prefijo = "EXPLAIN "
+    else:
+        return None
+
+    explain_cursor = cursor.connection.cursor()
+    try:
+        if dialecto == "postgresql":
+            # Un error dentro de la transacción la abortaría: aislar con un savepoint
+            explain_cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            explain_cursor.execute(prefijo + statement, parameters)
+            filas = explain_cursor.fetchall()
+        except Exception:
+            if dialecto == "postgresql":
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        finally:
+            if dialecto == "postgresql":
+                explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        explain_cursor.close()
+
+    if dialecto == "sqlite":
+        # (id, parent, notused, detail)
+        return [fila[-1] for fila in filas]
+    return [fila[0] for fila in filas]
+
+
+def register_slow_query_log(engine: Engine):
+    """
+    Medir cada sentencia del engine y registrar las que superen el umbral
+
+    Las sentencias de más de SLOW_QUERY_THRESHOLD_MS se guardan en
+    `slow_query_store` junto con la ruta que las ejecutó; la primera vez
+    que aparece cada sentencia se captura su plan con EXPLAIN.
+    """
+
+    # El inicio se guarda en el contexto de ejecución (uno por sentencia): si
+    # la sentencia falla after_cursor_execute no se llama y no queda nada
+    # acumulado en la conexión
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_inicio = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        inicio = getattr(context, "_slow_query_inicio", None)
+        if inicio is None or not settings.SLOW_QUERY_LOG_ENABLED:
+            return
+        duracion = time.perf_counter() - inicio
+        if duracion * 1000 < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+
+        ruta = current_route()
+        logger.warning("Consulta lenta (%.1f ms) en %s: %s", duracion * 1000, ruta or "-", statement)
+        nueva = slow_query_store.record(statement, duracion, _params_shape(parameters, executemany), ruta)
+
+        if nueva and not executemany and statement.lstrip().lower().startswith(_EXPLICABLES):
+            try:
+                plan = _explain(conn, cursor, statement, parameters)
+            except Exception as e:
+                plan = [f"EXPLAIN falló: {e}"]
+            if plan is not None:
+                slow_query_store.set_plan(statement, plan)
@@ -1,17 +1,128 @@
 """
 Punto de entrada principal de la aplicación FastAPI
 """
-from fastapi import FastAPI
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.access_log import AccessLogMiddleware, start_access_log, stop_access_log
+from app.core.admission import AdmissionMiddleware
+from app.core.cache_bus import cache_bus
 from app.core.config import settings
-from app.routers import auth, usuarios, perfiles, menu, empleados
+from app.core.metrics import MetricsMiddleware, instrument_pool, registry
+from app.core.profiler import ProfilerMiddleware
+from app.core.request_context import RequestContextMiddleware
+from app.db.session import SessionLocal, engine
+from app.routers import auth, usuarios, perfiles, menu, empleados, events, profiler, slow_queries, login_audit, sesiones
+from app.services.estado_service import EstadoService
+from app.services.evento_service import EventoService
+from app.services.sesion_service import SesionService
+from app.services.last_seen_tracker import last_seen_tracker
+from app.services.login_audit_writer import login_audit_writer
+from app.services.readiness import readiness_monitor
+from app.services.warmup import warm_up
+from app.services.webhook_dispatcher import webhook_dispatcher
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Tareas de arranque y apagado de la aplicación"""
+    # Invalidaciones de caché publicadas por otros workers (antes de llenar las cachés)
+    cache_bus.start()
+    
+    if settings.WARMUP_ENABLED:
+        # Pool, consultas frecuentes, árboles de menú, validadores y bcrypt antes de recibir tráfico
+        try:
+            await asyncio.wait_for(asyncio.to_thread(warm_up), settings.WARMUP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # Sigue en segundo plano; /health/ready espera a que termine
+            logger.warning("El calentamiento superó %s s", settings.WARMUP_TIMEOUT_SECONDS)
+    else:
+        # Cargar tablas de referencia, sesiones revocadas y último evento SSE en memoria
+        db = SessionLocal()
+        try:
+            EstadoService.load(db)
+            SesionService.load_revocadas(db)
+            EventoService.load_ultimo(db)
+        except SQLAlchemyError:
+            # Sin base de datos al arrancar: se carga en el primer uso
+            pass
+        finally:
+            db.close()
+    
+    # Log de acceso escrito desde un hilo en segundo plano
+    start_access_log()
+    
+    # Auditoría de login escrita por lotes
+    login_audit_writer.start()
+    
+    # Último acceso/login de los usuarios escrito por lotes
+    last_seen_tracker.start()
+    
+    # Despachar eventos del outbox a los webhooks suscritos
+    webhook_dispatcher.start()
+    
+    # Verificaciones de /health/ready en segundo plano
+    readiness_monitor.start()
+    
+    yield
+    
+    await readiness_monitor.stop()
+    await webhook_dispatcher.stop()
+    await login_audit_writer.stop()
+    await last_seen_tracker.stop()
+    stop_access_log()
+    cache_bus.stop()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="API de autenticación y autorización para Business ERP"
+    description="API de autenticación y autorización para Business ERP",
+    lifespan=lifespan
 )
 
+
+def openapi_precalculado() -> dict:
+    """
+    Esquema OpenAPI leído de OPENAPI_SCHEMA_FILE si existe
+    
+    Evita generar el esquema (recorrer todos los modelos) en el primer
+    /docs de cada worker; si no hay archivo se genera como siempre.
+    """
+    if settings.OPENAPI_SCHEMA_FILE and os.path.exists(settings.OPENAPI_SCHEMA_FILE):
+        if app.openapi_schema is None:
+            with open(settings.OPENAPI_SCHEMA_FILE, encoding="utf-8") as archivo:
+                app.openapi_schema = json.load(archivo)
+        return app.openapi_schema
+    return FastAPI.openapi(app)
+
+
+app.openapi = openapi_precalculado
+
+# Ruta en curso disponible para los registros (consultas lentas)
+app.add_middleware(RequestContextMiddleware)
+
+# Perfilado bajo demanda (X-Profile de admin o PROFILER_SAMPLE_RATE)
+app.add_middleware(ProfilerMiddleware)
+
+# Límites de concurrencia por clase de ruta; los 503 quedan en métricas y log de acceso
+app.add_middleware(AdmissionMiddleware)
+
+# Métricas por ruta (/metrics)
+app.add_middleware(MetricsMiddleware)
+instrument_pool(engine)
+
+# Log de acceso JSON (no bloquea: cola + hilo en segundo plano)
+app.add_middleware(AccessLogMiddleware)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +138,11 @@ app.include_router(empleados.router, prefix="/api/empleados", tags=["Empleados"]
 app.include_router(usuarios.router, prefix="/api/usuarios", tags=["Usuarios"])
 app.include_router(perfiles.router, prefix="/api/perfiles", tags=["Perfiles"])
 app.include_router(menu.router, prefix="/api/menu", tags=["Menú"])
+app.include_router(events.router, prefix="/api/events", tags=["Eventos"])
+app.include_router(profiler.router, prefix="/api/admin/profiles", tags=["Perfilado"])
+app.include_router(slow_queries.router, prefix="/api/admin/slow-queries", tags=["Perfilado"])
+app.include_router(login_audit.router, prefix="/api/admin/login-audit", tags=["Auditoría"])
+app.include_router(sesiones.router, prefix="/api/admin/sesiones", tags=["Sesiones"])
 
 
 @app.get("/")
@@ -41,3 +157,21 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Disponibilidad: base de datos, pool, migraciones y cachés
+    
+    Devuelve el último resultado calculado en segundo plano (no consulta la
+    base de datos); 503 mientras no esté listo.
+    """
+    resultado = readiness_monitor.snapshot()
+    return JSONResponse(resultado, status_code=200 if resultado["status"] == "ready" else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas del proceso en formato de texto de Prometheus"""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,17 +1,16 @@
 """
 Router de autenticación
 """
-from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_db, get_current_active_user
-from app.core.security import create_access_token
-from app.core.config import settings
+from app.core.dependencies import get_db, get_current_active_user, oauth2_scheme
+from app.core.security import decode_access_token
 from app.schemas.auth import Token, LoginRequest, ChangePasswordRequest
 from app.schemas.usuarios import UsuarioMeResponse
 from app.services.auth_service import AuthService
+from app.services.sesion_service import SesionService
 from app.db.models.usuarios import Usuario
 
 router = APIRouter()
@@ -37,16 +36,8 @@ async def login(
         contrasenia=login_data.contrasenia
     )
     
-    # Crear token JWT
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={
-            "sub": user.usuario_id,
-            "usuario": user.usuario,
-            "perfil_id": user.perfil_id
-        },
-        expires_delta=access_token_expires
-    )
+    # Crear token JWT con el jti de una nueva sesión
+    access_token = SesionService.crear_sesion(db=db, usuario=user)
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -66,19 +57,26 @@ async def login_form(
         contrasenia=form_data.password
     )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={
-            "sub": user.usuario_id,
-            "usuario": user.usuario,
-            "perfil_id": user.perfil_id
-        },
-        expires_delta=access_token_expires
-    )
+    access_token = SesionService.crear_sesion(db=db, usuario=user)
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+@router.post("/logout")
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user: Usuario = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Cerrar la sesión actual: el token deja de ser aceptado
+    """
+    payload = decode_access_token(token) or {}
+    if payload.get("jti"):
+        SesionService.revocar_jti(db=db, jti=payload["jti"], revocada_por=current_user.usuario_id)
+    return {"message": "Sesión cerrada"}
+
+
 @router.get("/me", response_model=UsuarioMeResponse)
 async def get_current_user_info(
     current_user: Usuario = Depends(get_current_active_user)
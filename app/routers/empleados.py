@@ -1,18 +1,25 @@
 """
 Router de empleados
 """
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.dependencies import get_db, get_current_active_user
+from app.core.serialization import json_list_response
+from app.schemas.cambios import CambiosResponse
 from app.schemas.empleados import (
     EmpleadoCreate, 
     EmpleadoUpdate, 
     EmpleadoResponse,
-    EmpleadoConUsuarioResponse
+    EmpleadoConUsuarioResponse,
+    EmpleadoCedulasLookupRequest,
+    EmpleadoCedulasLookupResponse
 )
 from app.services.empleado_service import EmpleadoService
+from app.services.change_feed_service import ChangeFeedService
+from app.db.models.empleados import Empleado
 from app.db.models.usuarios import Usuario
 
 router = APIRouter()
@@ -29,9 +36,28 @@ async def get_empleados(
     Obtener lista de empleados
     """
     empleados = EmpleadoService.get_empleados(db=db, skip=skip, limit=limit)
+    if settings.FAST_SERIALIZATION_ENABLED:
+        return json_list_response(EmpleadoResponse, empleados)
     return empleados
 
 
+@router.get("/changes", response_model=CambiosResponse[EmpleadoResponse])
+async def get_empleados_changes(
+    since: Optional[str] = None,
+    limit: int = 500,
+    current_user: Usuario = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Feed de cambios de empleados para sincronización incremental
+    
+    - **since**: Cursor `next_cursor` de la página anterior (vacío = desde el inicio)
+    - **limit**: Máximo de registros por página
+    - Devuelve altas, modificaciones y bajas lógicas ordenadas por `updated_at`
+    """
+    return ChangeFeedService.get_changes(db=db, model=Empleado, since=since, limit=limit)
+
+
 @router.get("/{empleado_id}", response_model=EmpleadoConUsuarioResponse)
 async def get_empleado(
     empleado_id: int,
@@ -63,6 +89,29 @@ async def get_empleado_by_cedula(
     return empleado
 
 
+@router.post("/cedulas/lookup", response_model=EmpleadoCedulasLookupResponse)
+async def lookup_empleados_by_cedulas(
+    lookup_data: EmpleadoCedulasLookupRequest,
+    current_user: Usuario = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Buscar empleados por varias cédulas en una sola petición
+    
+    - **cedulas**: Lista de cédulas (los duplicados se ignoran)
+    - **incluir_usuario**: Si incluir los datos del usuario asociado
+    
+    Devuelve los empleados encontrados y las cédulas sin coincidencia,
+    en el mismo orden de la solicitud.
+    """
+    encontrados, no_encontrados = EmpleadoService.get_empleados_by_cedulas(
+        db=db,
+        cedulas=lookup_data.cedulas,
+        incluir_usuario=lookup_data.incluir_usuario
+    )
+    return {"encontrados": encontrados, "no_encontrados": no_encontrados}
+
+
 @router.post("/", response_model=EmpleadoResponse, status_code=status.HTTP_201_CREATED)
 async def create_empleado(
     empleado_data: EmpleadoCreate,
@@ -0,0 +1,67 @@
+"""
+Router de eventos en tiempo real (Server-Sent Events)
+"""
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.dependencies import get_db, get_user_from_token
+from app.core.events import event_hub
+from app.core.security import decode_access_token
+
+router = APIRouter()
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    token: Optional[str] = Query(None, description="Token JWT (EventSource no permite cabeceras)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Flujo SSE de eventos del usuario actual
+    
+    - **sesion_revocada**: el usuario fue desactivado o se revocó la sesión del token; el flujo se cierra
+    - **permisos_cambiados**: cambió el perfil o los menús asignados
+    - **menu_actualizado**: nueva versión del árbol de menú (`datos.version`)
+    
+    Acepta el token en la cabecera `Authorization: Bearer` o en `?token=`.
+    """
+    authorization = request.headers.get("Authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    
+    usuario = get_user_from_token(token, db)
+    usuario_id, perfil_id = usuario.usuario_id, usuario.perfil_id
+    jti = (decode_access_token(token) or {}).get("jti")
+    # No retener la conexión a la base de datos mientras el flujo está abierto
+    db.close()
+    
+    async def generar():
+        sub = event_hub.subscribe(usuario_id, perfil_id, jti)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    mensaje = await asyncio.wait_for(sub.queue.get(), timeout=settings.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield f"event: {mensaje['evento']}\ndata: {json.dumps(mensaje['datos'])}\n\n"
+                if mensaje["evento"] == "sesion_revocada":
+                    break
+        finally:
+            event_hub.unsubscribe(sub)
+    
+    return StreamingResponse(
+        generar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,53 @@
+"""
+Router de consulta de la auditoría de login (revisiones de seguridad)
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_db, require_admin
+from app.schemas.login_audit import FallosPorIpResponse, LoginAuditoriaResponse
+from app.services.login_audit_service import LoginAuditService
+from app.db.models.usuarios import Usuario
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[LoginAuditoriaResponse])
+async def get_login_audit(
+    usuario: Optional[str] = None,
+    ip: Optional[str] = None,
+    resultado: Optional[str] = None,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    antes_de: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: Usuario = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Intentos de login, del más reciente al más antiguo
+    
+    - **usuario** / **ip** / **resultado**: Filtros opcionales
+    - **desde** / **hasta**: Rango de fechas (UTC)
+    - **antes_de**: `auditoria_id` del último registro recibido, para la página siguiente
+    """
+    return LoginAuditService.get_registros(
+        db=db, usuario=usuario, ip=ip, resultado=resultado,
+        desde=desde, hasta=hasta, antes_de=antes_de, limit=limit
+    )
+
+
+@router.get("/fallos-por-ip", response_model=List[FallosPorIpResponse])
+async def get_fallos_por_ip(
+    horas: int = Query(24, ge=1, le=24 * 90),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: Usuario = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    IPs con más intentos de login fallidos en las últimas `horas`
+    """
+    desde = datetime.utcnow() - timedelta(hours=horas)
+    return LoginAuditService.get_fallos_por_ip(db=db, desde=desde, limit=limit)
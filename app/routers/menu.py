@@ -1,13 +1,24 @@
 """
 Router de menú
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.dependencies import get_db, get_current_active_user
-from app.schemas.menu import MenuCreate, MenuUpdate, MenuResponse, MenuTreeResponse
+from app.core.serialization import json_list_response
+from app.schemas.cambios import CambiosResponse
+from app.schemas.menu import (
+    MenuCreate,
+    MenuUpdate,
+    MenuMove,
+    MenuResponse,
+    MenuTreeResponse,
+    MenuAuthorizeResponse
+)
 from app.services.menu_service import MenuService
+from app.services.change_feed_service import ChangeFeedService
 from app.db.models.menu import Menu
 from app.db.models.usuarios import Usuario
 
@@ -21,9 +32,31 @@ async def get_user_menu_tree(
 ):
     """
     Obtener árbol de menú del usuario actual según su perfil
+    
+    - Se sirve desde caché por perfil (JSON ya serializado)
     """
-    menu_tree = MenuService.get_user_menu_tree(db=db, usuario=current_user)
-    return menu_tree
+    menu_tree = MenuService.get_user_menu_tree_json(db=db, usuario=current_user)
+    return Response(
+        content=menu_tree,
+        media_type="application/json",
+        headers={"X-Menu-Version": str(MenuService.get_menu_version())}
+    )
+
+
+@router.get("/authorize", response_model=MenuAuthorizeResponse)
+async def authorize_url(
+    url: str,
+    current_user: Usuario = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Verificar si el usuario actual puede abrir una URL de menú
+    
+    - **url**: Ruta a verificar (p. ej. `/seguridad/usuarios`)
+    - Se resuelve contra el índice en memoria de URLs del perfil
+    """
+    permitido = MenuService.is_url_allowed(db=db, perfil_id=current_user.perfil_id, url=url)
+    return MenuAuthorizeResponse(url=url, permitido=permitido)
 
 
 @router.get("/", response_model=List[MenuResponse])
@@ -36,9 +69,28 @@ async def get_all_menus(
     Obtener todos los menús (para administración)
     """
     menus = MenuService.get_all_menus(db=db, include_inactive=include_inactive)
+    if settings.FAST_SERIALIZATION_ENABLED:
+        return json_list_response(MenuResponse, menus)
     return menus
 
 
+@router.get("/changes", response_model=CambiosResponse[MenuResponse])
+async def get_menus_changes(
+    since: Optional[str] = None,
+    limit: int = 500,
+    current_user: Usuario = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Feed de cambios de menús para sincronización incremental
+    
+    - **since**: Cursor `next_cursor` de la página anterior (vacío = desde el inicio)
+    - **limit**: Máximo de registros por página
+    - Devuelve altas, modificaciones y bajas lógicas ordenadas por `updated_at`
+    """
+    return ChangeFeedService.get_changes(db=db, model=Menu, since=since, limit=limit)
+
+
 @router.get("/{menu_id}", response_model=MenuResponse)
 async def get_menu(
     menu_id: int,
@@ -57,6 +109,19 @@ async def get_menu(
     return menu
 
 
+@router.get("/{menu_id}/subtree", response_model=MenuTreeResponse)
+async def get_menu_subtree(
+    menu_id: int,
+    include_inactive: bool = False,
+    current_user: Usuario = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Obtener un menú con todos sus submenús anidados
+    """
+    return MenuService.get_subtree(db=db, menu_id=menu_id, include_inactive=include_inactive)
+
+
 @router.post("/", response_model=MenuResponse, status_code=status.HTTP_201_CREATED)
 async def create_menu(
     menu_data: MenuCreate,
@@ -65,6 +130,8 @@ async def create_menu(
 ):
     """
     Crear nuevo menú
+    
+    - Si tiene `parent_id`, el nivel se calcula a partir del padre
     """
     db_menu = Menu(
         descripcion=menu_data.descripcion,
@@ -74,9 +141,10 @@ async def create_menu(
         orden=menu_data.orden,
         estado_id=menu_data.estado_id
     )
-    db.add(db_menu)
+    MenuService.add_to_hierarchy(db, db_menu)
     db.commit()
     db.refresh(db_menu)
+    # Un menú nuevo no está asignado a ningún perfil: no hay cachés que invalidar
     return db_menu
 
 
@@ -89,6 +157,8 @@ async def update_menu(
 ):
     """
     Actualizar menú
+    
+    - Si cambia `parent_id`, se mueve la rama completa (ver `PUT /{menu_id}/move`)
     """
     db_menu = db.query(Menu).filter(Menu.menu_id == menu_id).first()
     if not db_menu:
@@ -97,12 +167,44 @@ async def update_menu(
             detail="Menú no encontrado"
         )
     
+    perfil_ids = MenuService.get_affected_perfil_ids(db, menu_id)
     update_data = menu_data.model_dump(exclude_unset=True)
+    if "parent_id" in update_data:
+        MenuService.move_menu(db, db_menu, update_data.pop("parent_id"))
     for field, value in update_data.items():
         setattr(db_menu, field, value)
     
     db.commit()
     db.refresh(db_menu)
+    MenuService.invalidate_menu_cache(perfil_ids)
+    return db_menu
+
+
+@router.put("/{menu_id}/move", response_model=MenuResponse)
+async def move_menu(
+    menu_id: int,
+    move_data: MenuMove,
+    current_user: Usuario = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Mover un menú con toda su rama bajo otro padre
+    
+    - **parent_id**: Nuevo padre (null para dejarlo como raíz)
+    - Recalcula el nivel de toda la rama
+    """
+    db_menu = db.query(Menu).filter(Menu.menu_id == menu_id).first()
+    if not db_menu:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Menú no encontrado"
+        )
+    
+    perfil_ids = MenuService.get_affected_perfil_ids(db, menu_id)
+    MenuService.move_menu(db, db_menu, move_data.parent_id)
+    db.commit()
+    db.refresh(db_menu)
+    MenuService.invalidate_menu_cache(perfil_ids)
     return db_menu
 
 
@@ -114,6 +216,8 @@ async def delete_menu(
 ):
     """
     Eliminar menú
+    
+    - No se puede eliminar un menú que tenga submenús
     """
     db_menu = db.query(Menu).filter(Menu.menu_id == menu_id).first()
     if not db_menu:
@@ -122,6 +226,9 @@ async def delete_menu(
             detail="Menú no encontrado"
         )
     
+    perfil_ids = MenuService.get_affected_perfil_ids(db, menu_id)
+    MenuService.remove_from_hierarchy(db, db_menu)
     db.delete(db_menu)
     db.commit()
+    MenuService.invalidate_menu_cache(perfil_ids)
     return None
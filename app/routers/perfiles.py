@@ -1,12 +1,17 @@
 """
 Router de perfiles
 """
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_db, get_current_active_user
+from app.schemas.cambios import CambiosResponse
 from app.schemas.perfiles import PerfilCreate, PerfilUpdate, PerfilResponse, PerfilMenuAssign
+from app.services.menu_service import MenuService
+from app.services.change_feed_service import ChangeFeedService
+from app.services.evento_service import EventoService
 from app.db.models.perfil import Perfil
 from app.db.models.menu import Menu
 from app.db.models.usuarios import Usuario
@@ -28,6 +33,23 @@ async def get_perfiles(
     return perfiles
 
 
+@router.get("/changes", response_model=CambiosResponse[PerfilResponse])
+async def get_perfiles_changes(
+    since: Optional[str] = None,
+    limit: int = 500,
+    current_user: Usuario = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Feed de cambios de perfiles para sincronización incremental
+    
+    - **since**: Cursor `next_cursor` de la página anterior (vacío = desde el inicio)
+    - **limit**: Máximo de registros por página
+    - Devuelve altas, modificaciones y bajas lógicas ordenadas por `updated_at`
+    """
+    return ChangeFeedService.get_changes(db=db, model=Perfil, since=since, limit=limit)
+
+
 @router.get("/{perfil_id}", response_model=PerfilResponse)
 async def get_perfil(
     perfil_id: int,
@@ -88,6 +110,8 @@ async def update_perfil(
     
     db.commit()
     db.refresh(db_perfil)
+    MenuService.invalidate_menu_cache([perfil_id])
+    EventoService.publicar_a_perfiles([perfil_id], "permisos_cambiados", {"perfil_id": perfil_id})
     return db_perfil
 
 
@@ -109,6 +133,8 @@ async def delete_perfil(
     
     db.delete(db_perfil)
     db.commit()
+    MenuService.invalidate_menu_cache([perfil_id])
+    EventoService.publicar_a_perfiles([perfil_id], "permisos_cambiados", {"perfil_id": perfil_id})
     return None
 
 
@@ -137,8 +163,11 @@ async def assign_menus_to_perfil(
             detail="Algunos menús no existen"
         )
     
-    # Asignar menús al perfil
+    # Asignar menús al perfil (marca el perfil como modificado para el feed de cambios)
     perfil.menus = menus
+    perfil.updated_at = datetime.utcnow()
     db.commit()
+    MenuService.invalidate_menu_cache([perfil_id])
+    EventoService.publicar_a_perfiles([perfil_id], "permisos_cambiados", {"perfil_id": perfil_id})
     
     return {"message": f"{len(menus)} menús asignados al perfil"}
@@ -0,0 +1,39 @@
+"""
+Router de administración de perfiles de rendimiento
+"""
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.core.dependencies import require_admin
+from app.core.profiler import get_profile_path, list_profiles
+from app.schemas.profiler import ProfileInfo
+from app.db.models.usuarios import Usuario
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[ProfileInfo])
+async def get_profiles(current_user: Usuario = Depends(require_admin)):
+    """
+    Listar los perfiles guardados (más recientes primero)
+    
+    - `.speedscope.json`: abrir en https://www.speedscope.app
+    - `.collapsed.txt`: pilas colapsadas para flamegraph.pl / speedscope
+    """
+    return list_profiles()
+
+
+@router.get("/{nombre}")
+async def download_profile(nombre: str, current_user: Usuario = Depends(require_admin)):
+    """
+    Descargar un perfil guardado
+    """
+    ruta = get_profile_path(nombre)
+    if ruta is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Perfil no encontrado"
+        )
+    media_type = "application/json" if nombre.endswith(".json") else "text/plain"
+    return FileResponse(ruta, media_type=media_type, filename=nombre)
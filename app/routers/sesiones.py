@@ -0,0 +1,60 @@
+"""
+Router de administración de sesiones (listar y revocar)
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_db, require_admin
+from app.schemas.sesiones import SesionResponse, SesionesRevocadasResponse
+from app.services.sesion_service import SesionService
+from app.db.models.usuarios import Usuario
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[SesionResponse])
+async def get_sesiones(
+    usuario_id: Optional[int] = None,
+    incluir_inactivas: bool = False,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: Usuario = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Sesiones de la más reciente a la más antigua
+    
+    - **usuario_id**: Solo las de este usuario
+    - **incluir_inactivas**: Incluir revocadas y expiradas
+    """
+    return SesionService.get_sesiones(
+        db=db, usuario_id=usuario_id, incluir_inactivas=incluir_inactivas, limit=limit
+    )
+
+
+@router.delete("/usuario/{usuario_id}", response_model=SesionesRevocadasResponse)
+async def revocar_sesiones_usuario(
+    usuario_id: int,
+    current_user: Usuario = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Revocar todas las sesiones vigentes de un usuario (cierre forzado)
+    """
+    revocadas = SesionService.revocar_sesiones_usuario(
+        db=db, usuario_id=usuario_id, revocada_por=current_user.usuario_id
+    )
+    return {"revocadas": revocadas}
+
+
+@router.delete("/{sesion_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revocar_sesion(
+    sesion_id: int,
+    current_user: Usuario = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Revocar una sesión; el token deja de ser aceptado en todos los workers
+    """
+    SesionService.revocar_sesion(db=db, sesion_id=sesion_id, revocada_por=current_user.usuario_id)
+    return None
@@ -0,0 +1,35 @@
+"""
+Router de administración del registro de consultas lentas
+"""
+from typing import List
+from fastapi import APIRouter, Depends, Query, status
+
+from app.core.dependencies import require_admin
+from app.db.slow_queries import slow_query_store
+from app.schemas.slow_queries import SlowQueryResponse
+from app.db.models.usuarios import Usuario
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[SlowQueryResponse])
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: Usuario = Depends(require_admin)
+):
+    """
+    Sentencias lentas ordenadas por tiempo total (mayor primero)
+    
+    Incluye las rutas que las ejecutaron y el plan capturado con EXPLAIN
+    en su primera aparición.
+    """
+    return slow_query_store.ranking(limit)
+
+
+@router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(current_user: Usuario = Depends(require_admin)):
+    """
+    Vaciar el registro de consultas lentas
+    """
+    slow_query_store.clear()
+    return None
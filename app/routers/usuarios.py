@@ -1,13 +1,17 @@
 """
 Router de usuarios
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_db, get_current_active_user
+from app.core.config import settings
+from app.core.dependencies import get_db, get_current_active_user, require_admin
+from app.core.serialization import json_list_response
+from app.schemas.cambios import CambiosResponse
 from app.schemas.usuarios import UsuarioCreate, UsuarioUpdate, UsuarioResponse
 from app.services.usuario_service import UsuarioService
+from app.services.change_feed_service import ChangeFeedService
 from app.db.models.usuarios import Usuario
 
 router = APIRouter()
@@ -24,9 +28,44 @@ async def get_usuarios(
     Obtener lista de usuarios
     """
     usuarios = UsuarioService.get_usuarios(db=db, skip=skip, limit=limit)
+    if settings.FAST_SERIALIZATION_ENABLED:
+        return json_list_response(UsuarioResponse, usuarios)
     return usuarios
 
 
+@router.get("/changes", response_model=CambiosResponse[UsuarioResponse])
+async def get_usuarios_changes(
+    since: Optional[str] = None,
+    limit: int = 500,
+    current_user: Usuario = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Feed de cambios de usuarios para sincronización incremental
+    
+    - **since**: Cursor `next_cursor` de la página anterior (vacío = desde el inicio)
+    - **limit**: Máximo de registros por página
+    - Devuelve altas, modificaciones y bajas lógicas ordenadas por `updated_at`
+    """
+    return ChangeFeedService.get_changes(db=db, model=Usuario, since=since, limit=limit)
+
+
+@router.get("/inactivos", response_model=List[UsuarioResponse])
+async def get_usuarios_inactivos(
+    dias: int = Query(90, ge=1),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: Usuario = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Usuarios sin acceso en los últimos `dias` días (limpieza de cuentas inactivas)
+    
+    - **dias**: Días sin actividad (por defecto 90)
+    - Primero los que nunca accedieron, luego por `ultimo_acceso` ascendente
+    """
+    return UsuarioService.get_usuarios_inactivos(db=db, dias=dias, limit=limit)
+
+
 @router.get("/{usuario_id}", response_model=UsuarioResponse)
 async def get_usuario(
     usuario_id: int,
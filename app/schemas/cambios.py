@@ -0,0 +1,20 @@
+"""
+Schemas para el feed de cambios incremental
+"""
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CambioItem(BaseModel, Generic[T]):
+    """Registro creado/actualizado; `eliminado` indica baja lógica (estado inactivo)"""
+    eliminado: bool
+    datos: T
+
+
+class CambiosResponse(BaseModel, Generic[T]):
+    """Página del feed de cambios, ordenada por (updated_at, id); puede repetir registros"""
+    items: List[CambioItem[T]]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
@@ -2,7 +2,7 @@
 Schemas para Empleado
 """
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -41,6 +41,7 @@ class EmpleadoResponse(EmpleadoBase):
     """Response de empleado"""
     empleado_id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -55,3 +56,23 @@ class EmpleadoConUsuarioResponse(EmpleadoResponse):
     
     class Config:
         from_attributes = True
+
+
+class EmpleadoCedulasLookupRequest(BaseModel):
+    """Buscar empleados por varias cédulas"""
+    cedulas: List[str]
+    incluir_usuario: bool = False
+
+
+class EmpleadoLookupResponse(EmpleadoResponse):
+    """Empleado encontrado; los datos de usuario solo vienen si se pidieron"""
+    tiene_usuario: Optional[bool] = None
+    usuario_id: Optional[int] = None
+    nombre_usuario: Optional[str] = None
+    usuario_estado: Optional[str] = None
+
+
+class EmpleadoCedulasLookupResponse(BaseModel):
+    """Resultado de la búsqueda por cédulas"""
+    encontrados: List[EmpleadoLookupResponse]
+    no_encontrados: List[str]
@@ -0,0 +1,28 @@
+"""
+Schemas para la auditoría de login
+"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class LoginAuditoriaResponse(BaseModel):
+    """Intento de login registrado"""
+    auditoria_id: int
+    usuario: str
+    usuario_id: Optional[int] = None
+    ip: Optional[str] = None
+    resultado: str
+    latencia_ms: float
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class FallosPorIpResponse(BaseModel):
+    """Intentos fallidos agrupados por IP"""
+    ip: Optional[str] = None
+    fallos: int
+    usuarios: int
+    ultimo_intento: datetime
@@ -31,10 +31,16 @@ class MenuUpdate(BaseModel):
     estado_id: Optional[int] = None
 
 
+class MenuMove(BaseModel):
+    """Mover una rama de menú bajo otro padre (None = raíz)"""
+    parent_id: Optional[int] = None
+
+
 class MenuResponse(MenuBase):
     """Response de menú"""
     menu_id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -48,5 +54,11 @@ class MenuTreeResponse(MenuResponse):
         from_attributes = True
 
 
+class MenuAuthorizeResponse(BaseModel):
+    """Resultado de verificar acceso a una URL"""
+    url: str
+    permitido: bool
+
+
 # Actualizar forward references para recursión
 MenuTreeResponse.model_rebuild()
@@ -27,6 +27,7 @@ class PerfilResponse(PerfilBase):
     """Response de perfil"""
     perfil_id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
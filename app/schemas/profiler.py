@@ -0,0 +1,12 @@
+"""
+Schemas para los perfiles de rendimiento
+"""
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class ProfileInfo(BaseModel):
+    """Perfil de rendimiento guardado"""
+    nombre: str
+    bytes: int
+    created_at: datetime
@@ -0,0 +1,27 @@
+"""
+Schemas para sesiones
+"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class SesionResponse(BaseModel):
+    """Sesión (token de acceso emitido)"""
+    sesion_id: int
+    jti: str
+    usuario_id: int
+    ip: Optional[str] = None
+    user_agent: Optional[str] = None
+    created_at: datetime
+    expires_at: datetime
+    revocada_at: Optional[datetime] = None
+    revocada_por: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class SesionesRevocadasResponse(BaseModel):
+    """Resultado de revocar las sesiones de un usuario"""
+    revocadas: int
@@ -0,0 +1,20 @@
+"""
+Schemas para el registro de consultas lentas
+"""
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+class SlowQueryResponse(BaseModel):
+    """Sentencia lenta con sus estadísticas acumuladas"""
+    sql: str
+    count: int
+    total_seconds: float
+    avg_seconds: float
+    max_seconds: float
+    params_shape: str
+    rutas: Dict[str, int]
+    plan: Optional[List[str]] = None
+    first_seen: datetime
+    last_seen: Optional[datetime] = None
@@ -32,6 +32,9 @@ class UsuarioResponse(UsuarioBase):
     usuario_id: int
     intentos: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
+    ultimo_login: Optional[datetime] = None
+    ultimo_acceso: Optional[datetime] = None
     
     class Config:
         from_attributes = True
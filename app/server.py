@@ -0,0 +1,152 @@
+"""
+Servidor de producción con varios workers
+
+    python -m app.server
+    python -m app.server --workers 8 --port 8080
+    python -m app.server --dry-run        # mostrar la configuración sin arrancar
+
+En Linux, con gunicorn instalado, arranca gunicorn con workers de uvicorn:
+la aplicación se importa una vez antes del fork (preload) y cada worker se
+recicla tras SERVER_MAX_REQUESTS peticiones (más un jitter para que no se
+reinicien todos a la vez). Sin gunicorn (p. ej. Windows) se usa el modo
+multiproceso de uvicorn. En ambos casos uvicorn elige uvloop y httptools si
+están instalados (vienen con uvicorn[standard]).
+
+Cada worker tiene su propia memoria: cachés, métricas y suscripciones SSE
+son por proceso.
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.server")
+
+APP_PATH = "app.main:app"
+
+# SQLite serializa las escrituras con un lock de archivo: más procesos solo compiten por él
+SQLITE_MAX_WORKERS = 4
+
+
+def available_cpus() -> int:
+    """CPUs que puede usar este proceso (respeta taskset/cgroups cpuset)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def auto_workers(cpus: Optional[int] = None) -> int:
+    """
+    Cantidad de workers según CPUs y base de datos
+
+    Los workers son asíncronos, así que uno por CPU alcanza. Con PostgreSQL
+    cada worker abre hasta DB_POOL_SIZE + DB_MAX_OVERFLOW conexiones, y el
+    total no debe pasar de DB_MAX_CONNECTIONS.
+    """
+    workers = cpus or available_cpus()
+    if "sqlite" in settings.DATABASE_URL:
+        return max(1, min(workers, SQLITE_MAX_WORKERS))
+
+    por_worker = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    if por_worker > 0:
+        workers = min(workers, settings.DB_MAX_CONNECTIONS // por_worker)
+    return max(1, workers)
+
+
+def _disponible(modulo: str) -> bool:
+    return importlib.util.find_spec(modulo) is not None
+
+
+def _post_fork(server, worker):
+    """Descartar las conexiones heredadas del proceso maestro (preload)"""
+    from app.db.session import engine
+    engine.dispose(close=False)
+
+
+def run_gunicorn(host: str, port: int, workers: int):
+    from gunicorn.app.base import BaseApplication
+
+    class GunicornApp(BaseApplication):
+        def __init__(self, opciones: dict):
+            self.opciones = opciones
+            super().__init__()
+
+        def load_config(self):
+            for clave, valor in self.opciones.items():
+                self.cfg.set(clave, valor)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    GunicornApp({
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "post_fork": _post_fork,
+    }).run()
+
+
+def run_uvicorn(host: str, port: int, workers: int):
+    import uvicorn
+
+    if settings.SERVER_MAX_REQUESTS and workers > 1:
+        # El supervisor de uvicorn no reemplaza a los workers que terminan
+        logger.warning("Sin gunicorn no se reciclan los workers tras SERVER_MAX_REQUESTS")
+
+    uvicorn.run(
+        APP_PATH,
+        host=host,
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Servidor de producción")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS,
+                        help="0 = automático según CPUs y pool de BD")
+    parser.add_argument("--server", choices=["auto", "gunicorn", "uvicorn"], default="auto")
+    parser.add_argument("--dry-run", action="store_true", help="Mostrar la configuración y salir")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    workers = args.workers or auto_workers()
+    servidor = args.server
+    if servidor == "auto":
+        servidor = "gunicorn" if sys.platform != "win32" and _disponible("gunicorn") else "uvicorn"
+
+    logger.info(
+        "%s en %s:%s con %d workers (CPUs=%d, loop=%s, http=%s)",
+        servidor, args.host, args.port, workers, available_cpus(),
+        "uvloop" if _disponible("uvloop") else "asyncio",
+        "httptools" if _disponible("httptools") else "h11",
+    )
+    if args.dry_run:
+        return 0
+
+    if servidor == "gunicorn":
+        run_gunicorn(args.host, args.port, workers)
+    else:
+        run_uvicorn(args.host, args.port, workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
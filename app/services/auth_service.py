@@ -1,12 +1,20 @@
 """
 Servicio de autenticación
 """
+import time
+from datetime import datetime
 from typing import Optional
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.db.models.usuarios import Usuario
 from app.core.security import verify_password, get_password_hash
 from app.core.config import settings
+from app.core.metrics import login_total
+from app.core.request_context import current_client_ip, request_stats
+from app.services.last_seen_tracker import last_seen_tracker
+from app.services.login_audit_writer import login_audit_writer
+from app.services.outbox_service import OutboxService
 
 
 class AuthService:
@@ -28,10 +36,14 @@ class AuthService:
         Raises:
             HTTPException: Si las credenciales son inválidas o el usuario está bloqueado
         """
+        inicio = time.perf_counter()
+        
         # Buscar usuario
         user = db.query(Usuario).filter(Usuario.usuario == usuario).first()
         
         if not user:
+            login_total.inc("fallo")
+            AuthService._auditar(usuario, None, "usuario_inexistente", inicio)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuario o contraseña incorrectos"
@@ -39,6 +51,8 @@ class AuthService:
         
         # Verificar si está bloqueado
         if user.intentos >= settings.MAX_LOGIN_ATTEMPTS:
+            login_total.inc("fallo")
+            AuthService._auditar(usuario, user.usuario_id, "bloqueado", inicio)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Usuario bloqueado. Máximo {settings.MAX_LOGIN_ATTEMPTS} intentos fallidos"
@@ -46,6 +60,8 @@ class AuthService:
         
         # Verificar si el usuario está activo (estado_id = 1)
         if user.estado_id != 1:
+            login_total.inc("fallo")
+            AuthService._auditar(usuario, user.usuario_id, "inactivo", inicio)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Usuario inactivo"
@@ -53,9 +69,27 @@ class AuthService:
         
         # Verificar contraseña
         if not verify_password(contrasenia, user.contrasenia):
-            # Incrementar intentos fallidos
-            user.intentos += 1
+            # Incrementar intentos fallidos. Un intento fallido no es un cambio
+            # del usuario para el feed de sincronización: solo el bloqueo
+            # actualiza updated_at
+            login_total.inc("fallo")
+            bloqueo = user.intentos + 1 >= settings.MAX_LOGIN_ATTEMPTS
+            AuthService._set_intentos(
+                db, user, Usuario.intentos + 1,
+                datetime.utcnow() if bloqueo else Usuario.updated_at
+            )
+            if bloqueo:
+                login_total.inc("bloqueo")
+                OutboxService.registrar(
+                    db, "usuario.bloqueado", "usuario", user.usuario_id,
+                    OutboxService.usuario_payload(user)
+                )
             db.commit()
+            AuthService._auditar(
+                usuario, user.usuario_id,
+                "bloqueo" if user.intentos >= settings.MAX_LOGIN_ATTEMPTS else "contrasenia_incorrecta",
+                inicio
+            )
             
             intentos_restantes = settings.MAX_LOGIN_ATTEMPTS - user.intentos
             if intentos_restantes > 0:
@@ -69,13 +103,39 @@ class AuthService:
                     detail=f"Usuario bloqueado. Máximo {settings.MAX_LOGIN_ATTEMPTS} intentos fallidos"
                 )
         
-        # Login exitoso: resetear intentos
+        # Login exitoso: resetear intentos (sin tocar updated_at)
         if user.intentos > 0:
-            user.intentos = 0
+            AuthService._set_intentos(db, user, 0, Usuario.updated_at)
             db.commit()
         
+        login_total.inc("exito")
+        AuthService._auditar(usuario, user.usuario_id, "exito", inicio)
+        last_seen_tracker.login(user.usuario_id)
+        stats = request_stats.get()
+        if stats is not None:
+            stats.usuario_id = user.usuario_id
         return user
     
+    @staticmethod
+    def _set_intentos(db: Session, user: Usuario, intentos, updated_at):
+        """Actualizar los intentos fallidos con un valor explícito de updated_at (sin onupdate)"""
+        db.execute(
+            update(Usuario)
+            .where(Usuario.usuario_id == user.usuario_id)
+            .values(intentos=intentos, updated_at=updated_at)
+        )
+    
+    @staticmethod
+    def _auditar(usuario: str, usuario_id: Optional[int], resultado: str, inicio: float):
+        """Agregar el intento a la auditoría de login (se escribe por lotes en segundo plano)"""
+        login_audit_writer.record(
+            usuario=usuario,
+            usuario_id=usuario_id,
+            ip=current_client_ip(),
+            resultado=resultado,
+            latencia_ms=(time.perf_counter() - inicio) * 1000
+        )
+    
     @staticmethod
     def change_password(db: Session, usuario_id: int, contrasenia_actual: str, contrasenia_nueva: str):
         """
@@ -107,6 +167,10 @@ class AuthService:
         
         # Actualizar contraseña
         user.contrasenia = get_password_hash(contrasenia_nueva)
+        OutboxService.registrar(
+            db, "usuario.contrasenia_cambiada", "usuario", user.usuario_id,
+            OutboxService.usuario_payload(user)
+        )
         db.commit()
     
     @staticmethod
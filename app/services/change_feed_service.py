@@ -0,0 +1,98 @@
+"""
+Servicio para el feed de cambios incremental (sincronización por deltas)
+"""
+import base64
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+# estado_id que representa una baja lógica
+ESTADO_INACTIVO = 2
+
+
+class ChangeFeedService:
+    """Servicio para recorrer los cambios de una tabla desde un cursor"""
+    
+    @staticmethod
+    def get_changes(db: Session, model, since: Optional[str] = None, limit: int = 500) -> dict:
+        """
+        Obtener los registros modificados después de un cursor
+        
+        Recorre el índice (updated_at, id) con paginación por clave, así que
+        cada página es una consulta por rango sin OFFSET.
+        
+        `updated_at` se asigna al hacer flush, no al confirmar: una transacción
+        lenta (o un worker con el reloj atrasado) puede confirmar un registro
+        con una fecha anterior al cursor que ya se entregó. Por eso la última
+        página (has_more = False) devuelve un cursor que retrocede hasta
+        CHANGE_FEED_SAFETY_WINDOW_SECONDS antes de ahora, y la siguiente
+        consulta vuelve a leer esa ventana. Un mismo registro puede llegar más
+        de una vez: el consumidor debe deduplicar por id (aplicar como upsert).
+        
+        Args:
+            db: Sesión de base de datos
+            model: Modelo con columna `updated_at` y `estado_id`
+            since: Cursor devuelto por la página anterior (None = desde el inicio)
+            limit: Máximo de registros a devolver
+        
+        Returns:
+            Diccionario con items, next_cursor y has_more
+        
+        Raises:
+            HTTPException: Si el cursor es inválido
+        """
+        pk = model.__mapper__.primary_key[0]
+        limit = max(1, min(limit, settings.CHANGE_FEED_MAX_LIMIT))
+        
+        query = db.query(model).filter(model.updated_at.isnot(None))
+        if since:
+            updated_at, registro_id = ChangeFeedService.decode_cursor(since)
+            query = query.filter(or_(
+                model.updated_at > updated_at,
+                and_(model.updated_at == updated_at, pk > registro_id)
+            ))
+        
+        rows = query.order_by(model.updated_at, pk).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        posicion = ChangeFeedService.decode_cursor(since) if since else None
+        if rows:
+            last = rows[-1]
+            posicion = (last.updated_at, getattr(last, pk.key))
+        if posicion is not None and not has_more and settings.CHANGE_FEED_SAFETY_WINDOW_SECONDS > 0:
+            # Volver a leer la ventana en la que pueden confirmarse cambios tardíos
+            limite_seguro = datetime.utcnow() - timedelta(seconds=settings.CHANGE_FEED_SAFETY_WINDOW_SECONDS)
+            posicion = min(posicion, (limite_seguro, 0))
+        next_cursor = ChangeFeedService.encode_cursor(*posicion) if posicion else None
+        
+        return {
+            "items": [
+                {"eliminado": row.estado_id == ESTADO_INACTIVO, "datos": row}
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        }
+    
+    @staticmethod
+    def encode_cursor(updated_at: datetime, registro_id: int) -> str:
+        """Codificar (updated_at, id) como cursor opaco"""
+        raw = f"{updated_at.isoformat()}|{registro_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Decodificar un cursor generado por `encode_cursor`"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            updated_at, registro_id = raw.split("|", 1)
+            return datetime.fromisoformat(updated_at), int(registro_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido"
+            )
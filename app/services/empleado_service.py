@@ -1,14 +1,17 @@
 """
 Servicio para CRUD de empleados
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
 from app.db.models.empleados import Empleado
 from app.db.models.usuarios import Usuario
-from app.db.models.estado import Estado
 from app.schemas.empleados import EmpleadoCreate, EmpleadoUpdate
 from app.core.security import get_password_hash
+from app.core.config import settings
+from app.services.estado_service import EstadoService
+from app.services.outbox_service import OutboxService
+from app.services.usuario_service import UsuarioService
 
 
 class EmpleadoService:
@@ -29,6 +32,60 @@ class EmpleadoService:
         """Obtener empleado por cédula"""
         return db.query(Empleado).filter(Empleado.cedula == cedula).first()
     
+    @staticmethod
+    def get_empleados_by_cedulas(
+        db: Session,
+        cedulas: List[str],
+        incluir_usuario: bool = False
+    ) -> Tuple[List[dict], List[str]]:
+        """
+        Buscar empleados por una lista de cédulas
+        
+        Resuelve las cédulas con consultas `IN` por bloques sobre el índice
+        único de `cedula`; si se pide el usuario, se trae con LEFT JOIN.
+        
+        Args:
+            db: Sesión de base de datos
+            cedulas: Cédulas a buscar (se ignoran duplicados)
+            incluir_usuario: Si incluir los datos del usuario asociado
+        
+        Returns:
+            Tupla (empleados encontrados, cédulas no encontradas), en el orden pedido
+        
+        Raises:
+            HTTPException: Si se piden más cédulas que el máximo permitido
+        """
+        unicas = list(dict.fromkeys(cedulas))
+        if len(unicas) > settings.MAX_CEDULAS_LOOKUP:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Máximo {settings.MAX_CEDULAS_LOOKUP} cédulas por consulta"
+            )
+        
+        query = db.query(Empleado)
+        if incluir_usuario:
+            query = query.options(joinedload(Empleado.usuario))
+        
+        por_cedula = {}
+        chunk_size = settings.CEDULAS_LOOKUP_CHUNK_SIZE
+        for i in range(0, len(unicas), chunk_size):
+            bloque = unicas[i:i + chunk_size]
+            for empleado in query.filter(Empleado.cedula.in_(bloque)).all():
+                por_cedula[empleado.cedula] = empleado
+        
+        encontrados = []
+        no_encontrados = []
+        for cedula in unicas:
+            empleado = por_cedula.get(cedula)
+            if empleado is None:
+                no_encontrados.append(cedula)
+            elif incluir_usuario:
+                encontrados.append(EmpleadoService._empleado_con_usuario_dict(db, empleado))
+            else:
+                encontrados.append(EmpleadoService._empleado_dict(empleado))
+        
+        return encontrados, no_encontrados
+    
     @staticmethod
     def create_empleado(db: Session, empleado_data: EmpleadoCreate) -> Empleado:
         """
@@ -94,7 +151,16 @@ class EmpleadoService:
                 intentos=0
             )
             db.add(db_usuario)
+            db.flush()
+            OutboxService.registrar(
+                db, "usuario.creado", "usuario", db_usuario.usuario_id,
+                OutboxService.usuario_payload(db_usuario)
+            )
         
+        OutboxService.registrar(
+            db, "empleado.creado", "empleado", db_empleado.empleado_id,
+            EmpleadoService._empleado_dict(db_empleado)
+        )
         db.commit()
         db.refresh(db_empleado)
         
@@ -138,13 +204,24 @@ class EmpleadoService:
             setattr(db_empleado, field, value)
         
         # Si se cambia el estado del empleado, actualizar el estado de su usuario
+        usuario = None
         if empleado_data.estado_id:
             usuario = db.query(Usuario).filter(Usuario.empleado_id == empleado_id).first()
             if usuario:
                 usuario.estado_id = empleado_data.estado_id
+                OutboxService.registrar(
+                    db, "usuario.actualizado", "usuario", usuario.usuario_id,
+                    OutboxService.usuario_payload(usuario)
+                )
         
+        OutboxService.registrar(
+            db, "empleado.actualizado", "empleado", db_empleado.empleado_id,
+            EmpleadoService._empleado_dict(db_empleado)
+        )
         db.commit()
         db.refresh(db_empleado)
+        if usuario:
+            UsuarioService.notificar_cambios(usuario)
         
         return db_empleado
     
@@ -174,8 +251,18 @@ class EmpleadoService:
         usuario = db.query(Usuario).filter(Usuario.empleado_id == empleado_id).first()
         if usuario:
             usuario.estado_id = 2
+            OutboxService.registrar(
+                db, "usuario.desactivado", "usuario", usuario.usuario_id,
+                OutboxService.usuario_payload(usuario)
+            )
         
+        OutboxService.registrar(
+            db, "empleado.desactivado", "empleado", db_empleado.empleado_id,
+            EmpleadoService._empleado_dict(db_empleado)
+        )
         db.commit()
+        if usuario:
+            UsuarioService.notificar_cambios(usuario)
     
     @staticmethod
     def get_empleado_con_usuario(db: Session, empleado_id: int) -> dict:
@@ -189,18 +276,25 @@ class EmpleadoService:
         Returns:
             Diccionario con datos del empleado y usuario
         """
-        empleado = EmpleadoService.get_empleado_by_id(db, empleado_id)
+        # Empleado y usuario en una sola consulta (LEFT JOIN)
+        empleado = (
+            db.query(Empleado)
+            .options(joinedload(Empleado.usuario))
+            .filter(Empleado.empleado_id == empleado_id)
+            .first()
+        )
         if not empleado:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Empleado no encontrado"
             )
         
-        # Buscar usuario asociado
-        usuario = db.query(Usuario).filter(Usuario.empleado_id == empleado_id).first()
-        
-        # Construir respuesta
-        response = {
+        return EmpleadoService._empleado_con_usuario_dict(db, empleado)
+    
+    @staticmethod
+    def _empleado_dict(empleado: Empleado) -> dict:
+        """Datos básicos del empleado"""
+        return {
             "empleado_id": empleado.empleado_id,
             "nombre": empleado.nombre,
             "cedula": empleado.cedula,
@@ -210,16 +304,20 @@ class EmpleadoService:
             "nacionalidad": empleado.nacionalidad,
             "estado_id": empleado.estado_id,
             "created_at": empleado.created_at,
+            "updated_at": empleado.updated_at
+        }
+    
+    @staticmethod
+    def _empleado_con_usuario_dict(db: Session, empleado: Empleado) -> dict:
+        """Datos del empleado con su usuario (la relación ya debe estar cargada)"""
+        usuario = empleado.usuario
+        
+        response = EmpleadoService._empleado_dict(empleado)
+        response.update({
             "tiene_usuario": usuario is not None,
             "usuario_id": usuario.usuario_id if usuario else None,
             "nombre_usuario": usuario.usuario if usuario else None,
-            "usuario_estado": self._get_estado_descripcion(db, usuario.estado_id) if usuario else None
-        }
+            "usuario_estado": EstadoService.get_descripcion(usuario.estado_id, db) if usuario else None
+        })
         
         return response
-    
-    @staticmethod
-    def _get_estado_descripcion(db: Session, estado_id: int) -> str:
-        """Obtener descripción del estado"""
-        estado = db.query(Estado).filter(Estado.estado_id == estado_id).first()
-        return estado.descripcion if estado else "Desconocido"
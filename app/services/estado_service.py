@@ -0,0 +1,87 @@
+"""
+Servicio para la tabla de referencia de estados
+"""
+import threading
+from types import MappingProxyType
+from typing import Mapping, Optional
+from sqlalchemy.orm import Session
+from app.core.cache_bus import cache_bus
+from app.db.models.estado import Estado
+from app.db.session import SessionLocal
+
+# Mapa inmutable estado_id -> descripción; se reemplaza completo al refrescar
+_estados: Optional[Mapping[int, str]] = None
+_lock = threading.Lock()
+
+
+class EstadoService:
+    """
+    Servicio para manejar la tabla `estado` como datos de referencia
+
+    La tabla se carga completa una vez (al arrancar la aplicación) y se
+    sirve desde memoria; ninguna petición consulta `estado` por ID. Tras
+    modificar la tabla se recarga en todos los workers publicando el canal
+    "estados" del bus de cachés.
+    """
+
+    @staticmethod
+    def load(db: Session) -> Mapping[int, str]:
+        """
+        Cargar (o recargar) todos los estados en memoria
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Mapa inmutable estado_id -> descripción
+        """
+        global _estados
+        rows = db.query(Estado.estado_id, Estado.descripcion).all()
+        estados = MappingProxyType({estado_id: descripcion for estado_id, descripcion in rows})
+        with _lock:
+            _estados = estados
+        return estados
+
+    @staticmethod
+    def on_estados_invalidated(version: int):
+        """Recargar los estados cuando otro proceso publica una invalidación"""
+        db = SessionLocal()
+        try:
+            EstadoService.load(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    def is_loaded() -> bool:
+        """Indica si los estados ya están en memoria"""
+        return _estados is not None
+
+    @staticmethod
+    def get_estados(db: Optional[Session] = None) -> Mapping[int, str]:
+        """
+        Obtener el mapa de estados, cargándolo si aún no está en memoria
+
+        Args:
+            db: Sesión para la carga inicial si la app no la hizo al arrancar
+        """
+        estados = _estados
+        if estados is None:
+            if db is None:
+                return MappingProxyType({})
+            estados = EstadoService.load(db)
+        return estados
+
+    @staticmethod
+    def get_descripcion(estado_id: Optional[int], db: Optional[Session] = None) -> str:
+        """Obtener descripción del estado"""
+        return EstadoService.get_estados(db).get(estado_id, "Desconocido")
+
+    @staticmethod
+    def invalidate():
+        """Descartar el mapa en memoria; se recarga completo en el próximo uso"""
+        global _estados
+        with _lock:
+            _estados = None
+
+
+cache_bus.subscribe("estados", EstadoService.on_estados_invalidated)
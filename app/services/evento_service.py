@@ -0,0 +1,151 @@
+"""
+Servicio de eventos en tiempo real repartidos entre workers
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.cache_bus import cache_bus
+from app.core.events import event_hub
+from app.db.models.evento_tiempo_real import EventoTiempoReal
+from app.db.session import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+# Se vuelven a leer los eventos de esta ventana: un id menor puede confirmarse
+# después de uno mayor que ya se leyó
+_VENTANA = timedelta(seconds=60)
+# Los eventos más antiguos que esto se borran al publicar
+_RETENCION = timedelta(hours=1)
+_PURGA_CADA_SEGUNDOS = 600
+
+# Mayor evento_id repartido por este proceso (None = aún no se cargó)
+_ultimo: Optional[int] = None
+# evento_id -> created_at de los eventos ya repartidos dentro de la ventana
+_vistos: Dict[int, datetime] = {}
+_ultima_purga = 0.0
+_lock = threading.Lock()
+
+
+class EventoService:
+    """
+    Publica eventos SSE para las conexiones de todos los workers
+
+    El hub de eventos solo llega a las conexiones del propio proceso. Quien
+    publica reparte el evento localmente, lo registra en la tabla
+    `eventos_tiempo_real` (con los usuario_id o perfil_id destinatarios) y
+    publica el canal "eventos" del bus de cachés; los demás workers leen los
+    eventos nuevos y los reparten a sus conexiones. Cada evento guarda el
+    proceso de origen, que no lo vuelve a repartir.
+    """
+
+    @staticmethod
+    def publicar_a_usuarios(usuario_ids: Iterable[int], evento: str, datos: Optional[dict] = None):
+        """Enviar un evento a las conexiones de esos usuarios en todos los workers (después del commit)"""
+        EventoService._publicar("usuarios", list(usuario_ids), evento, datos or {})
+
+    @staticmethod
+    def publicar_a_perfiles(perfil_ids: Optional[Iterable[int]], evento: str, datos: Optional[dict] = None):
+        """Enviar un evento a las conexiones con esos perfiles en todos los workers (None = todos)"""
+        EventoService._publicar(
+            "perfiles", list(perfil_ids) if perfil_ids is not None else None, evento, datos or {}
+        )
+
+    @staticmethod
+    def load_ultimo(db: Session) -> int:
+        """Tomar como repartidos los eventos ya registrados (al arrancar)"""
+        global _ultimo
+        ultimo = db.execute(select(func.max(EventoTiempoReal.evento_id))).scalar() or 0
+        with _lock:
+            if _ultimo is None:
+                _ultimo = ultimo
+        return ultimo
+
+    @staticmethod
+    def on_eventos_invalidated(version: int):
+        """Repartir a las conexiones locales los eventos publicados por otros procesos"""
+        global _ultimo
+        desde = datetime.utcnow() - _VENTANA
+        condicion = EventoTiempoReal.created_at >= desde
+        if _ultimo is not None:
+            condicion = or_(condicion, EventoTiempoReal.evento_id > _ultimo)
+
+        db = SessionLocal()
+        try:
+            eventos = db.execute(
+                select(EventoTiempoReal).where(condicion).order_by(EventoTiempoReal.evento_id)
+            ).scalars().all()
+        finally:
+            db.close()
+
+        with _lock:
+            nuevos = [evento for evento in eventos if evento.evento_id not in _vistos]
+            for evento in nuevos:
+                _vistos[evento.evento_id] = evento.created_at
+                _ultimo = max(_ultimo or 0, evento.evento_id)
+            for evento_id in [evento_id for evento_id, creado in _vistos.items() if creado < desde]:
+                del _vistos[evento_id]
+
+        origen = _origen()
+        for evento in nuevos:
+            if evento.origen == origen:
+                continue
+            ids = json.loads(evento.ids) if evento.ids is not None else None
+            EventoService._repartir(evento.destino, ids, evento.evento, json.loads(evento.datos))
+
+    @staticmethod
+    def _publicar(destino: str, ids, evento: str, datos: dict):
+        EventoService._repartir(destino, ids, evento, datos)
+
+        ahora = datetime.utcnow()
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(EventoTiempoReal).values(
+                    origen=_origen(),
+                    destino=destino,
+                    ids=json.dumps(ids) if ids is not None else None,
+                    evento=evento,
+                    datos=json.dumps(datos),
+                    created_at=ahora
+                ))
+                EventoService._purgar(conn, ahora)
+        except SQLAlchemyError:
+            logger.warning("No se pudo registrar el evento %s para los demás workers", evento, exc_info=True)
+            return
+
+        cache_bus.publish("eventos")
+
+    @staticmethod
+    def _purgar(conn, ahora: datetime):
+        """Borrar los eventos antiguos (a lo sumo cada _PURGA_CADA_SEGUNDOS por proceso)"""
+        global _ultima_purga
+        if time.monotonic() - _ultima_purga < _PURGA_CADA_SEGUNDOS:
+            return
+        _ultima_purga = time.monotonic()
+        conn.execute(delete(EventoTiempoReal).where(EventoTiempoReal.created_at < ahora - _RETENCION))
+
+    @staticmethod
+    def _repartir(destino: str, ids, evento: str, datos: dict):
+        """Enviar el evento a las conexiones de este proceso"""
+        if destino == "usuarios":
+            if evento == "permisos_cambiados" and "perfil_id" in datos:
+                for usuario_id in ids:
+                    event_hub.set_perfil(usuario_id, datos["perfil_id"])
+            event_hub.publish_to_users(ids, evento, datos)
+        else:
+            event_hub.publish_to_perfiles(ids, evento, datos)
+
+
+def _origen() -> str:
+    """Identificador de este proceso (distinto en cada worker, también tras un fork)"""
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+cache_bus.subscribe("eventos", EventoService.on_eventos_invalidated)
@@ -0,0 +1,152 @@
+"""
+Registro de último acceso y último login de los usuarios, escrito por lotes
+"""
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import TIMESTAMP, bindparam, case, or_
+
+from app.core.config import settings
+from app.core.metrics import CounterFunc, Gauge, registry
+from app.db.models.usuarios import Usuario
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _update_statement(columna: str):
+    """
+    UPDATE de una columna de fecha por usuario_id, para ejecutar con executemany
+
+    No retrocede la fecha (otro worker pudo escribir una más reciente) y
+    mantiene `updated_at`: el último acceso no es un cambio del usuario para
+    el feed de sincronización.
+    """
+    tabla = Usuario.__table__
+    actual = tabla.c[columna]
+    nueva = bindparam("b_fecha", type_=TIMESTAMP())
+    return (
+        tabla.update()
+        .where(tabla.c.usuario_id == bindparam("b_usuario_id"))
+        .values({
+            columna: case((or_(actual.is_(None), actual < nueva), nueva), else_=actual),
+            "updated_at": tabla.c.updated_at,
+        })
+    )
+
+
+class LastSeenTracker:
+    """
+    Acumula en memoria el último acceso y el último login de cada usuario
+
+    `touch` y `login` solo guardan la fecha en un diccionario por usuario_id;
+    cada LAST_SEEN_FLUSH_INTERVAL_SECONDS una tarea en segundo plano escribe
+    lo acumulado con un UPDATE ejecutado como executemany. Así cada usuario
+    genera a lo sumo una escritura por intervalo, sin importar cuántas
+    peticiones haga. Si la escritura falla las fechas vuelven a quedar
+    pendientes para el próximo intervalo; al apagar se escribe lo pendiente.
+    """
+
+    def __init__(self):
+        self.escritos = 0
+        self._accesos: Dict[int, datetime] = {}
+        self._logins: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._accesos)
+
+    def touch(self, usuario_id: int):
+        """Registrar un acceso autenticado (sin tocar la base de datos)"""
+        if settings.LAST_SEEN_ENABLED:
+            ahora = datetime.utcnow()
+            with self._lock:
+                self._accesos[usuario_id] = ahora
+
+    def login(self, usuario_id: int):
+        """Registrar un login exitoso (también cuenta como acceso)"""
+        if settings.LAST_SEEN_ENABLED:
+            ahora = datetime.utcnow()
+            with self._lock:
+                self._logins[usuario_id] = ahora
+                self._accesos[usuario_id] = ahora
+
+    def start(self):
+        """Iniciar la tarea de escritura en el event loop actual"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Detener la tarea y escribir lo pendiente"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._accesos or self._logins:
+            await asyncio.to_thread(self.flush_once)
+        if self._accesos:
+            logger.error("Último acceso: %d usuarios no se pudieron escribir al apagar", len(self._accesos))
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.LAST_SEEN_FLUSH_INTERVAL_SECONDS)
+            if self._accesos or self._logins:
+                await asyncio.to_thread(self.flush_once)
+
+    def flush_once(self) -> int:
+        """
+        Escribir las fechas acumuladas
+
+        Returns:
+            Usuarios actualizados (0 si no había o si falló la escritura)
+        """
+        with self._lock:
+            accesos, self._accesos = self._accesos, {}
+            logins, self._logins = self._logins, {}
+        if not accesos and not logins:
+            return 0
+
+        db = SessionLocal()
+        try:
+            for columna, fechas in (("ultimo_acceso", accesos), ("ultimo_login", logins)):
+                if fechas:
+                    db.execute(
+                        _update_statement(columna),
+                        [{"b_usuario_id": usuario_id, "b_fecha": fecha} for usuario_id, fecha in fechas.items()]
+                    )
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("Último acceso: falló la escritura de %d usuarios", len(accesos), exc_info=True)
+            with self._lock:
+                # Conservar las fechas más recientes registradas mientras tanto
+                for pendientes, fechas in ((self._accesos, accesos), (self._logins, logins)):
+                    for usuario_id, fecha in fechas.items():
+                        if usuario_id not in pendientes:
+                            pendientes[usuario_id] = fecha
+            return 0
+        finally:
+            db.close()
+
+        self.escritos += len(accesos)
+        return len(accesos)
+
+
+last_seen_tracker = LastSeenTracker()
+
+registry.register(Gauge(
+    "last_seen_pending_users", "Usuarios con último acceso pendiente de escribir",
+    collect=lambda: [((), len(last_seen_tracker))]
+))
+registry.register(CounterFunc(
+    "last_seen_written_total", "Últimos accesos de usuario escritos en la base de datos",
+    collect=lambda: [((), last_seen_tracker.escritos)]
+))
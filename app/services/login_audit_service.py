@@ -0,0 +1,84 @@
+"""
+Servicio de consultas sobre la auditoría de login
+"""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.db.models.login_auditoria import LoginAuditoria
+
+
+class LoginAuditService:
+    """Consultas de revisión de seguridad sobre `login_auditoria`"""
+
+    @staticmethod
+    def get_registros(
+        db: Session,
+        usuario: Optional[str] = None,
+        ip: Optional[str] = None,
+        resultado: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        antes_de: Optional[int] = None,
+        limit: int = 100
+    ) -> List[LoginAuditoria]:
+        """
+        Intentos de login del más reciente al más antiguo (por auditoria_id)
+
+        Los filtros por usuario o IP usan sus índices (columna, created_at);
+        un rango de fechas sin ellos usa el índice de created_at.
+
+        Args:
+            db: Sesión de base de datos
+            usuario: Nombre de usuario enviado en el login
+            ip: IP del cliente
+            resultado: exito, usuario_inexistente, contrasenia_incorrecta, bloqueo (fallo que bloqueó la cuenta), bloqueado o inactivo
+            desde: Fecha/hora mínima (inclusive)
+            hasta: Fecha/hora máxima (exclusiva)
+            antes_de: auditoria_id del último registro de la página anterior
+            limit: Máximo de registros
+        """
+        query = select(LoginAuditoria)
+        if usuario is not None:
+            query = query.where(LoginAuditoria.usuario == usuario)
+        if ip is not None:
+            query = query.where(LoginAuditoria.ip == ip)
+        if resultado is not None:
+            query = query.where(LoginAuditoria.resultado == resultado)
+        if desde is not None:
+            query = query.where(LoginAuditoria.created_at >= desde)
+        if hasta is not None:
+            query = query.where(LoginAuditoria.created_at < hasta)
+        if antes_de is not None:
+            query = query.where(LoginAuditoria.auditoria_id < antes_de)
+
+        query = query.order_by(LoginAuditoria.auditoria_id.desc()).limit(limit)
+        return db.execute(query).scalars().all()
+
+    @staticmethod
+    def get_fallos_por_ip(db: Session, desde: datetime, limit: int = 50) -> List[dict]:
+        """
+        IPs con más intentos fallidos desde una fecha
+
+        Args:
+            db: Sesión de base de datos
+            desde: Inicio de la ventana (usa el índice de created_at)
+            limit: Máximo de IPs
+
+        Returns:
+            Lista de {ip, fallos, usuarios, ultimo_intento} ordenada por fallos
+        """
+        fallos = func.count().label("fallos")
+        query = (
+            select(
+                LoginAuditoria.ip,
+                fallos,
+                func.count(func.distinct(LoginAuditoria.usuario)).label("usuarios"),
+                func.max(LoginAuditoria.created_at).label("ultimo_intento")
+            )
+            .where(LoginAuditoria.created_at >= desde, LoginAuditoria.resultado != "exito")
+            .group_by(LoginAuditoria.ip)
+            .order_by(fallos.desc())
+            .limit(limit)
+        )
+        return [dict(fila._mapping) for fila in db.execute(query)]
@@ -0,0 +1,167 @@
+"""
+Escritura por lotes y en segundo plano de la auditoría de login
+"""
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.metrics import CounterFunc, Gauge, registry
+from app.db.models.login_auditoria import LoginAuditoria
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class LoginAuditWriter:
+    """
+    Acumula los intentos de login en memoria y los inserta por lotes
+
+    `record` solo agrega a un buffer (no toca la base de datos); una tarea
+    en segundo plano inserta con un INSERT de varias filas cada
+    LOGIN_AUDIT_FLUSH_INTERVAL_MS o al juntar LOGIN_AUDIT_BATCH_SIZE filas.
+
+    Pérdida acotada: si la base de datos no responde el lote vuelve al
+    buffer y se reintenta con espera exponencial; el buffer no pasa de
+    LOGIN_AUDIT_MAX_BUFFER filas y, al llenarse, se descartan las más
+    antiguas (se cuentan en `descartados`). Al apagar se escribe lo pendiente.
+    """
+
+    def __init__(self):
+        self.escritos = 0
+        self.descartados = 0
+        self._buffer: Deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._despertar: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(self, usuario: str, usuario_id: Optional[int], ip: Optional[str], resultado: str, latencia_ms: float):
+        """Registrar un intento de login (desde cualquier hilo, sin bloquear)"""
+        if not settings.LOGIN_AUDIT_ENABLED:
+            return
+        fila = {
+            "usuario": usuario[:100],
+            "usuario_id": usuario_id,
+            "ip": ip,
+            "resultado": resultado,
+            "latencia_ms": round(latencia_ms, 2),
+            "created_at": datetime.utcnow(),
+        }
+        with self._lock:
+            self._buffer.append(fila)
+            self._recortar()
+            lleno = len(self._buffer) >= settings.LOGIN_AUDIT_BATCH_SIZE
+
+        if lleno and self._loop is not None and self._despertar is not None:
+            self._loop.call_soon_threadsafe(self._despertar.set)
+
+    def start(self):
+        """Iniciar la tarea de escritura en el event loop actual"""
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._despertar = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Detener la tarea y escribir lo pendiente"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pendientes = len(self._buffer)
+        while self._buffer:
+            if await asyncio.to_thread(self.flush_once) == 0:
+                break
+        if self._buffer:
+            logger.error("Auditoría de login: %d de %d registros no se pudieron escribir al apagar",
+                         len(self._buffer), pendientes)
+
+    async def _run(self):
+        intervalo = settings.LOGIN_AUDIT_FLUSH_INTERVAL_MS / 1000
+        reintento = intervalo
+        while True:
+            try:
+                await asyncio.wait_for(self._despertar.wait(), intervalo)
+            except asyncio.TimeoutError:
+                pass
+            self._despertar.clear()
+
+            # Vaciar de a lotes completos; el resto espera al próximo intervalo
+            while self._buffer:
+                if await asyncio.to_thread(self.flush_once) == 0:
+                    # Base de datos caída: reintentar con espera exponencial
+                    await asyncio.sleep(reintento)
+                    reintento = min(reintento * 2, 30.0)
+                    break
+                reintento = intervalo
+                if len(self._buffer) < settings.LOGIN_AUDIT_BATCH_SIZE:
+                    break
+
+    def flush_once(self) -> int:
+        """
+        Insertar un lote del buffer
+
+        Returns:
+            Filas escritas (0 si no había o si falló la inserción)
+        """
+        with self._lock:
+            lote: List[dict] = [
+                self._buffer.popleft()
+                for _ in range(min(len(self._buffer), settings.LOGIN_AUDIT_BATCH_SIZE))
+            ]
+        if not lote:
+            return 0
+
+        db = SessionLocal()
+        try:
+            db.execute(insert(LoginAuditoria), lote)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("Auditoría de login: falló la inserción de %d registros", len(lote), exc_info=True)
+            with self._lock:
+                self._buffer.extendleft(reversed(lote))
+                self._recortar()
+            return 0
+        finally:
+            db.close()
+
+        self.escritos += len(lote)
+        return len(lote)
+
+    def _recortar(self):
+        """Descartar los registros más antiguos por encima del máximo (con el lock tomado)"""
+        exceso = len(self._buffer) - settings.LOGIN_AUDIT_MAX_BUFFER
+        if exceso > 0:
+            for _ in range(exceso):
+                self._buffer.popleft()
+            self.descartados += exceso
+
+
+login_audit_writer = LoginAuditWriter()
+
+registry.register(Gauge(
+    "login_audit_buffer_size", "Intentos de login pendientes de escribir en la auditoría",
+    collect=lambda: [((), len(login_audit_writer))]
+))
+registry.register(CounterFunc(
+    "login_audit_written_total", "Intentos de login escritos en la auditoría",
+    collect=lambda: [((), login_audit_writer.escritos)]
+))
+registry.register(CounterFunc(
+    "login_audit_dropped_total", "Intentos de login descartados por buffer lleno",
+    collect=lambda: [((), login_audit_writer.descartados)]
+))
@@ -1,11 +1,54 @@
 """
 Servicio para construcción de menú jerárquico
 """
-from typing import List, Dict
-from sqlalchemy.orm import Session
-from app.db.models.menu import Menu
+from typing import List, Dict, FrozenSet, Iterable, Optional, Sequence, Set, Tuple
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import Row, select, insert, delete, update, func, text, true
+from sqlalchemy.orm import Session, aliased
+from app.core.cache import get_cache
+from app.core.cache_bus import cache_bus
+from app.core.config import settings
+from app.db.models.menu import Menu, menu_jerarquia
+from app.db.models.perfil import perfil_menu
 from app.db.models.usuarios import Usuario
 from app.schemas.menu import MenuTreeResponse
+from app.services.evento_service import EventoService
+
+# Árbol de menú ya serializado a JSON, por perfil_id
+menu_tree_cache = get_cache("menu_tree")
+_menu_tree_adapter = TypeAdapter(List[MenuTreeResponse])
+
+# URLs de menú permitidas, por perfil_id (frozenset de URLs normalizadas)
+menu_permission_cache = get_cache("menu_permisos")
+
+# Reconstruye la tabla de clausura completa a partir de parent_id
+_REBUILD_JERARQUIA_SQL = text("""
+    WITH RECURSIVE cadena(ancestro_id, descendiente_id, profundidad) AS (
+        SELECT menu_id, menu_id, 0 FROM menu
+        UNION ALL
+        SELECT m.parent_id, c.descendiente_id, c.profundidad + 1
+        FROM cadena c JOIN menu m ON m.menu_id = c.ancestro_id
+        WHERE m.parent_id IS NOT NULL AND c.profundidad < 100
+    )
+    INSERT INTO menu_jerarquia (ancestro_id, descendiente_id, profundidad)
+    SELECT ancestro_id, descendiente_id, profundidad FROM cadena
+""")
+
+
+def _menu_columns(menu=Menu) -> tuple:
+    """Columnas de menú usadas para construir árboles"""
+    return (
+        menu.menu_id,
+        menu.descripcion,
+        menu.url,
+        menu.parent_id,
+        menu.nivel,
+        menu.orden,
+        menu.estado_id,
+        menu.created_at,
+        menu.updated_at,
+    )
 
 
 class MenuService:
@@ -23,51 +66,252 @@ class MenuService:
         Returns:
             Lista de menús jerárquicos (solo raíz, con hijos anidados)
         """
-        # Obtener perfil del usuario
-        perfil = usuario.perfil
-        if not perfil:
+        if usuario.perfil_id is None:
             return []
         
-        # Obtener todos los menús asociados al perfil (activos)
-        menus = [m for m in perfil.menus if m.estado_id == 1]
-        
-        # Convertir a diccionario para búsqueda rápida
-        menu_dict: Dict[int, MenuTreeResponse] = {}
-        for menu in menus:
-            menu_dict[menu.menu_id] = MenuTreeResponse(
-                menu_id=menu.menu_id,
-                descripcion=menu.descripcion,
-                url=menu.url,
-                parent_id=menu.parent_id,
-                nivel=menu.nivel,
-                orden=menu.orden,
-                estado_id=menu.estado_id,
-                created_at=menu.created_at,
-                children=[]
+        return MenuService._build_menu_tree(db, usuario.perfil_id)
+    
+    @staticmethod
+    def get_user_menu_tree_json(db: Session, usuario: Usuario) -> bytes:
+        """
+        Obtener árbol de menú del usuario ya serializado a JSON
+        
+        El árbol depende solo del perfil, así que se construye una vez por
+        perfil_id y se sirve desde memoria hasta que se invalide.
+        
+        Args:
+            db: Sesión de base de datos
+            usuario: Usuario autenticado
+        
+        Returns:
+            JSON (bytes) con la lista de menús jerárquicos
+        """
+        if usuario.perfil_id is None:
+            return b"[]"
+        
+        return MenuService.get_perfil_menu_tree_json(db, usuario.perfil_id)
+    
+    @staticmethod
+    def get_perfil_menu_tree_json(db: Session, perfil_id: int) -> bytes:
+        """
+        Obtener el árbol de menú de un perfil serializado a JSON (desde caché)
+        
+        Args:
+            db: Sesión de base de datos
+            perfil_id: ID del perfil
+        
+        Returns:
+            JSON (bytes) con la lista de menús jerárquicos
+        """
+        def build() -> bytes:
+            tree = MenuService._build_menu_tree(db, perfil_id)
+            return _menu_tree_adapter.dump_json(tree)
+        
+        return menu_tree_cache.get_or_set(perfil_id, build)
+    
+    @staticmethod
+    def invalidate_menu_cache(perfil_ids: Optional[Iterable[int]] = None):
+        """
+        Invalidar el árbol de menú y el índice de permisos en caché
+        
+        Publica la invalidación en el bus (los demás workers invalidan todo
+        su árbol de menú) y notifica a las conexiones SSE de los perfiles
+        afectados, en todos los workers, con el evento "menu_actualizado" y
+        la nueva versión.
+        
+        Args:
+            perfil_ids: Perfiles a invalidar; si es None se invalidan todos
+        """
+        if perfil_ids is None:
+            menu_tree_cache.invalidate()
+            menu_permission_cache.invalidate()
+        else:
+            perfil_ids = list(perfil_ids)
+            for perfil_id in perfil_ids:
+                menu_tree_cache.invalidate(perfil_id)
+                menu_permission_cache.invalidate(perfil_id)
+        
+        version = cache_bus.publish("menu")
+        EventoService.publicar_a_perfiles(perfil_ids, "menu_actualizado", {"version": version})
+    
+    @staticmethod
+    def on_menu_invalidated(version: int):
+        """
+        Invalidación publicada por otro proceso (bus de cachés): se descarta todo el menú
+        
+        El aviso "menu_actualizado" a los perfiles afectados llega aparte,
+        por el canal "eventos" (EventoService).
+        """
+        menu_tree_cache.invalidate()
+        menu_permission_cache.invalidate()
+    
+    @staticmethod
+    def get_menu_version() -> int:
+        """Versión actual del árbol de menú, igual en todos los workers (para comparar en el cliente)"""
+        return cache_bus.version("menu")
+    
+    @staticmethod
+    def get_affected_perfil_ids(db: Session, menu_id: int) -> Set[int]:
+        """
+        Obtener los perfiles cuyo árbol o permisos dependen de un menú
+        
+        Son los perfiles con el menú o alguno de sus descendientes asignado
+        (el árbol incluye los ancestros de cada menú asignado).
+        
+        Args:
+            db: Sesión de base de datos
+            menu_id: ID del menú modificado
+        
+        Returns:
+            Conjunto de perfil_id afectados
+        """
+        query = (
+            select(perfil_menu.c.perfil_id)
+            .join(menu_jerarquia, menu_jerarquia.c.descendiente_id == perfil_menu.c.menu_id)
+            .where(menu_jerarquia.c.ancestro_id == menu_id)
+            .distinct()
+        )
+        return set(db.execute(query).scalars())
+    
+    @staticmethod
+    def get_perfil_urls(db: Session, perfil_id: int) -> FrozenSet[str]:
+        """
+        Obtener las URLs de menú que puede abrir un perfil
+        
+        Solo cuentan los menús activos asignados directamente al perfil; los
+        ancestros que se agregan al árbol para navegación no otorgan acceso.
+        
+        Args:
+            db: Sesión de base de datos
+            perfil_id: ID del perfil
+        
+        Returns:
+            Conjunto inmutable de URLs normalizadas
+        """
+        def build() -> FrozenSet[str]:
+            query = (
+                select(Menu.url)
+                .join(perfil_menu, perfil_menu.c.menu_id == Menu.menu_id)
+                .where(
+                    perfil_menu.c.perfil_id == perfil_id,
+                    Menu.estado_id == 1,
+                    Menu.url.isnot(None)
+                )
             )
+            return frozenset(MenuService.normalize_url(url) for url in db.execute(query).scalars())
+        
+        return menu_permission_cache.get_or_set(perfil_id, build)
+    
+    @staticmethod
+    def is_url_allowed(db: Session, perfil_id: Optional[int], url: str) -> bool:
+        """
+        Verificar si un perfil puede abrir una URL
+        
+        Se permite la URL si ella o alguno de sus prefijos de ruta está
+        asignado al perfil (p. ej. `/reportes` habilita `/reportes/ventas`).
+        Cada prefijo es una búsqueda en un conjunto en memoria.
+        
+        Args:
+            db: Sesión de base de datos (solo se usa si el índice no está en caché)
+            perfil_id: ID del perfil del usuario
+            url: URL a verificar
+        
+        Returns:
+            True si el perfil tiene acceso
+        """
+        if perfil_id is None:
+            return False
+        
+        urls = MenuService.get_perfil_urls(db, perfil_id)
+        url = MenuService.normalize_url(url)
+        while True:
+            if url in urls:
+                return True
+            pos = url.rfind("/")
+            if pos <= 0:
+                return False
+            url = url[:pos]
+    
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Normalizar una URL de menú: sin query/fragmento ni barra final, con barra inicial"""
+        url = url.strip().split("?", 1)[0].split("#", 1)[0]
+        url = "/" + url.strip("/")
+        return url
+    
+    @staticmethod
+    def get_perfil_menu_rows(db: Session, perfil_id: int) -> List[Row]:
+        """
+        Obtener los menús activos de un perfil junto con sus ancestros
+        
+        Una sola consulta con CTE recursiva (SQLite y PostgreSQL): parte de
+        los menús asignados al perfil y sube por `parent_id` agregando los
+        padres activos. UNION elimina duplicados y corta ciclos.
+        
+        Args:
+            db: Sesión de base de datos
+            perfil_id: ID del perfil
+        
+        Returns:
+            Filas de menú ordenadas por nivel, orden y menu_id
+        """
+        # Menús asignados directamente al perfil
+        arbol = (
+            select(*_menu_columns())
+            .join(perfil_menu, perfil_menu.c.menu_id == Menu.menu_id)
+            .where(perfil_menu.c.perfil_id == perfil_id, Menu.estado_id == 1)
+            .cte("menu_arbol", recursive=True)
+        )
+        
+        # Cadena de ancestros activos
+        padre = aliased(Menu)
+        arbol = arbol.union(
+            select(*_menu_columns(padre))
+            .join(arbol, arbol.c.parent_id == padre.menu_id)
+            .where(padre.estado_id == 1)
+        )
+        
+        query = select(arbol).order_by(arbol.c.nivel, arbol.c.orden, arbol.c.menu_id)
+        return db.execute(query).all()
+    
+    @staticmethod
+    def _build_menu_tree(db: Session, perfil_id: int) -> List[MenuTreeResponse]:
+        """
+        Construir el árbol de menú de un perfil
+        
+        Las filas ya vienen ordenadas, así que los hijos quedan en su orden
+        al agregarlos y no hace falta ordenar recursivamente.
+        """
+        rows = MenuService.get_perfil_menu_rows(db, perfil_id)
+        root_menus, _ = MenuService._assemble_tree(rows)
+        return root_menus
+    
+    @staticmethod
+    def _assemble_tree(rows: Sequence[Row]) -> Tuple[List[MenuTreeResponse], Dict[int, MenuTreeResponse]]:
+        """
+        Armar el árbol a partir de filas ya ordenadas
+        
+        Returns:
+            Menús raíz y diccionario de todos los nodos por menu_id
+        """
+        menu_dict: Dict[int, MenuTreeResponse] = {
+            row.menu_id: MenuTreeResponse(**row._mapping, children=[])
+            for row in rows
+        }
         
-        # Construir árbol
         root_menus = []
-        for menu in menu_dict.values():
-            if menu.parent_id is None:
+        for row in rows:
+            menu = menu_dict[row.menu_id]
+            if row.parent_id is None:
                 # Es un menú raíz
                 root_menus.append(menu)
             else:
-                # Tiene padre, agregarlo como hijo
-                parent = menu_dict.get(menu.parent_id)
+                # Tiene padre, agregarlo como hijo (si el padre está inactivo se descarta)
+                parent = menu_dict.get(row.parent_id)
                 if parent:
                     parent.children.append(menu)
         
-        # Ordenar por el campo 'orden'
-        def sort_recursive(items: List[MenuTreeResponse]):
-            items.sort(key=lambda x: x.orden)
-            for item in items:
-                if item.children:
-                    sort_recursive(item.children)
-        
-        sort_recursive(root_menus)
-        
-        return root_menus
+        return root_menus, menu_dict
     
     @staticmethod
     def get_all_menus(db: Session, include_inactive: bool = False) -> List[Menu]:
@@ -86,3 +330,220 @@ class MenuService:
             query = query.filter(Menu.estado_id == 1)
         
         return query.order_by(Menu.nivel, Menu.orden).all()
+    
+    @staticmethod
+    def get_subtree(db: Session, menu_id: int, include_inactive: bool = False) -> MenuTreeResponse:
+        """
+        Obtener un menú con todos sus descendientes
+        
+        Usa la tabla de clausura: una sola consulta por índice sobre ancestro_id.
+        
+        Args:
+            db: Sesión de base de datos
+            menu_id: ID del menú raíz del subárbol
+            include_inactive: Si incluir menús inactivos
+        
+        Returns:
+            Menú con sus hijos anidados
+        
+        Raises:
+            HTTPException: Si el menú no existe
+        """
+        query = (
+            select(*_menu_columns())
+            .join(menu_jerarquia, menu_jerarquia.c.descendiente_id == Menu.menu_id)
+            .where(menu_jerarquia.c.ancestro_id == menu_id)
+        )
+        if not include_inactive:
+            query = query.where(Menu.estado_id == 1)
+        rows = db.execute(query.order_by(Menu.nivel, Menu.orden, Menu.menu_id)).all()
+        
+        _, menu_dict = MenuService._assemble_tree(rows)
+        if menu_id not in menu_dict:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Menú no encontrado"
+            )
+        return menu_dict[menu_id]
+    
+    @staticmethod
+    def add_to_hierarchy(db: Session, menu: Menu):
+        """
+        Registrar un menú nuevo en la jerarquía
+        
+        Valida el padre, calcula el nivel y copia las filas de clausura del
+        padre. No hace commit.
+        
+        Raises:
+            HTTPException: Si el padre no existe o se supera la profundidad máxima
+        """
+        if menu.parent_id is not None:
+            parent = db.query(Menu).filter(Menu.menu_id == menu.parent_id).first()
+            if not parent:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="El menú padre no existe"
+                )
+            MenuService._check_depth(MenuService._get_depth(db, parent.menu_id) + 1)
+            menu.nivel = parent.nivel + 1
+        
+        db.add(menu)
+        db.flush()  # Para obtener el menu_id antes de commit
+        
+        db.execute(insert(menu_jerarquia).values(
+            ancestro_id=menu.menu_id, descendiente_id=menu.menu_id, profundidad=0
+        ))
+        if menu.parent_id is not None:
+            db.execute(insert(menu_jerarquia).from_select(
+                ["ancestro_id", "descendiente_id", "profundidad"],
+                select(
+                    menu_jerarquia.c.ancestro_id,
+                    menu.menu_id,
+                    menu_jerarquia.c.profundidad + 1
+                ).where(menu_jerarquia.c.descendiente_id == menu.parent_id)
+            ))
+    
+    @staticmethod
+    def move_menu(db: Session, menu: Menu, parent_id: Optional[int]):
+        """
+        Mover un menú (con toda su rama) bajo otro padre
+        
+        Reemplaza las filas de clausura que unen la rama con sus ancestros
+        anteriores y ajusta el nivel de toda la rama. No hace commit.
+        
+        Args:
+            db: Sesión de base de datos
+            menu: Menú a mover
+            parent_id: Nuevo padre (None para dejarlo como raíz)
+        
+        Raises:
+            HTTPException: Si el padre no existe, está dentro de la rama o se
+                supera la profundidad máxima
+        """
+        if parent_id == menu.parent_id:
+            return
+        
+        rama = select(menu_jerarquia.c.descendiente_id).where(
+            menu_jerarquia.c.ancestro_id == menu.menu_id
+        )
+        
+        if parent_id is None:
+            # Como raíz conserva el nivel de la raíz actual de su rama
+            nuevo_nivel = db.execute(
+                select(Menu.nivel)
+                .join(menu_jerarquia, menu_jerarquia.c.ancestro_id == Menu.menu_id)
+                .where(menu_jerarquia.c.descendiente_id == menu.menu_id)
+                .order_by(menu_jerarquia.c.profundidad.desc())
+                .limit(1)
+            ).scalar()
+        else:
+            parent = db.query(Menu).filter(Menu.menu_id == parent_id).first()
+            if not parent:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="El menú padre no existe"
+                )
+            en_rama = db.execute(rama.where(menu_jerarquia.c.descendiente_id == parent_id)).first()
+            if en_rama:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No se puede mover un menú dentro de su propia rama"
+                )
+            altura_rama = db.execute(
+                select(func.max(menu_jerarquia.c.profundidad))
+                .where(menu_jerarquia.c.ancestro_id == menu.menu_id)
+            ).scalar() or 0
+            MenuService._check_depth(MenuService._get_depth(db, parent_id) + 1 + altura_rama)
+            nuevo_nivel = parent.nivel + 1
+        
+        # Desconectar la rama de sus ancestros actuales
+        ancestros = select(menu_jerarquia.c.ancestro_id).where(
+            menu_jerarquia.c.descendiente_id == menu.menu_id,
+            menu_jerarquia.c.profundidad > 0
+        )
+        db.execute(delete(menu_jerarquia).where(
+            menu_jerarquia.c.descendiente_id.in_(rama.scalar_subquery()),
+            menu_jerarquia.c.ancestro_id.in_(ancestros.scalar_subquery())
+        ))
+        
+        # Conectar la rama con los ancestros del nuevo padre
+        if parent_id is not None:
+            superior = menu_jerarquia.alias("superior")
+            inferior = menu_jerarquia.alias("inferior")
+            db.execute(insert(menu_jerarquia).from_select(
+                ["ancestro_id", "descendiente_id", "profundidad"],
+                select(
+                    superior.c.ancestro_id,
+                    inferior.c.descendiente_id,
+                    superior.c.profundidad + inferior.c.profundidad + 1
+                ).select_from(
+                    superior.join(inferior, true())  # Producto cartesiano intencional
+                ).where(
+                    superior.c.descendiente_id == parent_id,
+                    inferior.c.ancestro_id == menu.menu_id
+                )
+            ))
+        
+        # Ajustar el nivel de toda la rama
+        delta = nuevo_nivel - menu.nivel
+        if delta:
+            db.execute(
+                update(Menu)
+                .where(Menu.menu_id.in_(rama.scalar_subquery()))
+                .values(nivel=Menu.nivel + delta)
+                .execution_options(synchronize_session=False)
+            )
+        
+        menu.parent_id = parent_id
+        menu.nivel = nuevo_nivel
+    
+    @staticmethod
+    def remove_from_hierarchy(db: Session, menu: Menu):
+        """
+        Quitar un menú de la jerarquía antes de eliminarlo. No hace commit.
+        
+        Raises:
+            HTTPException: Si el menú tiene submenús
+        """
+        tiene_hijos = db.execute(
+            select(menu_jerarquia.c.descendiente_id).where(
+                menu_jerarquia.c.ancestro_id == menu.menu_id,
+                menu_jerarquia.c.profundidad > 0
+            ).limit(1)
+        ).first()
+        if tiene_hijos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El menú tiene submenús; muévalos o elimínelos primero"
+            )
+        
+        db.execute(delete(menu_jerarquia).where(menu_jerarquia.c.descendiente_id == menu.menu_id))
+    
+    @staticmethod
+    def rebuild_hierarchy(db: Session):
+        """
+        Reconstruir la tabla de clausura desde parent_id (p. ej. tras un seed)
+        """
+        db.execute(delete(menu_jerarquia))
+        db.execute(_REBUILD_JERARQUIA_SQL)
+        db.commit()
+    
+    @staticmethod
+    def _get_depth(db: Session, menu_id: int) -> int:
+        """Profundidad de un menú (0 = raíz)"""
+        return db.execute(
+            select(func.max(menu_jerarquia.c.profundidad))
+            .where(menu_jerarquia.c.descendiente_id == menu_id)
+        ).scalar() or 0
+    
+    @staticmethod
+    def _check_depth(profundidad: int):
+        """Validar que no se supere la profundidad máxima del menú"""
+        if profundidad >= settings.MAX_MENU_DEPTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Se supera la profundidad máxima de menú ({settings.MAX_MENU_DEPTH} niveles)"
+            )
+
+
+cache_bus.subscribe("menu", MenuService.on_menu_invalidated)
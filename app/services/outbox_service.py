@@ -0,0 +1,129 @@
+"""
+Servicio de outbox transaccional para eventos de dominio
+"""
+import json
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import delete, or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.outbox import OutboxEvento
+from app.db.models.usuarios import Usuario
+
+
+class OutboxService:
+    """
+    Servicio para registrar y consumir eventos del outbox
+
+    Los servicios registran el evento en la misma sesión (y por lo tanto en
+    la misma transacción) que la modificación: si el commit falla, el evento
+    tampoco existe; si el commit se hace, el evento se entregará.
+    """
+
+    @staticmethod
+    def registrar(db: Session, tipo: str, recurso: str, registro_id: Optional[int], datos: dict):
+        """
+        Agregar un evento al outbox (sin commit)
+
+        Args:
+            db: Sesión de base de datos de la modificación
+            tipo: Tipo de evento, p. ej. "usuario.desactivado"
+            recurso: Recurso afectado ("usuario", "empleado", ...)
+            registro_id: ID del registro afectado
+            datos: Datos del evento (serializables a JSON)
+        """
+        db.add(OutboxEvento(
+            tipo=tipo,
+            recurso=recurso,
+            registro_id=registro_id,
+            payload=json.dumps(datos, default=str),
+            intentos=0
+        ))
+
+    @staticmethod
+    def usuario_payload(usuario: Usuario) -> dict:
+        """Datos públicos de un usuario para eventos (sin contraseña)"""
+        return {
+            "usuario_id": usuario.usuario_id,
+            "usuario": usuario.usuario,
+            "perfil_id": usuario.perfil_id,
+            "estado_id": usuario.estado_id,
+            "empleado_id": usuario.empleado_id
+        }
+
+    @staticmethod
+    def get_pendientes(db: Session, limit: int) -> List[OutboxEvento]:
+        """
+        Obtener un lote de eventos pendientes de entrega
+
+        En PostgreSQL bloquea las filas con SKIP LOCKED para que varios
+        workers puedan despachar sin entregar dos veces el mismo lote.
+        """
+        ahora = datetime.utcnow()
+        return (
+            db.query(OutboxEvento)
+            .filter(
+                OutboxEvento.enviado_at.is_(None),
+                OutboxEvento.intentos < settings.OUTBOX_MAX_ATTEMPTS,
+                or_(OutboxEvento.proximo_intento.is_(None), OutboxEvento.proximo_intento <= ahora)
+            )
+            .order_by(OutboxEvento.evento_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    @staticmethod
+    def reclamar_pendientes(db: Session, limit: int, lease_seconds: float) -> List[OutboxEvento]:
+        """
+        Reservar un lote de eventos pendientes para entregarlo fuera de la transacción (sin commit)
+
+        Mueve `proximo_intento` al final de la reserva: tras el commit ningún
+        otro worker toma el lote, y si este proceso muere antes de marcarlo,
+        el lote vuelve a estar pendiente al vencer la reserva.
+        """
+        eventos = OutboxService.get_pendientes(db, limit)
+        reserva = datetime.utcnow() + timedelta(seconds=lease_seconds)
+        for evento in eventos:
+            evento.proximo_intento = reserva
+        return eventos
+    
+    @staticmethod
+    def get_by_ids(db: Session, evento_ids: List[int]) -> List[OutboxEvento]:
+        """Obtener eventos por ID"""
+        return db.query(OutboxEvento).filter(OutboxEvento.evento_id.in_(evento_ids)).all()
+    
+    @staticmethod
+    def marcar_enviados(db: Session, eventos: List[OutboxEvento]):
+        """Marcar eventos como entregados (sin commit)"""
+        ahora = datetime.utcnow()
+        for evento in eventos:
+            evento.enviado_at = ahora
+            evento.ultimo_error = None
+
+    @staticmethod
+    def marcar_fallidos(db: Session, eventos: List[OutboxEvento], error: str):
+        """
+        Registrar un intento fallido con reintento exponencial (sin commit)
+
+        Tras OUTBOX_MAX_ATTEMPTS intentos el evento deja de reintentarse y
+        queda en la tabla con su último error para revisión.
+        """
+        ahora = datetime.utcnow()
+        for evento in eventos:
+            evento.intentos += 1
+            evento.ultimo_error = error[:500]
+            evento.proximo_intento = ahora + timedelta(seconds=min(2 ** evento.intentos, 3600))
+
+    @staticmethod
+    def purgar_enviados(db: Session) -> int:
+        """Eliminar eventos ya entregados más antiguos que la retención configurada"""
+        limite = datetime.utcnow() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        result = db.execute(
+            delete(OutboxEvento).where(
+                OutboxEvento.enviado_at.isnot(None),
+                OutboxEvento.enviado_at < limite
+            )
+        )
+        db.commit()
+        return result.rowcount
@@ -0,0 +1,168 @@
+"""
+Verificaciones de disponibilidad (readiness) calculadas en segundo plano
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from sqlalchemy import text
+
+from app.core.cache import caches
+from app.core.config import settings
+from app.db.session import engine
+from app.services.estado_service import EstadoService
+from app.services.warmup import warmup_state
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ReadinessMonitor:
+    """
+    Ejecuta las verificaciones profundas cada READINESS_INTERVAL_SECONDS
+
+    Las sondas leen el último resultado (`snapshot`) sin tocar la base de
+    datos, así que muchas sondas por segundo no consumen conexiones del
+    pool. Si el resultado es más viejo que tres intervalos (el bucle se
+    detuvo o una verificación quedó colgada) se informa como no disponible.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._resultado: Optional[dict] = None
+        self._actualizado = 0.0
+        self._heads: Optional[Set[str]] = None
+
+    def start(self):
+        """Iniciar el bucle de verificación en el event loop actual"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Detener el bucle de verificación"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.check_once)
+            except Exception:
+                logger.exception("Error en las verificaciones de disponibilidad")
+            await asyncio.sleep(settings.READINESS_INTERVAL_SECONDS)
+
+    def snapshot(self) -> dict:
+        """Último resultado de las verificaciones (O(1), sin consultar la base de datos)"""
+        resultado = self._resultado
+        if resultado is None:
+            return {"status": "starting", "checks": {}}
+        if time.monotonic() - self._actualizado > 3 * settings.READINESS_INTERVAL_SECONDS:
+            return {**resultado, "status": "stale"}
+        return resultado
+
+    def check_once(self) -> dict:
+        """Ejecutar todas las verificaciones y guardar el resultado"""
+        checks = {"database": self._check_database()}
+        checks["migrations"] = self._check_migrations(checks["database"].pop("revision", None))
+        checks["pool"] = self._check_pool()
+        checks["caches"] = self._check_caches()
+        checks["warmup"] = self._check_warmup()
+
+        listo = all(check["ok"] for check in checks.values())
+        self._resultado = {
+            "status": "ready" if listo else "not_ready",
+            "checked_at": datetime.utcnow().isoformat() + "Z",
+            "checks": checks
+        }
+        self._actualizado = time.monotonic()
+        return self._resultado
+
+    def _check_database(self) -> dict:
+        """Conectividad (SELECT 1) y revisión de Alembic aplicada"""
+        inicio = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                try:
+                    revision = {fila[0] for fila in conn.execute(text("SELECT version_num FROM alembic_version"))}
+                except Exception:
+                    # Sin tabla alembic_version (base creada sin Alembic)
+                    revision = set()
+            return {"ok": True, "latency_ms": round((time.perf_counter() - inicio) * 1000, 2), "revision": revision}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"[:200]}
+
+    def _migration_heads(self) -> Set[str]:
+        """Heads de los scripts de Alembic (se leen una vez: no cambian sin reiniciar)"""
+        if self._heads is None:
+            from alembic.config import Config
+            from alembic.script import ScriptDirectory
+
+            config = Config(os.path.join(ROOT, "alembic.ini"))
+            config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+            self._heads = set(ScriptDirectory.from_config(config).get_heads())
+        return self._heads
+
+    def _check_migrations(self, revision: Optional[Set[str]]) -> dict:
+        """
+        La revisión aplicada coincide con el head de los scripts
+
+        Una base creada con `create_all` sin `alembic stamp` no tiene revisión
+        registrada: no se puede comparar y la verificación se informa como
+        omitida en lugar de dejar la instancia fuera de servicio.
+        """
+        if not settings.READINESS_CHECK_MIGRATIONS:
+            return {"ok": True, "omitido": True}
+        if revision is not None and not revision:
+            return {"ok": True, "omitido": True, "motivo": "sin revisión en alembic_version"}
+        try:
+            heads = self._migration_heads()
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"[:200]}
+        actual = sorted(revision or [])
+        return {"ok": revision == heads, "current": actual, "head": sorted(heads)}
+
+    def _check_pool(self) -> dict:
+        """Conexiones prestadas respecto de la capacidad del pool"""
+        pool = engine.pool
+        if not callable(getattr(pool, "checkedout", None)):
+            return {"ok": True, "saturation": None}
+
+        capacidad = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+        prestadas = pool.checkedout()
+        saturacion = prestadas / capacidad if capacidad else 0.0
+        return {
+            "ok": saturacion < settings.READINESS_POOL_SATURATION,
+            "size": pool.size(),
+            "checked_out": prestadas,
+            "overflow": pool.overflow(),
+            "saturation": round(saturacion, 3)
+        }
+
+    def _check_caches(self) -> dict:
+        """Datos de referencia cargados y entradas por caché"""
+        entradas: Dict[str, int] = {nombre: len(cache) for nombre, cache in sorted(caches.items())}
+        return {"ok": EstadoService.is_loaded(), "estados": EstadoService.is_loaded(), "entries": entradas}
+
+    def _check_warmup(self) -> dict:
+        """El calentamiento de arranque terminó (aunque algún paso haya fallado)"""
+        if not settings.WARMUP_ENABLED:
+            return {"ok": True, "omitido": True}
+        return {
+            "ok": warmup_state.terminado,
+            "duration_ms": warmup_state.duracion_ms,
+            "steps_ms": warmup_state.pasos,
+            "errors": warmup_state.errores
+        }
+
+
+readiness_monitor = ReadinessMonitor()
@@ -0,0 +1,229 @@
+"""
+Servicio de sesiones: emisión de tokens con jti y revocación
+"""
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.cache_bus import cache_bus
+from app.core.config import settings
+from app.core.events import event_hub
+from app.core.metrics import Gauge, registry
+from app.core.request_context import current_client_ip, current_user_agent
+from app.core.security import create_access_token
+from app.db.models.sesion import Sesion
+from app.db.models.usuarios import Usuario
+from app.db.session import SessionLocal
+
+# jti -> expiración de las sesiones revocadas aún vigentes; se reemplaza completo
+_revocadas: Optional[Mapping[str, datetime]] = None
+_lock = threading.Lock()
+
+
+class SesionService:
+    """
+    Servicio para manejar las sesiones (tokens de acceso) de los usuarios
+
+    Cada token lleva un `jti` registrado en la tabla `sesiones`. La
+    verificación de cada petición no consulta la tabla: los jti revocados y
+    aún no expirados se mantienen en memoria (son pocos: solo los revocados
+    dentro del tiempo de vida del token). Al revocar se publica el canal
+    "sesiones" del bus de cachés y los demás workers recargan el conjunto.
+    """
+
+    @staticmethod
+    def crear_sesion(db: Session, usuario: Usuario) -> str:
+        """
+        Registrar una sesión y emitir su token de acceso
+
+        Args:
+            db: Sesión de base de datos
+            usuario: Usuario ya autenticado
+
+        Returns:
+            Token JWT con el jti de la sesión
+        """
+        jti = uuid.uuid4().hex
+        duracion = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        ahora = datetime.utcnow()
+        token = create_access_token(
+            data={
+                "sub": str(usuario.usuario_id),
+                "usuario": usuario.usuario,
+                "perfil_id": usuario.perfil_id,
+                "jti": jti
+            },
+            expires_delta=duracion
+        )
+        user_agent = current_user_agent()
+        db.add(Sesion(
+            jti=jti,
+            usuario_id=usuario.usuario_id,
+            ip=current_client_ip(),
+            user_agent=user_agent[:255] if user_agent else None,
+            created_at=ahora,
+            expires_at=ahora + duracion
+        ))
+        db.commit()
+        return token
+
+    @staticmethod
+    def load_revocadas(db: Session) -> Mapping[str, datetime]:
+        """
+        Cargar (o recargar) los jti revocados que todavía no expiraron
+
+        Conserva los revocados localmente que la consulta no vea todavía y
+        avisa por SSE a las conexiones abiertas con los jti nuevos.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Mapa jti -> expiración
+        """
+        global _revocadas
+        ahora = datetime.utcnow()
+        filas = db.execute(
+            select(Sesion.jti, Sesion.expires_at)
+            .where(Sesion.revocada_at.is_not(None), Sesion.expires_at > ahora)
+        ).all()
+        with _lock:
+            anteriores = _revocadas
+            revocadas: Dict[str, datetime] = {
+                jti: expira for jti, expira in (anteriores or {}).items() if expira > ahora
+            }
+            revocadas.update(filas)
+            _revocadas = revocadas
+
+        if anteriores is not None:
+            nuevas = revocadas.keys() - anteriores.keys()
+            if nuevas:
+                event_hub.publish_to_sesiones(nuevas, "sesion_revocada", {"motivo": "revocada"})
+        return revocadas
+
+    @staticmethod
+    def on_sesiones_invalidated(version: int):
+        """Recargar los jti revocados cuando otro proceso revoca sesiones"""
+        db = SessionLocal()
+        try:
+            SesionService.load_revocadas(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    def is_revocada(jti: str, db: Optional[Session] = None) -> bool:
+        """
+        Indica si el jti fue revocado (O(1), sin consultar la base de datos)
+
+        Args:
+            jti: Identificador del token
+            db: Sesión para la carga inicial si la app no la hizo al arrancar
+        """
+        revocadas = _revocadas
+        if revocadas is None:
+            if db is None:
+                return False
+            revocadas = SesionService.load_revocadas(db)
+        return jti in revocadas
+
+    @staticmethod
+    def get_sesiones(
+        db: Session,
+        usuario_id: Optional[int] = None,
+        incluir_inactivas: bool = False,
+        limit: int = 100
+    ) -> List[Sesion]:
+        """
+        Sesiones de la más reciente a la más antigua
+
+        Args:
+            db: Sesión de base de datos
+            usuario_id: Solo las de este usuario
+            incluir_inactivas: Incluir revocadas y expiradas
+            limit: Máximo de sesiones
+        """
+        query = select(Sesion)
+        if usuario_id is not None:
+            query = query.where(Sesion.usuario_id == usuario_id)
+        if not incluir_inactivas:
+            query = query.where(Sesion.revocada_at.is_(None), Sesion.expires_at > datetime.utcnow())
+        query = query.order_by(Sesion.sesion_id.desc()).limit(limit)
+        return db.execute(query).scalars().all()
+
+    @staticmethod
+    def revocar_sesion(db: Session, sesion_id: int, revocada_por: Optional[int] = None) -> Sesion:
+        """
+        Revocar una sesión (si ya estaba revocada no hace nada)
+
+        Raises:
+            HTTPException: Si la sesión no existe
+        """
+        sesion = db.get(Sesion, sesion_id)
+        if not sesion:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Sesión no encontrada"
+            )
+        if sesion.revocada_at is None:
+            SesionService._revocar(db, [sesion], revocada_por)
+        return sesion
+
+    @staticmethod
+    def revocar_jti(db: Session, jti: str, revocada_por: Optional[int] = None) -> bool:
+        """Revocar la sesión de un token (cierre de sesión); False si no estaba registrada"""
+        sesion = db.execute(select(Sesion).where(Sesion.jti == jti)).scalar_one_or_none()
+        if sesion is None:
+            return False
+        if sesion.revocada_at is None:
+            SesionService._revocar(db, [sesion], revocada_por)
+        return True
+
+    @staticmethod
+    def revocar_sesiones_usuario(db: Session, usuario_id: int, revocada_por: Optional[int] = None) -> int:
+        """
+        Revocar todas las sesiones vigentes de un usuario
+
+        Returns:
+            Cantidad de sesiones revocadas
+        """
+        sesiones = SesionService.get_sesiones(db, usuario_id=usuario_id, limit=10000)
+        if sesiones:
+            SesionService._revocar(db, sesiones, revocada_por)
+        return len(sesiones)
+
+    @staticmethod
+    def _revocar(db: Session, sesiones: List[Sesion], revocada_por: Optional[int]):
+        """Marcar como revocadas, confirmar y propagar a este y los demás workers"""
+        ahora = datetime.utcnow()
+        for sesion in sesiones:
+            sesion.revocada_at = ahora
+            sesion.revocada_por = revocada_por
+        db.commit()
+        SesionService._propagar([(sesion.jti, sesion.expires_at) for sesion in sesiones])
+
+    @staticmethod
+    def _propagar(revocadas: Iterable[Tuple[str, datetime]]):
+        """Agregar al conjunto local, publicar en el bus y cerrar los flujos SSE"""
+        global _revocadas
+        revocadas = dict(revocadas)
+        with _lock:
+            if _revocadas is not None:
+                _revocadas = {**_revocadas, **revocadas}
+        cache_bus.publish("sesiones")
+        event_hub.publish_to_sesiones(revocadas.keys(), "sesion_revocada", {"motivo": "revocada"})
+
+
+def _cantidad_revocadas() -> int:
+    revocadas = _revocadas
+    return len(revocadas) if revocadas is not None else 0
+
+
+cache_bus.subscribe("sesiones", SesionService.on_sesiones_invalidated)
+
+registry.register(Gauge(
+    "sessions_revoked_cached", "Sesiones revocadas y vigentes en memoria",
+    collect=lambda: [((), _cantidad_revocadas())]
+))
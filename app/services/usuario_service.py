@@ -1,12 +1,19 @@
 """
 Servicio para CRUD de usuarios
 """
+from datetime import datetime, timedelta
 from typing import List, Optional
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.db.models.usuarios import Usuario
 from app.schemas.usuarios import UsuarioCreate, UsuarioUpdate
 from app.core.security import get_password_hash
+from app.services.evento_service import EventoService
+from app.services.outbox_service import OutboxService
+
+# perfil_anterior no informado (el perfil anterior puede ser None)
+_SIN_PERFIL_ANTERIOR = object()
 
 
 class UsuarioService:
@@ -17,6 +24,27 @@ class UsuarioService:
         """Obtener lista de usuarios"""
         return db.query(Usuario).offset(skip).limit(limit).all()
     
+    @staticmethod
+    def get_usuarios_inactivos(db: Session, dias: int = 90, limit: int = 100) -> List[Usuario]:
+        """
+        Usuarios sin acceso en los últimos `dias` días, del más antiguo al más reciente
+        
+        Incluye a los que nunca accedieron y fueron creados antes del corte.
+        El último acceso se escribe por lotes, así que puede tener un retraso
+        de hasta LAST_SEEN_FLUSH_INTERVAL_SECONDS.
+        """
+        corte = datetime.utcnow() - timedelta(days=dias)
+        return (
+            db.query(Usuario)
+            .filter(or_(
+                Usuario.ultimo_acceso < corte,
+                and_(Usuario.ultimo_acceso.is_(None), Usuario.created_at < corte)
+            ))
+            .order_by(Usuario.ultimo_acceso.asc().nulls_first(), Usuario.usuario_id)
+            .limit(limit)
+            .all()
+        )
+    
     @staticmethod
     def get_usuario_by_id(db: Session, usuario_id: int) -> Optional[Usuario]:
         """Obtener usuario por ID"""
@@ -64,6 +92,11 @@ class UsuarioService:
         )
         
         db.add(db_usuario)
+        db.flush()  # Para obtener el usuario_id antes de commit
+        OutboxService.registrar(
+            db, "usuario.creado", "usuario", db_usuario.usuario_id,
+            OutboxService.usuario_payload(db_usuario)
+        )
         db.commit()
         db.refresh(db_usuario)
         
@@ -92,13 +125,20 @@ class UsuarioService:
                 detail="Usuario no encontrado"
             )
         
+        perfil_anterior = db_usuario.perfil_id
+        
         # Actualizar campos
         update_data = usuario_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_usuario, field, value)
         
+        OutboxService.registrar(
+            db, "usuario.actualizado", "usuario", db_usuario.usuario_id,
+            OutboxService.usuario_payload(db_usuario)
+        )
         db.commit()
         db.refresh(db_usuario)
+        UsuarioService.notificar_cambios(db_usuario, perfil_anterior)
         
         return db_usuario
     
@@ -123,4 +163,31 @@ class UsuarioService:
         
         # En lugar de eliminar, desactivar
         db_usuario.estado_id = 2  # Asumiendo 2 = Inactivo
+        OutboxService.registrar(
+            db, "usuario.desactivado", "usuario", db_usuario.usuario_id,
+            OutboxService.usuario_payload(db_usuario)
+        )
         db.commit()
+        UsuarioService.notificar_cambios(db_usuario)
+    
+    @staticmethod
+    def notificar_cambios(usuario: Usuario, perfil_anterior=_SIN_PERFIL_ANTERIOR):
+        """
+        Avisar a las conexiones SSE del usuario en todos los workers (llamar después del commit)
+        
+        - "sesion_revocada" si el usuario ya no está activo
+        - "permisos_cambiados" si cambió de perfil
+        
+        Args:
+            usuario: Usuario ya confirmado en la base de datos
+            perfil_anterior: Perfil antes de la modificación (puede ser None);
+                si no se informa no se comparan perfiles
+        """
+        if usuario.estado_id != 1:
+            EventoService.publicar_a_usuarios(
+                [usuario.usuario_id], "sesion_revocada", {"estado_id": usuario.estado_id}
+            )
+        elif perfil_anterior is not _SIN_PERFIL_ANTERIOR and perfil_anterior != usuario.perfil_id:
+            EventoService.publicar_a_usuarios(
+                [usuario.usuario_id], "permisos_cambiados", {"perfil_id": usuario.perfil_id}
+            )
@@ -0,0 +1,136 @@
+"""
+Calentamiento al arrancar: pool, consultas frecuentes, cachés, validadores y bcrypt
+"""
+import logging
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, text
+
+from app.core.config import settings
+from app.core.security import create_access_token, decode_access_token, get_pwd_context
+from app.db.models.perfil import Perfil
+from app.db.session import SessionLocal, engine
+from app.schemas.empleados import EmpleadoResponse
+from app.schemas.usuarios import UsuarioMeResponse, UsuarioResponse
+from app.services.empleado_service import EmpleadoService
+from app.services.estado_service import EstadoService
+from app.services.evento_service import EventoService
+from app.services.menu_service import MenuService
+from app.services.sesion_service import SesionService
+from app.services.usuario_service import UsuarioService
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Estado del calentamiento, leído por /health/ready"""
+
+    def __init__(self):
+        self.en_curso = False
+        self.terminado = False
+        self.duracion_ms: Optional[float] = None
+        self.pasos: Dict[str, float] = {}
+        self.errores: List[str] = []
+
+
+warmup_state = WarmupState()
+
+
+def _paso(nombre: str, funcion):
+    """Ejecutar un paso midiendo su duración; un error no detiene los demás"""
+    inicio = time.perf_counter()
+    try:
+        funcion()
+    except Exception as e:
+        warmup_state.errores.append(f"{nombre}: {type(e).__name__}: {e}"[:200])
+        logger.warning("Calentamiento: falló %s", nombre, exc_info=True)
+    warmup_state.pasos[nombre] = round((time.perf_counter() - inicio) * 1000, 2)
+
+
+def _abrir_conexiones():
+    """Abrir hasta WARMUP_DB_CONNECTIONS conexiones a la vez y devolverlas al pool"""
+    size = getattr(engine.pool, "size", None)
+    cantidad = min(settings.WARMUP_DB_CONNECTIONS, size()) if callable(size) else 1
+    conexiones = []
+    try:
+        for _ in range(cantidad):
+            conexion = engine.connect()
+            conexiones.append(conexion)
+            conexion.execute(text("SELECT 1"))
+    finally:
+        for conexion in conexiones:
+            conexion.close()
+
+
+def _consultas_frecuentes():
+    """
+    Ejecutar una vez las consultas de login, /me y listados
+
+    Compila las sentencias (caché de SQLAlchemy) y los validadores de los
+    modelos de respuesta con datos reales, si los hay.
+    """
+    db = SessionLocal()
+    try:
+        EstadoService.load(db)
+        SesionService.load_revocadas(db)
+        EventoService.load_ultimo(db)
+        UsuarioService.get_usuario_by_username(db, "")
+        usuarios = UsuarioService.get_usuarios(db, limit=1)
+        empleados = EmpleadoService.get_empleados(db, limit=1)
+        for usuario in usuarios:
+            UsuarioService.get_usuario_by_id(db, usuario.usuario_id)
+            UsuarioResponse.model_validate(usuario).model_dump_json()
+            UsuarioMeResponse(
+                usuario_id=usuario.usuario_id,
+                usuario=usuario.usuario,
+                perfil_id=usuario.perfil_id,
+                estado_id=usuario.estado_id,
+                empleado_id=usuario.empleado_id,
+                intentos=usuario.intentos,
+                empleado_nombre=usuario.empleado.nombre if usuario.empleado else None,
+                perfil_descripcion=usuario.perfil.descripcion if usuario.perfil else None
+            ).model_dump_json()
+        for empleado in empleados:
+            EmpleadoResponse.model_validate(empleado).model_dump_json()
+    finally:
+        db.close()
+
+
+def _arboles_de_menu():
+    """Construir y cachear el árbol de menú y las URLs permitidas de los perfiles activos"""
+    db = SessionLocal()
+    try:
+        perfil_ids = db.execute(
+            select(Perfil.perfil_id)
+            .where(Perfil.estado_id == 1)
+            .order_by(Perfil.perfil_id)
+            .limit(settings.WARMUP_MAX_PERFILES)
+        ).scalars().all()
+        for perfil_id in perfil_ids:
+            MenuService.get_perfil_menu_tree_json(db, perfil_id)
+            MenuService.get_perfil_urls(db, perfil_id)
+    finally:
+        db.close()
+
+
+def _seguridad():
+    """Cargar el backend de bcrypt y python-jose (se importan en el primer uso)"""
+    get_pwd_context().hash("calentamiento")
+    decode_access_token(create_access_token({"sub": "0"}))
+
+
+def warm_up():
+    """Ejecutar todos los pasos del calentamiento (bloqueante: usar en un hilo)"""
+    warmup_state.en_curso = True
+    inicio = time.perf_counter()
+    try:
+        _paso("conexiones", _abrir_conexiones)
+        _paso("consultas", _consultas_frecuentes)
+        _paso("menus", _arboles_de_menu)
+        _paso("seguridad", _seguridad)
+    finally:
+        warmup_state.duracion_ms = round((time.perf_counter() - inicio) * 1000, 2)
+        warmup_state.en_curso = False
+        warmup_state.terminado = True
+    logger.info("Calentamiento terminado en %.0f ms: %s", warmup_state.duracion_ms, warmup_state.pasos)
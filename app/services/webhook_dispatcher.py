@@ -0,0 +1,153 @@
+"""
+Despachador en segundo plano de eventos del outbox hacia webhooks
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+import urllib.request
+from typing import List, Optional
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.models.outbox import OutboxEvento
+from app.services.outbox_service import OutboxService
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookDispatcher:
+    """
+    Entrega los eventos del outbox por lotes a los suscriptores configurados
+
+    Cada lote se envía como un POST JSON `{"eventos": [...]}` a cada URL de
+    WEBHOOK_URLS. El lote se marca entregado solo si todos los suscriptores
+    responden 2xx; si no, se reintenta con espera exponencial. La entrega es
+    "al menos una vez": los suscriptores deben deduplicar por `evento_id`.
+
+    Sin suscriptores configurados no se toma ningún evento: quedan pendientes
+    hasta que se configure WEBHOOK_URLS. Las llamadas HTTP se hacen fuera de
+    transacción: el lote se reserva y confirma primero, y el resultado se
+    registra después en una segunda transacción corta.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+
+    def start(self):
+        """Iniciar el bucle de despacho en el event loop actual"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Detener el bucle de despacho"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        intervalo = settings.OUTBOX_POLL_INTERVAL_MS / 1000
+        while True:
+            try:
+                # DB y HTTP son bloqueantes: se ejecutan fuera del event loop
+                entregados = await asyncio.to_thread(self.dispatch_once)
+            except Exception:
+                logger.exception("Error despachando eventos del outbox")
+                entregados = 0
+
+            # Si el lote vino lleno, seguir sin esperar
+            if entregados < settings.OUTBOX_BATCH_SIZE:
+                await asyncio.sleep(intervalo)
+
+    def dispatch_once(self) -> int:
+        """
+        Despachar un lote de eventos pendientes
+
+        Returns:
+            Cantidad de eventos procesados en el lote
+        """
+        urls = settings.webhook_urls_list
+        if not urls:
+            # Sin suscriptores: los eventos quedan pendientes, no se dan por entregados
+            return 0
+
+        # 1. Reservar el lote y confirmar (libera los bloqueos antes de llamar por HTTP)
+        db = SessionLocal()
+        try:
+            if time.monotonic() - self._last_purge > 3600:
+                OutboxService.purgar_enviados(db)
+                self._last_purge = time.monotonic()
+
+            reserva = settings.WEBHOOK_TIMEOUT_SECONDS * len(urls) + 60
+            eventos = OutboxService.reclamar_pendientes(db, settings.OUTBOX_BATCH_SIZE, reserva)
+            evento_ids = [evento.evento_id for evento in eventos]
+            body = self._body(eventos)
+            db.commit()
+        finally:
+            db.close()
+
+        if not evento_ids:
+            return 0
+
+        # 2. Entregar fuera de la transacción
+        error = self._deliver(urls, body)
+
+        # 3. Registrar el resultado en una transacción corta
+        db = SessionLocal()
+        try:
+            eventos = OutboxService.get_by_ids(db, evento_ids)
+            if error is None:
+                OutboxService.marcar_enviados(db, eventos)
+            else:
+                OutboxService.marcar_fallidos(db, eventos, error)
+                logger.warning("Entrega de webhooks fallida: %s", error)
+            db.commit()
+        finally:
+            db.close()
+
+        return len(evento_ids)
+
+    @staticmethod
+    def _body(eventos: List[OutboxEvento]) -> bytes:
+        """Cuerpo JSON del lote"""
+        return json.dumps({
+            "eventos": [
+                {
+                    "evento_id": evento.evento_id,
+                    "tipo": evento.tipo,
+                    "recurso": evento.recurso,
+                    "registro_id": evento.registro_id,
+                    "datos": json.loads(evento.payload),
+                    "created_at": evento.created_at.isoformat() if evento.created_at else None
+                }
+                for evento in eventos
+            ]
+        }).encode()
+
+    def _deliver(self, urls: List[str], body: bytes) -> Optional[str]:
+        """Enviar el lote a todos los suscriptores; devuelve el error o None"""
+
+        headers = {"Content-Type": "application/json"}
+        if settings.WEBHOOK_SECRET:
+            firma = hmac.new(settings.WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+            headers["X-Webhook-Signature"] = f"sha256={firma}"
+
+        errores = []
+        for url in urls:
+            request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=settings.WEBHOOK_TIMEOUT_SECONDS):
+                    pass
+            except Exception as e:
+                errores.append(f"{url}: {e}")
+
+        return "; ".join(errores) if errores else None
+
+
+webhook_dispatcher = WebhookDispatcher()
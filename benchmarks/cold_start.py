@@ -0,0 +1,105 @@
+"""
+Medición del arranque en frío (import de app.main) con presupuesto
+
+Ejecuta `python -X importtime -c "import app.main"` en procesos nuevos,
+informa la mediana del tiempo total y los módulos con mayor tiempo
+acumulado, y termina con código 1 si la mediana supera el presupuesto.
+Pensado para correr en CI después de cambios en dependencias o imports.
+
+Uso:
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --budget-ms 800 --runs 7 --top 30
+    python -m benchmarks.cold_start --report importtime.txt
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presupuesto por defecto para importar app.main (interprete incluido)
+DEFAULT_BUDGET_MS = 1500
+
+# Módulos que no deben cargarse al importar app.main (se importan en el primer uso)
+DIFERIDOS = ("jose", "passlib", "bcrypt")
+
+
+def run_once(codigo: str) -> Tuple[float, str]:
+    """Ejecutar el código en un proceso nuevo; devuelve (ms de reloj, salida de -X importtime)"""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))}
+    inicio = time.perf_counter()
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    duracion = (time.perf_counter() - inicio) * 1000
+    if resultado.returncode != 0:
+        raise RuntimeError(resultado.stderr[-2000:])
+    return duracion, resultado.stderr
+
+
+def parse_importtime(salida: str) -> List[Tuple[int, int, str]]:
+    """Filas (self µs, acumulado µs, módulo) del reporte de -X importtime"""
+    filas = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, modulo = linea[len("import time:"):].split("|")
+        filas.append((int(propio), int(acumulado), modulo.rstrip()))
+    return filas
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Arranque en frío de app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=20, help="Módulos a listar por tiempo acumulado")
+    parser.add_argument("--report", help="Guardar el reporte completo de -X importtime")
+    parser.add_argument("--openapi", action="store_true", help="Incluir la generación del esquema OpenAPI")
+    args = parser.parse_args(argv)
+
+    codigo = "import app.main"
+    if args.openapi:
+        codigo += "; app.main.app.openapi()"
+
+    tiempos = []
+    salida = ""
+    for _ in range(args.runs):
+        duracion, salida = run_once(codigo)
+        tiempos.append(duracion)
+
+    filas = parse_importtime(salida)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as archivo:
+            archivo.write(salida)
+
+    print(f"Módulos con mayor tiempo acumulado (última corrida, {len(filas)} módulos):")
+    print(f"  {'acumulado ms':>12} {'propio ms':>10}  módulo")
+    for propio, acumulado, modulo in sorted(filas, key=lambda fila: fila[1], reverse=True)[:args.top]:
+        print(f"  {acumulado / 1000:>12.1f} {propio / 1000:>10.1f}  {modulo}")
+
+    cargados = {modulo.strip() for _, _, modulo in filas}
+    diferidos = sorted(m for m in cargados if m.split(".")[0] in DIFERIDOS)
+
+    mediana = statistics.median(tiempos)
+    print(f"\nArranque en frío: mediana {mediana:.0f} ms (min {min(tiempos):.0f}, max {max(tiempos):.0f}) "
+          f"en {args.runs} corridas; presupuesto {args.budget_ms:.0f} ms")
+
+    fallo = False
+    if diferidos:
+        print(f"❌ Se importan al arrancar módulos que deberían diferirse: {', '.join(diferidos[:10])}")
+        fallo = True
+    if mediana > args.budget_ms:
+        print("❌ Arranque en frío por encima del presupuesto")
+        fallo = True
+    if not fallo:
+        print("✅ Dentro del presupuesto")
+    return 1 if fallo else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
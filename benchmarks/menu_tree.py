@@ -0,0 +1,245 @@
+"""
+Microbenchmarks del armado del árbol de menú a gran escala
+
+Genera bosques sintéticos de menús (raíces x ancho ^ profundidad) y mide
+tiempo y memoria pico de:
+
+- original: un MenuTreeResponse por nodo sobre filas desordenadas y orden
+  recursivo de los hijos (la implementación anterior de get_user_menu_tree)
+- actual: MenuService._assemble_tree sobre filas ya ordenadas (sin orden recursivo)
+- dict_validacion_final: árbol de dicts y una sola validación con TypeAdapter
+- serializar_modelos: TypeAdapter.dump_json del árbol de modelos (lo que se cachea)
+- serializar_dicts: json.dumps del árbol de dicts
+- cache_hit: lectura del JSON ya cacheado en LocalCache
+
+Uso:
+    python -m benchmarks.menu_tree
+    python -m benchmarks.menu_tree --preset 100k --repeat 3
+    python -m benchmarks.menu_tree --roots 5 --width 3 --depth 8
+"""
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from app.core.cache import LocalCache
+from app.schemas.menu import MenuTreeResponse
+from app.services.menu_service import MenuService
+
+# (raíces, ancho, profundidad)
+PRESETS = {
+    "1k": (10, 10, 3),
+    "10k": (10, 10, 4),
+    "100k": (10, 10, 5),
+    "profundo": (1, 2, 13),
+    "cadena": (1, 1, 500),
+}
+
+_tree_adapter = TypeAdapter(List[MenuTreeResponse])
+
+_CAMPOS = ("menu_id", "descripcion", "url", "parent_id", "nivel", "orden", "estado_id", "created_at", "updated_at")
+
+
+class FilaMenu(namedtuple("FilaMenu", _CAMPOS)):
+    """Fila con la misma interfaz que usa MenuService (atributos y `_mapping`)"""
+
+    __slots__ = ()
+
+    @property
+    def _mapping(self) -> dict:
+        return self._asdict()
+
+
+def generar_bosque(raices: int, ancho: int, profundidad: int) -> List[FilaMenu]:
+    """Filas de un bosque completo, ordenadas por (nivel, orden, menu_id) como la consulta real"""
+    ahora = datetime(2026, 1, 1)
+    filas: List[FilaMenu] = []
+    siguiente_id = 1
+    nivel_actual: List[Optional[int]] = [None]
+    for nivel in range(1, profundidad + 1):
+        hijos_por_padre = raices if nivel == 1 else ancho
+        nuevo_nivel = []
+        for orden in range(1, hijos_por_padre + 1):
+            for parent_id in nivel_actual:
+                filas.append(FilaMenu(
+                    menu_id=siguiente_id,
+                    descripcion=f"Menú {siguiente_id}",
+                    url=f"/menu/{siguiente_id}",
+                    parent_id=parent_id,
+                    nivel=nivel,
+                    orden=orden,
+                    estado_id=1,
+                    created_at=ahora,
+                    updated_at=None,
+                ))
+                nuevo_nivel.append(siguiente_id)
+                siguiente_id += 1
+        nivel_actual = nuevo_nivel
+    return filas
+
+
+# ---------------------------------------------------------------------------
+# Variantes
+# ---------------------------------------------------------------------------
+
+def build_original(filas: List[FilaMenu]) -> List[MenuTreeResponse]:
+    """Implementación anterior: modelos por nodo y orden recursivo"""
+    menu_dict: Dict[int, MenuTreeResponse] = {}
+    for fila in filas:
+        menu_dict[fila.menu_id] = MenuTreeResponse(**fila._mapping, children=[])
+
+    root_menus = []
+    for menu in menu_dict.values():
+        if menu.parent_id is None:
+            root_menus.append(menu)
+        else:
+            parent = menu_dict.get(menu.parent_id)
+            if parent:
+                parent.children.append(menu)
+
+    def sort_recursive(items: List[MenuTreeResponse]):
+        items.sort(key=lambda x: x.orden)
+        for item in items:
+            if item.children:
+                sort_recursive(item.children)
+
+    sort_recursive(root_menus)
+    return root_menus
+
+
+def build_actual(filas: List[FilaMenu]) -> List[MenuTreeResponse]:
+    return MenuService._assemble_tree(filas)[0]
+
+
+def build_dicts(filas: List[FilaMenu]) -> List[dict]:
+    """Árbol de dicts sobre filas ordenadas, sin modelos"""
+    menu_dict = {fila.menu_id: {**fila._mapping, "children": []} for fila in filas}
+    roots = []
+    for fila in filas:
+        nodo = menu_dict[fila.menu_id]
+        if fila.parent_id is None:
+            roots.append(nodo)
+        else:
+            parent = menu_dict.get(fila.parent_id)
+            if parent is not None:
+                parent["children"].append(nodo)
+    return roots
+
+
+def build_dict_validacion_final(filas: List[FilaMenu]) -> List[MenuTreeResponse]:
+    return _tree_adapter.validate_python(build_dicts(filas))
+
+
+def _sin_cache():
+    raise LookupError("no hay JSON cacheado (falló la serialización)")
+
+
+# ---------------------------------------------------------------------------
+# Medición
+# ---------------------------------------------------------------------------
+
+def medir(funcion: Callable[[], object], repeat: int) -> Tuple[float, float, float]:
+    """Devuelve tiempo mínimo y mediana (segundos) y memoria pico (MB)"""
+    tiempos = []
+    for _ in range(repeat):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tiempos), statistics.median(tiempos), pico / (1024 * 1024)
+
+
+def run(raices: int, ancho: int, profundidad: int, repeat: int) -> Dict[str, dict]:
+    filas = generar_bosque(raices, ancho, profundidad)
+    desordenadas = filas[:]
+    random.Random(42).shuffle(desordenadas)
+
+    modelos = build_actual(filas)
+    dicts = build_dicts(filas)
+    cache = LocalCache("benchmark")
+    try:
+        json_cacheado = _tree_adapter.dump_json(modelos)
+        cache.get_or_set(1, lambda: json_cacheado)
+    except Exception:
+        # p. ej. pydantic no serializa anidamientos muy profundos
+        json_cacheado = b""
+
+    variantes: Dict[str, Callable[[], object]] = {
+        "original": lambda: build_original(desordenadas),
+        "actual": lambda: build_actual(filas),
+        "dict_validacion_final": lambda: build_dict_validacion_final(filas),
+        "serializar_modelos": lambda: _tree_adapter.dump_json(modelos),
+        "serializar_dicts": lambda: json.dumps(dicts, default=str).encode(),
+        "cache_hit": lambda: cache.get(1) or _sin_cache(),
+    }
+
+    resultados = {}
+    for nombre, funcion in variantes.items():
+        try:
+            minimo, mediana, pico = medir(funcion, repeat)
+            resultados[nombre] = {"min_ms": minimo * 1000, "mediana_ms": mediana * 1000, "pico_mb": pico}
+        except RecursionError:
+            resultados[nombre] = {"error": "RecursionError"}
+        except Exception as e:
+            resultados[nombre] = {"error": f"{type(e).__name__}: {str(e).splitlines()[0]}"[:100]}
+    return {"nodos": len(filas), "bytes_json": len(json_cacheado), "variantes": resultados}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks del árbol de menú")
+    parser.add_argument("--preset", action="append", choices=sorted(PRESETS),
+                        help="Bosque predefinido (se puede repetir); por defecto 1k, 10k y profundo")
+    parser.add_argument("--roots", type=int, help="Menús raíz")
+    parser.add_argument("--width", type=int, help="Hijos por nodo")
+    parser.add_argument("--depth", type=int, help="Niveles")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Guardar resultados en JSON")
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    if args.roots or args.width or args.depth:
+        casos = {"personalizado": (args.roots or 1, args.width or 1, args.depth or 1)}
+    else:
+        casos = {nombre: PRESETS[nombre] for nombre in (args.preset or ["1k", "10k", "profundo"])}
+
+    salida = {}
+    for nombre, (raices, ancho, profundidad) in casos.items():
+        resultado = run(raices, ancho, profundidad, args.repeat)
+        salida[nombre] = resultado
+        print(
+            f"\n{nombre}: {resultado['nodos']} nodos "
+            f"(raíces={raices}, ancho={ancho}, profundidad={profundidad}), JSON {resultado['bytes_json']} bytes"
+        )
+        print(f"  {'variante':24} {'mín ms':>10} {'mediana ms':>11} {'pico MB':>9}")
+        for variante, datos in resultado["variantes"].items():
+            if "error" in datos:
+                print(f"  {variante:24} {datos['error']}")
+            else:
+                print(
+                    f"  {variante:24} {datos['min_ms']:>10.2f} {datos['mediana_ms']:>11.2f} {datos['pico_mb']:>9.2f}"
+                )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as archivo:
+            json.dump(salida, archivo, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
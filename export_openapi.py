@@ -0,0 +1,25 @@
+"""
+Script para precalcular el esquema OpenAPI en tiempo de build
+Ejecutar: python export_openapi.py [archivo]   (por defecto openapi.json)
+
+Luego configurar OPENAPI_SCHEMA_FILE con la ruta del archivo generado.
+"""
+import json
+import sys
+
+from fastapi import FastAPI
+
+from app.main import app
+
+
+def main():
+    """Función principal"""
+    destino = sys.argv[1] if len(sys.argv) > 1 else "openapi.json"
+    esquema = FastAPI.openapi(app)
+    with open(destino, "w", encoding="utf-8") as archivo:
+        json.dump(esquema, archivo, ensure_ascii=False)
+    print(f"✅ Esquema OpenAPI guardado en {destino} ({len(esquema['paths'])} rutas)")
+
+
+if __name__ == "__main__":
+    main()
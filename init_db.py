@@ -1,6 +1,9 @@
 """
 Script para inicializar la base de datos con datos de ejemplo
 """
+import os
+from alembic import command
+from alembic.config import Config
 from app.db.base import Base
 from app.db.session import engine
 from app.db.models.estado import Estado
@@ -8,7 +11,13 @@ from app.db.models.perfil import Perfil
 from app.db.models.empleados import Empleado
 from app.db.models.usuarios import Usuario
 from app.db.models.menu import Menu
+from app.db.models.outbox import OutboxEvento
+from app.db.models.cache_version import CacheVersion
+from app.db.models.login_auditoria import LoginAuditoria
+from app.db.models.sesion import Sesion
+from app.db.models.evento_tiempo_real import EventoTiempoReal
 from app.core.security import get_password_hash
+from app.services.menu_service import MenuService
 from sqlalchemy.orm import Session
 
 
@@ -17,6 +26,14 @@ def init_db():
     print("Creando tablas...")
     Base.metadata.create_all(bind=engine)
     print("✓ Tablas creadas")
+    
+    # Las tablas ya corresponden al head: registrarlo en alembic_version
+    # (lo verifica /health/ready y lo necesitan las próximas migraciones)
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    config = Config(os.path.join(raiz, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(raiz, "alembic"))
+    command.stamp(config, "head")
+    print("✓ Revisión de Alembic marcada (stamp head)")
 
 
 def seed_data():
@@ -113,6 +130,7 @@ def seed_data():
         ]
         db.add_all(menus)
         db.commit()
+        MenuService.rebuild_hierarchy(db)
         print("✓ Menús insertados")
         
         # Asignar todos los menús al perfil Admin
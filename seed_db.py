@@ -13,6 +13,7 @@ from app.db.models.menu import Menu
 from app.db.models.empleados import Empleado
 from app.db.models.usuarios import Usuario
 from app.core.security import get_password_hash
+from app.services.menu_service import MenuService
 
 
 def seed_estados(db: Session):
@@ -78,6 +79,9 @@ def seed_menu(db: Session):
             print(f"✅ Menú creado: {menu_data['descripcion']}")
     
     db.commit()
+    
+    # Reconstruir la jerarquía (tabla de clausura) del menú
+    MenuService.rebuild_hierarchy(db)
 
 
 def seed_perfil_menu(db: Session):
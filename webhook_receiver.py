@@ -0,0 +1,42 @@
+"""
+Receptor de webhooks de prueba: imprime los eventos recibidos del outbox
+Ejecutar: python webhook_receiver.py [puerto]
+Configurar en .env: WEBHOOK_URLS=http://localhost:9000/webhook
+"""
+import hashlib
+import hmac
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Acepta POST con `{"eventos": [...]}` y responde 200"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        secreto = os.environ.get("WEBHOOK_SECRET")
+        if secreto:
+            esperado = "sha256=" + hmac.new(secreto.encode(), body, hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(esperado, self.headers.get("X-Webhook-Signature", "")):
+                print("❌ Firma inválida")
+                self.send_response(401)
+                self.end_headers()
+                return
+
+        for evento in json.loads(body).get("eventos", []):
+            print(f"📨 #{evento['evento_id']} {evento['tipo']} ({evento['recurso']} {evento['registro_id']})")
+
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    puerto = int(sys.argv[1]) if len(sys.argv) > 1 else 9000
+    print(f"🎧 Escuchando webhooks en http://localhost:{puerto}/webhook")
+    HTTPServer(("", puerto), WebhookHandler).serve_forever()